@@ -0,0 +1,70 @@
+"""
+Side-by-side latency of the sync and async dashboard views under concurrent load.
+
+Start the app under an ASGI server (both view flavours are mounted there:
+/ and /explorer/ are sync unless ASYNC_VIEWS=True, /async/ and
+/async/explorer/ are async), e.g.:
+
+    CHART_CACHE_MAX_BYTES=0 uvicorn config.asgi:application --port 8000
+
+CHART_CACHE_MAX_BYTES=0 disables the chart cache so every request runs its
+queries and builds its figures (the path this benchmark is about).
+
+Then:
+    python benchmarks/bench_async_views.py --base-url http://127.0.0.1:8000 --concurrency 16 --requests 400
+"""
+import argparse
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+PAIRS = [
+    ('home', '/', '/async/'),
+    ('explorer', '/explorer/', '/async/explorer/'),
+]
+
+
+def fetch(url):
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+        status = response.status
+    return time.perf_counter() - start, status
+
+
+def run_load(url, concurrency, n_requests):
+    fetch(url)  # warm-up (model / template loading, connections)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, [url] * n_requests))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    errors = sum(1 for r in results if r[1] != 200)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    return {
+        'p50': statistics.median(latencies), 'p95': pct(95), 'p99': pct(99),
+        'rps': n_requests / wall, 'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400)
+    args = parser.parse_args()
+
+    print(f"{'view':<10} {'flavour':<7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>7}")
+    for name, sync_path, async_path in PAIRS:
+        for flavour, path in [('sync', sync_path), ('async', async_path)]:
+            r = run_load(args.base_url.rstrip('/') + path, args.concurrency, args.requests)
+            print(f"{name:<10} {flavour:<7} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f} {r['rps']:>8.1f} {r['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: explorer country data, per-country queries vs the rollup index.
+
+  queries   medal_split(code) + timeline(code) for every country (two queries each,
+            what a country page cost before core/country_index.py)
+  index     build_country_index(country_rows()): one scan for all countries
+  lookup    country_index().get(code) for every country, index built
+  charts    pie + line payloads of every country from the index (chart cache cleared)
+
+Runs against the configured ANALYTICS_BACKEND and database.
+
+Usage:
+    python benchmarks/bench_country_index.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from core.analytics import analytics_backend  # noqa: E402
+from core.chart_cache import chart_cache  # noqa: E402
+from core.country_index import build_country_index, country_index  # noqa: E402
+from core.views import country_chart_names, get_chart_json  # noqa: E402
+
+
+def timed(fn, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backend = analytics_backend()
+    codes = country_index().codes
+    if not codes:
+        sys.exit("No data: run import_data.py first")
+
+    def per_country_queries():
+        for code in codes:
+            backend.medal_split(code)
+            backend.timeline(code)
+
+    def lookups():
+        index = country_index()
+        for code in codes:
+            index.get(code)
+
+    def charts():
+        for code in codes:
+            for name in country_chart_names(code):
+                get_chart_json(name)
+
+    results = [
+        ('queries', timed(per_country_queries, args.repeat)),
+        ('index', timed(lambda: build_country_index(backend.country_rows()), args.repeat)),
+        ('lookup', timed(lookups, args.repeat)),
+        ('charts', timed(charts, args.repeat, chart_cache.clear)),
+    ]
+    print(f"{len(codes)} countries, backend '{backend.name}', median of {args.repeat}")
+    for name, ms in results:
+        print(f"  {name:<8} {ms:>9.2f} ms total {ms / len(codes):>8.3f} ms / country")
+
+
+if __name__ == '__main__':
+    main()
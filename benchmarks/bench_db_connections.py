@@ -0,0 +1,134 @@
+"""
+Load test: per-request latency with a new database connection per request
+vs. reused connections.
+
+  --mode raw     N threads run a small indexed query, either opening a fresh
+                 psycopg2 connection each time (connect + auth + query + close)
+                 or reusing one connection per thread (what CONN_MAX_AGE does).
+  --mode django  N threads hit a page through Django's test client, with
+                 CONN_MAX_AGE=0 (connection closed after every request) and
+                 with the configured persistent connections (DB_CONN_MAX_AGE).
+
+Needs the configured PostgreSQL database (the gap grows with the network
+round-trip to the server, e.g. a hosted database).
+
+Usage:
+    python benchmarks/bench_db_connections.py --mode raw --concurrency 8 --requests 400
+    python benchmarks/bench_db_connections.py --mode django --url "/api/olympic-stats/?country=FRA&limit=10"
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+QUERY = "SELECT COUNT(*) FROM olympic_stats WHERE country_3_letter_code = %s"
+
+
+def summarize(latencies, wall):
+    latencies = sorted(latencies)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    return {'p50': statistics.median(latencies), 'p95': pct(95), 'p99': pct(99), 'rps': len(latencies) / wall}
+
+
+def run_load(task, concurrency, n_requests):
+    def timed(_):
+        start = time.perf_counter()
+        task()
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, range(n_requests)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def raw_variants():
+    from config.database import connect
+
+    def fresh_connection():
+        conn = connect()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(QUERY, ['FRA'])
+                cur.fetchone()
+        finally:
+            conn.close()
+
+    local = threading.local()
+    opened = []
+
+    def reused_connection():
+        if getattr(local, 'conn', None) is None:
+            local.conn = connect()
+            opened.append(local.conn)
+        with local.conn.cursor() as cur:
+            cur.execute(QUERY, ['FRA'])
+            cur.fetchone()
+        local.conn.rollback()
+
+    def close_reused():
+        for conn in opened:
+            conn.close()
+
+    return [('connect per request', None, fresh_connection, None),
+            ('reused per thread', None, reused_connection, close_reused)]
+
+
+def django_variants(url):
+    import django
+    django.setup()
+    from django.db import connections
+    from django.test import Client
+
+    persistent_age = connections.settings['default']['CONN_MAX_AGE']
+
+    def max_age(seconds):
+        def prepare():
+            # Shared settings dict: read by every thread's connection when it (re)connects
+            connections.close_all()
+            connections.settings['default']['CONN_MAX_AGE'] = seconds
+        return prepare
+
+    def task():
+        response = Client().get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+
+    return [
+        ('CONN_MAX_AGE=0', max_age(0), task, None),
+        (f'CONN_MAX_AGE={persistent_age}', max_age(persistent_age), task, None),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['raw', 'django'], default='raw')
+    parser.add_argument('--url', default='/api/olympic-stats/?country=FRA&limit=10')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400)
+    args = parser.parse_args()
+
+    variants = raw_variants() if args.mode == 'raw' else django_variants(args.url)
+
+    print(f"{'variant':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}")
+    for name, prepare, task, cleanup in variants:
+        if prepare:
+            prepare()
+        task()  # warm-up
+        r = run_load(task, args.concurrency, args.requests)
+        print(f"{name:<22} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f} {r['rps']:>8.1f}")
+        if cleanup:
+            cleanup()
+
+
+if __name__ == '__main__':
+    main()
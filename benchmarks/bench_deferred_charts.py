@@ -0,0 +1,86 @@
+"""
+Inline vs deferred chart loading: page response time and payload sizes.
+
+With DEFERRED_CHARTS=False the figure JSON is embedded in the HTML; with
+DEFERRED_CHARTS=True the page only references /charts/<name>.json, fetched
+by the browser after first paint. Runs in-process with Django's test client
+against the configured database, cold (empty chart cache) and warm.
+
+Page time is the server time to produce the HTML (a proxy for time to first
+byte); "charts" is the total size of the chart requests of a deferred page.
+
+Usage:
+    python benchmarks/bench_deferred_charts.py [--repeat 20]
+"""
+import argparse
+import gzip
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+from core.chart_cache import chart_cache  # noqa: E402
+from core.country_index import clear_country_index  # noqa: E402
+from core.http_cache import response_cache  # noqa: E402
+
+PAGES = ['/', '/explorer/']
+
+CHART_URL = re.compile(rb"loadChart\('[^']+', '([^']+)'\)")
+
+
+def timed_get(client, url):
+    start = time.perf_counter()
+    response = client.get(url)
+    return (time.perf_counter() - start) * 1000, response.content
+
+
+def measure(client, page, repeat, cold):
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            chart_cache.clear()
+            clear_country_index()
+        # The page itself is always rendered (the cache column is about the charts)
+        response_cache.clear()
+        elapsed, html = timed_get(client, page)
+        timings.append(elapsed)
+    charts = [client.get(url.decode()).content for url in CHART_URL.findall(html)]
+    return {
+        'ms': statistics.median(timings),
+        'html': len(html),
+        'html_gz': len(gzip.compress(html)),
+        'charts': sum(len(c) for c in charts),
+        'charts_gz': sum(len(gzip.compress(c)) for c in charts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    client = Client()
+
+    print(f"{'page':<12} {'mode':<9} {'cache':<5} {'page ms':>8} {'html':>9} {'html gz':>8} {'charts':>9} {'charts gz':>10}")
+    for page in PAGES:
+        for deferred in (False, True):
+            with override_settings(DEFERRED_CHARTS=deferred):
+                client.get(page)  # warm-up (templates, connections)
+                for cold in (True, False):
+                    r = measure(client, page, args.repeat, cold)
+                    print(f"{page:<12} {'deferred' if deferred else 'inline':<9} {'cold' if cold else 'warm':<5} "
+                          f"{r['ms']:>8.2f} {r['html']:>9} {r['html_gz']:>8} {r['charts']:>9} {r['charts_gz']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Micro-benchmark: feature-matrix building for MLService.
+
+Compares the former approach (dense pd.DataFrame(0, ...) + one-hot cells
+set in a df.iterrows() loop + results assembled in a second iterrows()
+loop) with core.features (vectorized column mapping + CSR one-hot block +
+column-wise result records), on synthetic country-scenario rows.
+
+Usage:
+    python benchmarks/bench_features.py [--rows 10000,100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from core.features import (  # noqa: E402
+    ONEHOT_PREFIX, XGB_COLUMNS, FeatureBuilder, clip_round, prediction_records
+)
+from core.ml_service import MLService  # noqa: E402
+
+
+def make_scenarios(n_rows, codes, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'country_3_letter_code': rng.choice(codes, n_rows),
+        'year': 2024,
+        'total_athletes': rng.integers(1, 600, n_rows),
+        'total_medals': rng.integers(0, 120, n_rows),
+        'avg_age_athletes': np.where(rng.random(n_rows) < 0.05, np.nan, rng.normal(26, 3, n_rows)),
+        'cumulative_medals': rng.integers(0, 3000, n_rows).astype(float),
+    })
+
+
+def legacy_matrix(df, features):
+    X = pd.DataFrame(0, index=df.index, columns=features)
+    if 'total_athletes' in features: X['total_athletes'] = df['total_athletes']
+    if 'avg_athlete_age' in features: X['avg_athlete_age'] = df['avg_age_athletes'].fillna(24.0)
+    if 'medalist_athletes' in features: X['medalist_athletes'] = df['total_medals']
+    if 'avg_athlete_experience' in features: X['avg_athlete_experience'] = 1.0
+    if 'avg_games_participation' in features: X['avg_games_participation'] = 1.0
+    if 'is_host' in features: X['is_host'] = (df['country_3_letter_code'] == 'FRA').astype(int)
+    for idx, row in df.iterrows():
+        ohe_col = f"country_3_letter_code_{row['country_3_letter_code']}"
+        if ohe_col in features:
+            X.at[idx, ohe_col] = 1
+    return X[features]
+
+
+def legacy_records(df, preds):
+    df = df.assign(xgb_pred=[max(0, int(round(x))) for x in preds], rf_pred=0)
+    results = []
+    for _, row in df.iterrows():
+        consensus = int(round((row['xgb_pred'] + row['rf_pred']) / 2))
+        results.append({
+            'country': row['country_3_letter_code'],
+            'predicted_medals_xgb': row['xgb_pred'],
+            'predicted_medals_rf': row['rf_pred'],
+            'predicted_medals': consensus,
+            'baseline_athletes': int(row['total_athletes']),
+        })
+    results.sort(key=lambda x: x['predicted_medals'], reverse=True)
+    return results
+
+
+def timed(fn, repeat):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    service = MLService()
+    features = service.xgb_features
+    if not features:
+        print("XGBoost model not available, nothing to benchmark.")
+        return
+    codes = [f[len(ONEHOT_PREFIX):] for f in features if f.startswith(ONEHOT_PREFIX)] + ['XXX']
+
+    print(f"{'rows':>8} {'step':<10} {'legacy (s)':>11} {'vectorized (s)':>15} {'speedup':>8} {'identical':>10}")
+    for n_rows in [int(r) for r in args.rows.split(',')]:
+        df = make_scenarios(n_rows, codes)
+        builder = FeatureBuilder(features, XGB_COLUMNS)
+
+        legacy_s, X_legacy = timed(lambda: legacy_matrix(df, features), args.repeat)
+        new_s, X_new = timed(lambda: builder.build(df).to_frame(), args.repeat)
+        same = np.array_equal(X_legacy.to_numpy(dtype=float), X_new.to_numpy(), equal_nan=True)
+        print(f"{n_rows:>8} {'features':<10} {legacy_s:>11.4f} {new_s:>15.4f} {legacy_s / new_s:>7.1f}x {str(same):>10}")
+
+        preds = service.xgb_model.predict(builder.build(df))
+        legacy_s, r_legacy = timed(lambda: legacy_records(df, preds), args.repeat)
+        new_s, r_new = timed(lambda: prediction_records(df, clip_round(preds), np.zeros(n_rows, dtype=np.int64)), args.repeat)
+        print(f"{n_rows:>8} {'records':<10} {legacy_s:>11.4f} {new_s:>15.4f} {legacy_s / new_s:>7.1f}x {str(r_legacy == r_new):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: figure serialization.
+
+Compares the legacy path (plotly.express -> safe_json_dump, i.e.
+fig.to_dict() + deep_decode_bdata + json.dumps) with the direct
+columnar builder in core.figures, on charts of 10k to 1M points.
+
+Usage:
+    python benchmarks/bench_figures.py [--sizes 10000,100000,1000000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import plotly.express as px  # noqa: E402
+from core.figures import bar_figure, dumps_figure, line_figure  # noqa: E402
+from core.views import safe_json_dump  # noqa: E402
+
+
+def make_frame(n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'year': np.arange(n_points, dtype=np.int64),
+        'total_medals': rng.integers(0, 300, n_points).astype(float),
+        'season': np.where(rng.random(n_points) < 0.5, 'Summer', 'Winter'),
+    })
+
+
+def legacy_line(df):
+    fig = px.line(df, x='year', y='total_medals', color='season', markers=True,
+                  labels={'year': 'Année', 'total_medals': 'Médailles', 'season': 'Saison'})
+    return safe_json_dump(fig)
+
+
+def direct_line(df):
+    return dumps_figure(line_figure(df['year'], df['total_medals'], df['season'], title=None,
+                                    x_label='Année', y_label='Médailles', group_label='Saison'))
+
+
+def legacy_bar(df):
+    fig = px.bar(df, x='year', y='total_medals', color='total_medals')
+    return safe_json_dump(fig)
+
+
+def direct_bar(df):
+    return dumps_figure(bar_figure(df['year'], df['total_medals'], title=None,
+                                   x_label='year', y_label='total_medals'))
+
+
+def best_of(fn, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), payload
+
+
+def same_points(legacy_payload, direct_payload):
+    legacy = json.loads(legacy_payload)['data']
+    direct = json.loads(direct_payload)['data']
+    return all(a['x'] == b['x'] and a['y'] == b['y'] for a, b in zip(legacy, direct))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'chart':<6} {'points':>9} {'legacy (s)':>11} {'direct (s)':>11} {'speedup':>8} {'same data':>10}")
+    for n_points in [int(s) for s in args.sizes.split(',')]:
+        df = make_frame(n_points)
+        for name, legacy, direct in [('line', legacy_line, direct_line), ('bar', legacy_bar, direct_bar)]:
+            legacy_s, legacy_payload = best_of(legacy, df, args.repeat)
+            direct_s, direct_payload = best_of(direct, df, args.repeat)
+            print(f"{name:<6} {n_points:>9} {legacy_s:>11.4f} {direct_s:>11.4f} "
+                  f"{legacy_s / direct_s:>7.1f}x {str(same_points(legacy_payload, direct_payload)):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark: loading the dataset from the CSV vs. its partitioned
+Parquet conversion (core/parquet_dataset.py), on synthetic data.
+
+For each scale: full CSV parse, full Parquet read, then the slices the app
+actually needs (ML baseline columns of the Summer Games, one country's
+history, the Games since 2000), with the resulting DataFrame memory.
+
+Usage:
+    python benchmarks/bench_parquet.py [--scales 1,10,100] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from benchmarks import synthetic  # noqa: E402
+from core import parquet_dataset  # noqa: E402
+
+BASELINE_COLUMNS = [
+    'country_3_letter_code', 'year', 'total_athletes', 'total_medals', 'avg_age_athletes', 'cumulative_medals'
+]
+
+CASES = [
+    ('csv: full parse', lambda csv, pq: pd.read_csv(csv)),
+    ('parquet: full read', lambda csv, pq: parquet_dataset.read_dataset(pq)),
+    ('parquet: ML baseline (Summer, 6 columns)',
+     lambda csv, pq: parquet_dataset.read_dataset(pq, columns=BASELINE_COLUMNS, season='Summer')),
+    ('parquet: one country (FRA)',
+     lambda csv, pq: parquet_dataset.read_dataset(pq, columns=['year', 'season', 'total_medals'], countries=['FRA'])),
+    ('parquet: Games since 2000',
+     lambda csv, pq: parquet_dataset.read_dataset(pq, years=range(2000, 2100))),
+]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1,10,100', help="Comma-separated multiples of dataset.csv")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    base = synthetic.load_base()
+    work_dir = tempfile.mkdtemp(prefix='bench_parquet_')
+    try:
+        for scale in [int(s) for s in args.scales.split(',')]:
+            csv_path = os.path.join(work_dir, f'dataset_{scale}x.csv')
+            pq_path = os.path.join(work_dir, f'parquet_{scale}x')
+            n_rows = synthetic.write_csv(scale, csv_path, base=base)
+            start = time.perf_counter()
+            parquet_dataset.convert_csv(csv_path, pq_path)
+            convert_ms = (time.perf_counter() - start) * 1000
+
+            print(f"\n{scale}x ({n_rows:,} rows) - CSV {os.path.getsize(csv_path) / 1024:,.0f} KiB, "
+                  f"Parquet {dir_size(pq_path) / 1024:,.0f} KiB, conversion {convert_ms:,.0f} ms")
+            for label, case in CASES:
+                ms, df = best_of(lambda: case(csv_path, pq_path), args.repeat)
+                memory = df.memory_usage(deep=True).sum() / 1024
+                print(f"  {label:<42} {ms:>9.1f} ms  {len(df):>9,} rows  {memory:>10,.0f} KiB")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
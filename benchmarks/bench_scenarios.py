@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: batch what-if predictions (MLService.predict_scenarios).
+
+Times batches of single-country scenarios (one model row each: host country
+and delegation size varied) and of whole-field scenarios (every current
+country per scenario), from parsing to the predictions frame.
+
+Needs the configured database (or ANALYTICS_BACKEND=duckdb) and the models.
+
+Usage:
+    python benchmarks/bench_scenarios.py [--sizes 10,100,1000,10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+django.setup()
+
+import numpy as np  # noqa: E402
+from core.ml_service import MLService  # noqa: E402
+
+HOSTS = ['FRA', 'USA', 'GBR', 'JPN', 'AUS', 'ITA', 'GER', 'CHN']
+
+
+def single_country(n, rng):
+    countries = rng.choice(HOSTS, n)
+    return [
+        {'id': i, 'host': rng.choice(HOSTS), 'countries': [code], 'total_athletes': int(rng.integers(50, 600))}
+        for i, code in enumerate(countries)
+    ]
+
+
+def whole_field(n, rng):
+    return [{'id': i, 'host': HOSTS[i % len(HOSTS)], 'total_athletes': int(rng.integers(50, 600))} for i in range(n)]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,100,1000,10000', help="Comma-separated numbers of scenarios")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    service = MLService()
+    rng = np.random.default_rng(0)
+    service.predict_scenarios([{'host': 'FRA'}])  # baselines + models loaded
+
+    for label, make in (('single-country', single_country), ('whole-field', whole_field)):
+        print(f"\n{label} scenarios")
+        for n in [int(s) for s in args.sizes.split(',')]:
+            scenarios = make(n, rng)
+            try:
+                ms, df = best_of(lambda: service.predict_scenarios(scenarios), args.repeat)
+            except ValueError as e:
+                print(f"  {n:>7,} scenarios: {e}")
+                continue
+            print(f"  {n:>7,} scenarios  {len(df):>9,} rows  {ms:>9.1f} ms  ({ms * 1000 / len(df):.2f} us/row)")
+
+
+if __name__ == '__main__':
+    main()
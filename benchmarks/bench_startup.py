@@ -0,0 +1,94 @@
+"""
+Startup budget: cold start of the WSGI application (``import config.wsgi``
+plus the URLconf, as the first request loads it) in a fresh interpreter,
+measured with ``python -X importtime``.
+
+Reports the wall time, the import time per package and any heavy library
+imported at startup (they should load on first use, see core.apps.warm_up).
+Exits with status 1 when the best run is over ``--budget-ms`` or a heavy
+library is imported, so it can gate CI.
+
+The warm-up settings are turned off for the measurement (the lazy path);
+``--warm-up`` keeps them as configured.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 300] [--repeat 5] [--top 15] [--warm-up]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported by a cold start
+HEAVY_MODULES = ('numpy', 'pandas', 'scipy', 'pyarrow', 'duckdb', 'plotly', 'xgboost', 'sklearn', 'joblib')
+
+COLD_START = r'''
+import sys, time
+start = time.perf_counter()
+import config.wsgi
+from django.urls import get_resolver
+get_resolver().urlconf_module
+print(f"wall_ms={(time.perf_counter() - start) * 1000:.1f}")
+print("heavy=" + ",".join(m for m in sys.argv[1:] if m in sys.modules))
+'''
+
+IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \| *(\S+)$')
+
+
+def cold_start(warm_up):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+    if not warm_up:
+        env.update(ML_PRELOAD_MODELS='False', ML_WARMUP_ON_STARTUP='False')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', COLD_START, *HEAVY_MODULES],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode:
+        sys.exit(f"Cold start failed:\n{proc.stderr[-2000:]}")
+
+    out = dict(line.split('=', 1) for line in proc.stdout.splitlines() if '=' in line)
+    packages = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            # Self time, summed per top-level package
+            package = match.group(2).split('.')[0]
+            packages[package] = packages.get(package, 0) + int(match.group(1)) / 1000
+    return {
+        'wall_ms': float(out['wall_ms']),
+        'heavy': [m for m in out.get('heavy', '').split(',') if m],
+        'packages': sorted(((ms, name) for name, ms in packages.items()), reverse=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('STARTUP_BUDGET_MS', 300)))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="Slowest packages to list")
+    parser.add_argument('--warm-up', action='store_true', help="Keep ML_PRELOAD_MODELS / ML_WARMUP_ON_STARTUP")
+    args = parser.parse_args()
+
+    runs = [cold_start(args.warm_up) for _ in range(args.repeat)]
+    best = min(runs, key=lambda run: run['wall_ms'])
+
+    print(f"Cold start (config.wsgi + URLconf), best of {args.repeat}: {best['wall_ms']:.0f} ms "
+          f"(median {sorted(r['wall_ms'] for r in runs)[len(runs) // 2]:.0f} ms, budget {args.budget_ms:.0f} ms)")
+    print("\nImport time per package (python -X importtime, self time):")
+    for ms, name in best['packages'][:args.top]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    failures = []
+    if best['wall_ms'] > args.budget_ms:
+        failures.append(f"cold start {best['wall_ms']:.0f} ms > budget {args.budget_ms:.0f} ms")
+    if best['heavy'] and not args.warm_up:
+        failures.append(f"heavy libraries imported at startup: {', '.join(best['heavy'])}")
+    if failures:
+        print(f"\nFAIL: {'; '.join(failures)}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == '__main__':
+    main()
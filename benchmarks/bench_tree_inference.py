@@ -0,0 +1,119 @@
+"""
+Micro-benchmark: NumPy tree arrays (core/tree_ensemble.py) vs the xgboost /
+scikit-learn models they were exported from.
+
+For the latest registry version of each model with tree arrays:
+  - prediction latency per batch size, and an exact-equality check,
+  - cold start in a fresh process: imports + artifact load time, and
+    resident memory (VmRSS) once the model is loaded.
+
+Needs the model registry (``manage.py export_models`` / ``train_models``,
+then ``manage.py export_tree_arrays``).
+
+Usage:
+    python benchmarks/bench_tree_inference.py [--sizes 1,200,10000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+# Run in a fresh interpreter: import the runtime, load the artifact, report timings and RSS
+COLD_START = r'''
+import json, sys, time
+start = time.perf_counter()
+if sys.argv[1] == 'tree-arrays':
+    from core.tree_ensemble import TreeEnsemble
+    imported = time.perf_counter()
+    model = TreeEnsemble.load(sys.argv[2])
+elif sys.argv[1].startswith('xgboost'):
+    import xgboost
+    imported = time.perf_counter()
+    model = xgboost.Booster()
+    model.load_model(sys.argv[2])
+else:
+    import joblib, sklearn.ensemble
+    imported = time.perf_counter()
+    model = joblib.load(sys.argv[2])
+loaded = time.perf_counter()
+rss = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmRSS'))
+print(json.dumps({'import_ms': (imported - start) * 1000, 'load_ms': (loaded - imported) * 1000, 'rss_kb': rss}))
+'''
+
+
+def cold_start(fmt, path, repeat=3):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', COLD_START, fmt, str(path)], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,200,10000', help="Comma-separated batch sizes")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+    import joblib
+    import numpy as np
+    import xgboost as xgb
+    from core.model_registry import ModelRegistry, reference_predict, registry_dir
+    from core.tree_ensemble import TreeEnsemble
+
+    rng = np.random.default_rng(0)
+    for name in ModelRegistry.MODEL_NAMES:
+        model_dir = registry_dir() / name
+        versions = sorted(p for p in model_dir.iterdir() if (p / 'manifest.json').exists()) if model_dir.is_dir() else []
+        manifest = json.loads((versions[-1] / 'manifest.json').read_text()) if versions else {}
+        if not manifest.get('tree_arrays'):
+            print(f"\n{name}: no tree arrays in the registry, skipped")
+            continue
+        target = versions[-1]
+        library_path = target / manifest['artifact']
+        arrays_path = target / manifest['tree_arrays']['artifact']
+
+        if manifest['format'].startswith('xgboost'):
+            library = xgb.Booster()
+            library.load_model(str(library_path))
+        else:
+            library = joblib.load(library_path)
+        ensemble = TreeEnsemble.load(arrays_path)
+        print(f"\n{name} {manifest['version']}: {ensemble.n_trees} trees, {ensemble.n_nodes:,} nodes, "
+              f"depth {ensemble.depth}, {ensemble.nbytes / 1024:.0f} KiB of arrays")
+
+        print(f"  {'rows':>7}  {manifest['format']:>12}  {'tree-arrays':>12}  equal")
+        for n in [int(s) for s in args.sizes.split(',')]:
+            X = (rng.random((n, ensemble.n_features)) * rng.choice([1.0, 30.0, 1000.0], ensemble.n_features))
+            X = X.astype(np.float32)
+            lib_ms, expected = best_of(lambda: reference_predict(library, X), args.repeat)
+            np_ms, got = best_of(lambda: ensemble.predict(X), args.repeat)
+            print(f"  {n:>7,}  {lib_ms:>9.2f} ms  {np_ms:>9.2f} ms  {np.array_equal(expected, got)}")
+
+        print("  cold start (fresh process)   import      load       RSS")
+        for fmt, path in ((manifest['format'], library_path), ('tree-arrays', arrays_path)):
+            stats = cold_start(fmt, path)
+            print(f"  {fmt:<26} {stats['import_ms']:>7.0f} ms {stats['load_ms']:>7.1f} ms "
+                  f"{stats['rss_kb'] / 1024:>6.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+"""
+Benchmark suite: views, ML inference, serialization and import, from 1x to
+1000x the size of data/dataset.csv.
+
+For every scale, a deterministic synthetic dataset (benchmarks/synthetic.py)
+is loaded into a throwaway PostgreSQL database (``test_<dbname>``, created
+and dropped by Django's test-database machinery: the configured database and
+the dataset version stamp of the running app are never touched), then timed:
+
+  import.bulk                import_data.bulk_import_data() of the synthetic CSV
+  import.incremental         incremental_import_data() of the same file (nothing to apply)
+  import.rows                import_data() row by row (only up to --rows-max-scale)
+  view:<url>                 GET through Django's test client, charts inlined,
+                             chart, country index and prediction caches
+                             cleared (cold)
+  ml.predict_paris_2024      MLService.predict_paris_2024(), cache invalidated
+  serialize.safe_json_dump   plotly.express line chart of the dataset -> safe_json_dump()
+  serialize.dumps_figure     the same chart through core.figures
+
+Results (median / min / max ms per benchmark and scale) are written as JSON.
+With --baseline, they are compared to a saved run: every benchmark more than
+--threshold slower is flagged and the exit status is 1.
+
+Usage:
+    python benchmarks/run_suite.py --scales 1,10,100 --output bench.json
+    python benchmarks/run_suite.py --scales 1,10,100 --output new.json --baseline bench.json
+    python benchmarks/run_suite.py --compare new.json --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+# The imports stamp a private version file, not the one of the running app
+WORK_DIR = tempfile.mkdtemp(prefix='olympics-bench-')
+os.environ['DATASET_VERSION_FILE'] = os.path.join(WORK_DIR, '.dataset_version')
+
+import django  # noqa: E402
+django.setup()
+
+import synthetic  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    override_settings, setup_databases, setup_test_environment, teardown_databases,
+)
+
+VIEW_URLS = [
+    '/',
+    '/explorer/',
+    '/predictions/',
+    '/predictions/comparison/',
+    '/api/olympic-stats/?limit=1000',
+]
+
+DEFAULT_THRESHOLD = 0.15
+
+
+def timed(fn, repeat, setup=None):
+    """
+    Runs ``fn`` ``repeat`` times (``setup`` before each run, untimed).
+    """
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': statistics.median(runs),
+        'min_ms': min(runs),
+        'max_ms': max(runs),
+        'runs': len(runs),
+    }
+
+
+def point_importer_at_test_db():
+    """
+    import_data.py reads its connection parameters once at import time; point
+    them at the test database Django just created.
+    """
+    import import_data
+    import_data.DB_PARAMS = dict(import_data.DB_PARAMS, dbname=connection.settings_dict['NAME'])
+    return import_data
+
+
+def clear_caches():
+    from core.chart_cache import chart_cache
+    from core.country_index import clear_country_index
+    from core.http_cache import response_cache
+    from core.ml_service import MLService
+    chart_cache.clear()
+    clear_country_index()
+    response_cache.clear()
+    MLService().invalidate_cache()
+
+
+def bench_import(import_data, csv_path, scale, args):
+    results = {}
+
+    def release_connections():
+        # The bulk swap takes an exclusive lock on olympic_stats
+        connections.close_all()
+
+    results['import.bulk'] = timed(lambda: import_data.bulk_import_data(csv_path), args.import_repeat,
+                                   release_connections)
+    results['import.incremental'] = timed(lambda: import_data.incremental_import_data(csv_path),
+                                          args.import_repeat, release_connections)
+    if scale <= args.rows_max_scale:
+        import_data.CSV_FILE_PATH = csv_path
+        results['import.rows'] = timed(import_data.import_data, args.import_repeat, release_connections)
+    return results
+
+
+def bench_views(repeat):
+    results = {}
+    client = Client()
+    with override_settings(DEFERRED_CHARTS=False):
+        for url in VIEW_URLS:
+            response = client.get(url)  # warm-up (templates, models, connections)
+            if response.status_code != 200:
+                results[f'view:{url}'] = {'error': f"HTTP {response.status_code}"}
+                continue
+            results[f'view:{url}'] = timed(lambda: client.get(url), repeat, clear_caches)
+    return results
+
+
+def bench_ml(repeat):
+    from core.ml_service import MLService
+    service = MLService()
+    service.predict_paris_2024()  # warm-up (model loading)
+    return {'ml.predict_paris_2024': timed(service.predict_paris_2024, repeat, service.invalidate_cache)}
+
+
+def bench_serialization(df, repeat):
+    import plotly.express as px
+    from core.figures import dumps_figure, line_figure
+    from core.views import safe_json_dump
+
+    df = df.sort_values('year', kind='stable')
+    fig = px.line(df, x='year', y='total_medals', color='season', markers=True)
+    return {
+        'serialize.safe_json_dump': timed(lambda: safe_json_dump(fig), repeat),
+        'serialize.dumps_figure': timed(lambda: dumps_figure(line_figure(
+            df['year'], df['total_medals'], df['season'], title=None,
+            x_label='year', y_label='total_medals', group_label='season',
+        )), repeat),
+    }
+
+
+def run_scale(scale, args, import_data):
+    df = synthetic.generate(scale, seed=args.seed)
+    csv_path = os.path.join(WORK_DIR, f'dataset_{scale}x.csv')
+    df.to_csv(csv_path, index=False)
+    print(f"\n=== {scale}x ({len(df):,} rows) ===")
+
+    results = bench_import(import_data, csv_path, scale, args)
+    results.update(bench_views(args.repeat))
+    results.update(bench_ml(args.repeat))
+    results.update(bench_serialization(df, args.repeat))
+    os.remove(csv_path)
+    return [dict(name=name, scale=scale, rows=len(df), **stats) for name, stats in results.items()]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args):
+    if connection.vendor != 'postgresql':
+        sys.exit(f"The benchmark suite needs PostgreSQL (configured backend: {connection.vendor}).")
+
+    # import_data.py resolves db.sql and data/ relative to the project root
+    os.chdir(BASE_DIR)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=False)
+    try:
+        import_data = point_importer_at_test_db()
+        results = []
+        for scale in args.scales:
+            results.extend(run_scale(scale, args, import_data))
+    finally:
+        connections.close_all()
+        teardown_databases(old_config, verbosity=0)
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'scales': args.scales,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+
+def print_results(report):
+    print(f"\n{'benchmark':<42} {'scale':>6} {'median ms':>11} {'min ms':>10} {'max ms':>10}")
+    for r in report['results']:
+        if 'error' in r:
+            print(f"{r['name']:<42} {r['scale']:>5}x {r['error']:>11}")
+        else:
+            print(f"{r['name']:<42} {r['scale']:>5}x {r['median_ms']:>11.2f} {r['min_ms']:>10.2f} {r['max_ms']:>10.2f}")
+
+
+def compare(report, baseline, threshold):
+    """
+    Prints the median of every benchmark against the baseline; returns the regressions.
+    """
+    base = {(r['name'], r['scale']): r for r in baseline['results'] if 'median_ms' in r}
+    regressions = []
+    print(f"\n{'benchmark':<42} {'scale':>6} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for r in report['results']:
+        before = base.get((r['name'], r['scale']))
+        if before is None or 'median_ms' not in r:
+            continue
+        change = r['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(r)
+        print(f"{r['name']:<42} {r['scale']:>5}x {before['median_ms']:>12.2f} {r['median_ms']:>11.2f} "
+              f"{change:>+7.0%}{flag}")
+    print(f"\n{len(regressions)} regression(s) above +{threshold:.0%}.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1,10',
+                        help=f"Comma-separated multiples of dataset.csv (e.g. {','.join(map(str, synthetic.SCALES))})")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per view / inference / serialization")
+    parser.add_argument('--import-repeat', type=int, default=1, help="Timed runs per import mode")
+    parser.add_argument('--rows-max-scale', type=int, default=1, help="Largest scale for the row-by-row importer")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Saved results to compare against")
+    parser.add_argument('--compare', metavar='RESULTS', help="Compare this results file to --baseline without running")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown flagged as a regression (default: 0.15)")
+    args = parser.parse_args()
+    args.scales = [int(s) for s in args.scales.split(',')]
+
+    if args.compare:
+        if not args.baseline:
+            parser.error("--compare needs --baseline")
+        with open(args.compare) as f:
+            report = json.load(f)
+    else:
+        report = run_suite(args)
+        print_results(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Deterministic synthetic OlympicStats data for the benchmark suite.
+
+``generate(scale)`` returns ``scale`` times the rows of ``data/dataset.csv``,
+with the same columns (CSV layout, ready for ``import_data.py``). Copy 0 is
+the real dataset; every other copy is a set of fictional countries
+(``FRA`` -> ``FRA1``, ``FRA2``...) taking part in the same Games, with
+medal counts, delegation sizes and ages jittered by a seeded RNG. The
+number of Games and the length of each country's history stay realistic;
+the number of countries (map, rollups, prediction scenarios) grows with
+the scale.
+
+Usage:
+    python benchmarks/synthetic.py --scale 10 --output /tmp/dataset_10x.csv
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_CSV = os.path.join(BASE_DIR, 'data', 'dataset.csv')
+
+SCALES = (1, 10, 100, 1000)
+
+CODE_COLUMN = 'country_3_letter_code_x'
+MEDAL_COLUMNS = ['bronze_medals', 'gold_medals', 'silver_medals']
+
+
+def load_base(path=DATASET_CSV):
+    return pd.read_csv(path)
+
+
+def synthetic_copy(base, copy_index, rng):
+    """
+    One block of fictional countries derived from the base rows.
+    """
+    df = base.copy()
+    df[CODE_COLUMN] = df[CODE_COLUMN].astype(str) + f"{copy_index:X}"
+    n_rows = len(df)
+
+    for col in MEDAL_COLUMNS:
+        jitter = rng.integers(-1, 2, n_rows)
+        df[col] = np.maximum(0, df[col].fillna(0).to_numpy() + jitter).astype(np.int64)
+    df['total_medals'] = df[MEDAL_COLUMNS].sum(axis=1)
+    df['medals_in_current_year'] = df['total_medals']
+    # Only the real host country hosts
+    df['is_host'] = 0
+
+    athletes = df['total_athletes'].fillna(1).to_numpy()
+    df['total_athletes'] = np.maximum(1, np.rint(athletes * rng.uniform(0.8, 1.2, n_rows))).astype(np.int64)
+    df['avg_age_athletes'] = (df['avg_age_athletes'] + rng.normal(0, 1, n_rows)).round(2)
+
+    # Medals won before each Games, in chronological order per country
+    order = df.sort_values('year', kind='stable').index
+    won = df.loc[order].groupby(CODE_COLUMN)['total_medals']
+    df.loc[order, 'cumulative_medals'] = (won.cumsum() - df.loc[order, 'total_medals']).astype(float)
+    return df
+
+
+def generate(scale, seed=0, base=None):
+    """
+    ``scale`` x the base dataset. Same (scale, seed) -> same rows.
+    """
+    if scale < 1:
+        raise ValueError("scale must be >= 1")
+    base = load_base() if base is None else base
+    rng = np.random.default_rng(seed)
+    blocks = [base] + [synthetic_copy(base, k, rng) for k in range(1, scale)]
+    return pd.concat(blocks, ignore_index=True)
+
+
+def write_csv(scale, path, seed=0, base=None):
+    """
+    Writes the synthetic dataset; returns the number of rows.
+    """
+    df = generate(scale, seed, base)
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args()
+
+    n_rows = write_csv(args.scale, args.output, args.seed)
+    print(f"{n_rows:,} rows written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
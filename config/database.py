@@ -0,0 +1,104 @@
+"""
+Database access shared by Django (settings.py) and the standalone scripts
+(import_data.py, apply_schema.py, benchmarks).
+
+- ``db_params()``: connection parameters, parsed once from the environment
+  (``user`` / ``password`` / ``host`` / ``port`` / ``dbname``, or ``DATABASE_URL``).
+- ``django_database()``: the ``DATABASES['default']`` entry. Connections are
+  persistent (``CONN_MAX_AGE``) and health-checked before reuse
+  (``CONN_HEALTH_CHECKS``), so a request no longer pays a TCP + TLS + auth
+  handshake.
+- ``connect()``: a single psycopg2 connection for the scripts, which are
+  one-shot processes holding one connection for their whole run.
+
+There is no connection pool in the app (at most one connection per thread):
+behind a transaction-mode pooler (Supabase, port 6543), the pool size is the
+pooler's setting. Connection reuse and setup time on the Django side are
+reported by ``/debug/perf/`` (see core/perf.py).
+
+No Django import here: the scripts use this module without settings.
+"""
+import os
+from urllib.parse import unquote, urlparse
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def env_flag(name, default=False):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+def db_params():
+    """
+    psycopg2 keyword arguments from the environment. The individual variables
+    win over DATABASE_URL.
+    """
+    params = {}
+    url = os.environ.get('DATABASE_URL')
+    if url:
+        parsed = urlparse(url)
+        params = {
+            'user': unquote(parsed.username) if parsed.username else None,
+            'password': unquote(parsed.password) if parsed.password else None,
+            'host': parsed.hostname,
+            'port': str(parsed.port) if parsed.port else None,
+            'dbname': parsed.path.lstrip('/') or None,
+        }
+    for key in ('user', 'password', 'host', 'port', 'dbname'):
+        if os.environ.get(key):
+            params[key] = os.environ[key]
+    return params
+
+
+# Fail fast on an unreachable server, keep long idle connections alive through NATs / poolers
+CONNECT_OPTIONS = {
+    'connect_timeout': env_int('DB_CONNECT_TIMEOUT', 10),
+    'keepalives': 1,
+    'keepalives_idle': 30,
+}
+
+
+# Ports of transaction-mode poolers (Supabase / PgBouncer: 6543): a server
+# connection is only held for one transaction
+TRANSACTION_POOLER_PORTS = ('6543',)
+
+
+def behind_transaction_pooler(params=None):
+    params = params if params is not None else db_params()
+    return str(params.get('port')) in TRANSACTION_POOLER_PORTS
+
+
+def django_database():
+    params = db_params()
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': params.get('dbname'),
+        'USER': params.get('user'),
+        'PASSWORD': params.get('password'),
+        'HOST': params.get('host'),
+        'PORT': params.get('port'),
+        # Persistent connections: reused across requests for up to CONN_MAX_AGE seconds
+        'CONN_MAX_AGE': env_int('DB_CONN_MAX_AGE', 60),
+        # ...after a cheap liveness check, so a connection dropped by the server is replaced
+        'CONN_HEALTH_CHECKS': env_flag('DB_CONN_HEALTH_CHECKS', True),
+        # Required behind a transaction-mode pooler (e.g. Supabase on port 6543), which cannot
+        # keep the server-side cursors used by QuerySet.iterator(): on by default there
+        'DISABLE_SERVER_SIDE_CURSORS': env_flag('DISABLE_SERVER_SIDE_CURSORS', behind_transaction_pooler(params)),
+        'OPTIONS': dict(CONNECT_OPTIONS),
+    }
+
+
+def connect(params=None, **overrides):
+    """
+    One psycopg2 connection (``params`` defaults to ``db_params()``).
+    """
+    import psycopg2
+    kwargs = dict(CONNECT_OPTIONS)
+    kwargs.update(params if params is not None else db_params())
+    kwargs.update(overrides)
+    return psycopg2.connect(**kwargs)
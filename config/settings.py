@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from config.database import db_params, django_database
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,6 +29,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the other middleware (removes itself unless PERF_INSTRUMENTATION)
+    'core.perf.PerfMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,21 +59,19 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
-# Database
-try:
+# Serve / and /explorer/ with the async views of core/async_views.py (use with an ASGI server)
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False').lower() in ('1', 'true', 'yes')
+
+# Database (connection parameters shared with the scripts, persistent connections, see config/database.py)
+if db_params():
     DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': os.environ.get('dbname'),
-            'USER': os.environ.get('user'),
-            'PASSWORD': os.environ.get('password'),
-            'HOST': os.environ.get('host'),
-            'PORT': os.environ.get('port'),
-        }
+        'default': django_database(),
     }
-except Exception:
-    # Fallback to sqlite if env vars missing (dev safety)
+else:
+    # No database configured: SQLite for Django's own tables (sessions, admin).
+    # Use with ANALYTICS_BACKEND='duckdb' to serve the dashboard without a server.
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
@@ -78,6 +79,11 @@ except Exception:
         }
     }
 
+# Engine of the dashboard / prediction queries (see core/analytics.py):
+# 'postgres' (Django ORM) or 'duckdb' (embedded, over ANALYTICS_SOURCE: dataset.csv or Parquet)
+ANALYTICS_BACKEND = os.environ.get('ANALYTICS_BACKEND', 'postgres')
+ANALYTICS_SOURCE = os.environ.get('ANALYTICS_SOURCE', os.path.join(BASE_DIR, 'data', 'dataset.csv'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     { 'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator', },
@@ -94,4 +100,55 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+# Pre-rendered pages and chart payloads (`manage.py export_static`)
+STATIC_EXPORT_DIR = os.path.join(BASE_DIR, 'static_export')
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Dataset version token, stamped by import_data.py after every load
+DATASET_VERSION_FILE = os.environ.get('DATASET_VERSION_FILE', os.path.join(BASE_DIR, 'data', '.dataset_version'))
+
+# Per-request timings: Server-Timing headers + ring buffer summarized at /debug/perf/ (see core/perf.py)
+PERF_INSTRUMENTATION = os.environ.get('PERF_INSTRUMENTATION', 'False').lower() in ('1', 'true', 'yes')
+PERF_BUFFER_SIZE = int(os.environ.get('PERF_BUFFER_SIZE', 1000))
+
+# manage.py check_query_plans: a sequential scan on a table with more rows than this fails the check
+QUERY_PLAN_SEQ_SCAN_MIN_ROWS = int(os.environ.get('QUERY_PLAN_SEQ_SCAN_MIN_ROWS', 10000))
+
+# Official Paris 2024 medal table (see core/reference_data.py)
+PARIS_2024_RESULTS_FILE = os.path.join(BASE_DIR, 'data', 'res2024.csv')
+
+# In-process cache of serialized Plotly figures (LRU, bounded by total payload size)
+CHART_CACHE_MAX_BYTES = int(os.environ.get('CHART_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+# Server-side cache of rendered responses, valid for one ETag (core/http_cache.py); 0 disables it
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# Pages ship without figure JSON; each chart is fetched from /charts/<name>.json after first paint
+DEFERRED_CHARTS = os.environ.get('DEFERRED_CHARTS', 'True').lower() in ('1', 'true', 'yes')
+
+# Model registry (versioned native artifacts, see core/model_registry.py)
+MODEL_REGISTRY_DIR = os.path.join(BASE_DIR, 'ml_models', 'registry')
+# Optional version pins, e.g. {'xgb': 'v20240801120000'}; latest version otherwise
+MODEL_VERSIONS = {}
+
+# Serve registry models from their NumPy tree arrays when present (no xgboost/scikit-learn at serve time)
+ML_TREE_INFERENCE = os.environ.get('ML_TREE_INFERENCE', 'True').lower() in ('1', 'true', 'yes')
+
+# Training features cached by `manage.py train_models` (one file per dataset version)
+TRAINING_CACHE_DIR = os.path.join(BASE_DIR, 'ml_models', '.cache')
+
+# Load the ML models (and the views' libraries) when the WSGI/ASGI application starts,
+# before the first request (core.apps.warm_up); otherwise on first use
+ML_PRELOAD_MODELS = os.environ.get('ML_PRELOAD_MODELS', 'False').lower() in ('1', 'true', 'yes')
+
+# Also fill the prediction cache when the application starts
+# (off by default: it queries the database)
+ML_WARMUP_ON_STARTUP = os.environ.get('ML_WARMUP_ON_STARTUP', 'False').lower() in ('1', 'true', 'yes')
+
+# Data API (core/api.py): largest page a client can request
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 50000))
+
+# Scenario prediction API (core/scenarios.py): scenarios per call, and (scenario, country) rows per call
+SCENARIO_MAX_SCENARIOS = int(os.environ.get('SCENARIO_MAX_SCENARIOS', 10000))
+SCENARIO_MAX_ROWS = int(os.environ.get('SCENARIO_MAX_ROWS', 100000))
@@ -1,12 +1,28 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from core import views
+from core import api, async_views, http_cache, perf, views
+
+# ASYNC_VIEWS=True serves the dashboard with the async views (run under ASGI)
+home_view = async_views.home if settings.ASYNC_VIEWS else views.home
+explorer_view = async_views.explorer if settings.ASYNC_VIEWS else views.explorer
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', views.home, name='home'),
-    path('explorer/', views.explorer, name='explorer'),
+    path('', home_view, name='home'),
+    path('explorer/', explorer_view, name='explorer'),
+    path('explorer/<str:code>/', explorer_view, name='explorer_country'),
+    # Async views, always mounted for side-by-side comparisons (benchmarks/bench_async_views.py)
+    path('async/', async_views.home, name='home_async'),
+    path('async/explorer/', async_views.explorer, name='explorer_async'),
+    path('async/explorer/<str:code>/', async_views.explorer, name='explorer_country_async'),
+    path('charts/<str:name>.json', views.chart_json, name='chart_json'),
     path('myths/', views.myths, name='myths'),
     path('predictions/', views.predictions, name='predictions'),
     path('predictions/comparison/', views.comparison, name='comparison'),
+    path('status/models/', views.model_status, name='model_status'),
+    path('api/olympic-stats/', api.olympic_stats, name='api_olympic_stats'),
+    path('api/predictions/scenarios/', api.predict_scenarios, name='api_predict_scenarios'),
+    path('debug/perf/', perf.perf_summary, name='perf_summary'),
+    path('debug/cache/', http_cache.cache_status, name='cache_status'),
 ]
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Optional warm-up before the first request (ML_PRELOAD_MODELS / ML_WARMUP_ON_STARTUP)
+from core.apps import warm_up  # noqa: E402
+warm_up()
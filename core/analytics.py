@@ -0,0 +1,240 @@
+"""
+Analytics backends: the dashboard and prediction queries, behind one interface.
+
+``ANALYTICS_BACKEND`` selects the engine:
+
+- ``'postgres'`` (default): Django ORM on ``olympic_stats`` and the
+  ``olympic_dashboard_summary`` materialized view.
+- ``'duckdb'``: embedded columnar engine over ``ANALYTICS_SOURCE``, either
+  ``data/dataset.csv`` or its Parquet conversion (a file, or a directory of
+  hive-partitioned files). No database server is needed to run the
+  dashboard, the predictions or the benchmarks, and GROUP BYs are
+  vectorized. The source is loaded into an in-memory table once and
+  reloaded when its files change.
+
+Every method returns plain Python / pandas structures, identical for both
+backends. The data API (core/api.py) and the imports stay on PostgreSQL.
+"""
+import glob
+import os
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Sum
+from django.utils import timezone
+from .models import DashboardSummary, OlympicStats
+
+SNAPSHOT_FIELDS = (
+    'is_total', 'country_3_letter_code', 'total_games', 'total_countries',
+    'total_athletes', 'total_medals', 'refreshed_at'
+)
+
+# Pie chart labels -> medal column
+MEDAL_SPLIT = (('Or', 'gold_medals'), ('Argent', 'silver_medals'), ('Bronze', 'bronze_medals'))
+
+# Columns of the per-country rollup index (core/country_index.py)
+COUNTRY_ROW_FIELDS = ('country_3_letter_code', 'year', 'season', 'total_medals', *(column for _, column in MEDAL_SPLIT))
+
+
+def source_files(source):
+    """
+    Files behind a DuckDB ``ANALYTICS_SOURCE``: the file itself, or every Parquet file of a directory.
+    """
+    source = Path(source)
+    if source.is_dir():
+        return sorted(glob.glob(str(source / '**' / '*.parquet'), recursive=True))
+    return [str(source)]
+
+
+def source_stamp(source):
+    """
+    ((path, mtime_ns, size), ...) of the source files, None if one is missing.
+    Changes whenever the data the DuckDB backend reads changes.
+    """
+    try:
+        return tuple((f, stat.st_mtime_ns, stat.st_size) for f in source_files(source) for stat in [os.stat(f)])
+    except OSError:
+        return None
+
+
+class PostgresBackend:
+    name = 'postgres'
+
+    def dashboard_rows(self):
+        """
+        (is_total, code, games, countries, athletes, medals, refreshed_at) rows,
+        grand total first, then countries by medals (descending, ties by code).
+        """
+        return list(DashboardSummary.objects.order_by('-is_total', '-total_medals', 'country_3_letter_code').values_list(*SNAPSHOT_FIELDS))
+
+    def medal_split(self, country):
+        """{'Or': ..., 'Argent': ..., 'Bronze': ...} totals (None without rows)."""
+        return OlympicStats.objects.filter(country_3_letter_code=country).aggregate(
+            **{label: Sum(column) for label, column in MEDAL_SPLIT}
+        )
+
+    def timeline(self, country):
+        """(year, season, total_medals) rows of a country, by year."""
+        return list(
+            OlympicStats.objects
+            .filter(country_3_letter_code=country)
+            .order_by('year')
+            .values_list('year', 'season', 'total_medals')
+        )
+
+    def country_rows(self):
+        """COUNTRY_ROW_FIELDS of every row, by country then year (one scan for all countries)."""
+        return list(
+            OlympicStats.objects
+            .exclude(country_3_letter_code=None)
+            .order_by('country_3_letter_code', 'year')
+            .values_list(*COUNTRY_ROW_FIELDS)
+        )
+
+    def top_hosts(self, limit=10):
+        """(country, number of hosted Games) rows, most first."""
+        return list(
+            OlympicStats.objects
+            .filter(is_host=1)
+            .values('country_3_letter_code')
+            .annotate(host_count=Count('year'))
+            .order_by('-host_count', 'country_3_letter_code')
+            .values_list('country_3_letter_code', 'host_count')[:limit]
+        )
+
+    def season_rows(self, season, fields):
+        """DataFrame of ``fields`` for every row of a season."""
+        import pandas as pd
+        return pd.DataFrame(list(OlympicStats.objects.filter(season=season).values(*fields)))
+
+
+class DuckDBBackend:
+    name = 'duckdb'
+
+    # dataset.csv column -> olympic_stats column
+    CSV_RENAMES = {'country_3_letter_code_x': 'country_3_letter_code'}
+
+    def __init__(self, source):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImproperlyConfigured("ANALYTICS_BACKEND='duckdb' needs the duckdb package")
+        self._duckdb = duckdb
+        self.source = Path(source)
+        self._lock = threading.Lock()
+        self._con = None
+        self._stamp = None
+
+    def _scan_sql(self):
+        if self.source.is_dir():
+            return f"read_parquet('{self.source.as_posix()}/**/*.parquet', hive_partitioning = true)"
+        if self.source.suffix == '.parquet':
+            return f"read_parquet('{self.source.as_posix()}')"
+        return f"read_csv_auto('{self.source.as_posix()}', header = true)"
+
+    def _connection(self):
+        """
+        Per-call cursor on the shared in-memory database (DuckDB cursors are
+        safe to use from one thread each), reloading the table if the source changed.
+        """
+        stamp = source_stamp(self.source)
+        if not stamp:
+            raise ImproperlyConfigured(f"ANALYTICS_SOURCE not found: {self.source}")
+        with self._lock:
+            if self._con is None or stamp != self._stamp:
+                con = self._duckdb.connect(':memory:')
+                con.execute(f"CREATE TABLE raw AS SELECT * FROM {self._scan_sql()}")
+                columns = [row[0] for row in con.execute("DESCRIBE raw").fetchall()]
+                select = ', '.join(
+                    f'"{c}" AS {self.CSV_RENAMES[c]}' if c in self.CSV_RENAMES else f'"{c}"' for c in columns
+                )
+                con.execute(f"CREATE TABLE olympic_stats AS SELECT {select} FROM raw")
+                con.execute("DROP TABLE raw")
+                if self._con is not None:
+                    self._con.close()
+                self._con, self._stamp = con, stamp
+            return self._con.cursor()
+
+    def _fetch(self, sql, params=None):
+        cur = self._connection()
+        try:
+            return cur.execute(sql, params or []).fetchall()
+        finally:
+            cur.close()
+
+    def dashboard_rows(self):
+        # Same single GROUPING SETS pass as the olympic_dashboard_summary view (db.sql)
+        rows = self._fetch("""
+            SELECT
+                GROUPING(country_3_letter_code) = 1 AS is_total,
+                country_3_letter_code,
+                COUNT(DISTINCT slug_game) + (COUNT(*) > COUNT(slug_game))::INT AS total_games,
+                COUNT(DISTINCT country_3_letter_code) + (COUNT(*) > COUNT(country_3_letter_code))::INT AS total_countries,
+                COALESCE(SUM(total_athletes), 0)::BIGINT AS total_athletes,
+                COALESCE(SUM(total_medals), 0)::BIGINT AS total_medals
+            FROM olympic_stats
+            GROUP BY GROUPING SETS ((country_3_letter_code), ())
+            ORDER BY is_total DESC, total_medals DESC, country_3_letter_code
+        """)
+        # Computed on the fly: "refreshed" now (an aware datetime, like the view's timestamptz)
+        refreshed_at = timezone.now()
+        return [row + (refreshed_at,) for row in rows]
+
+    def medal_split(self, country):
+        sums = ', '.join(f'SUM({column})' for _, column in MEDAL_SPLIT)
+        row = self._fetch(f"SELECT {sums} FROM olympic_stats WHERE country_3_letter_code = ?", [country])[0]
+        return {label: (int(value) if value is not None else None) for (label, _), value in zip(MEDAL_SPLIT, row)}
+
+    def timeline(self, country):
+        return self._fetch(
+            "SELECT year, season, total_medals FROM olympic_stats WHERE country_3_letter_code = ? ORDER BY year",
+            [country]
+        )
+
+    def country_rows(self):
+        return self._fetch(f"""
+            SELECT {', '.join(COUNTRY_ROW_FIELDS)}
+            FROM olympic_stats
+            WHERE country_3_letter_code IS NOT NULL
+            ORDER BY country_3_letter_code, year
+        """)
+
+    def top_hosts(self, limit=10):
+        return self._fetch("""
+            SELECT country_3_letter_code, COUNT(year) AS host_count
+            FROM olympic_stats
+            WHERE is_host = 1
+            GROUP BY country_3_letter_code
+            ORDER BY host_count DESC, country_3_letter_code
+            LIMIT ?
+        """, [limit])
+
+    def season_rows(self, season, fields):
+        cur = self._connection()
+        try:
+            return cur.execute(f"SELECT {', '.join(fields)} FROM olympic_stats WHERE season = ?", [season]).df()
+        finally:
+            cur.close()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def analytics_backend():
+    """
+    The configured backend (``settings.ANALYTICS_BACKEND``), created once per process.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'ANALYTICS_BACKEND', 'postgres')
+                if name == 'postgres':
+                    _backend = PostgresBackend()
+                elif name == 'duckdb':
+                    _backend = DuckDBBackend(settings.ANALYTICS_SOURCE)
+                else:
+                    raise ImproperlyConfigured(f"Unknown ANALYTICS_BACKEND '{name}' (postgres, duckdb)")
+    return _backend
@@ -0,0 +1,187 @@
+"""
+JSON API: read-only data access over OlympicStats, and batch what-if predictions.
+
+    GET /api/olympic-stats/?country=FRA,USA&season=Summer&year_min=1990&year_max=2020
+                           &fields=year,country_3_letter_code,total_medals&limit=5000
+                           &after=1996,1234
+
+Rows are ordered by ``(year, id)`` and paginated with a keyset cursor:
+pass the ``next`` value of a page as ``after`` to get the following one
+(no OFFSET, so deep pages cost the same as the first). The response is
+streamed from a chunked ``values_list().iterator()``: memory stays flat
+whatever the page size. Responses are gzip-compressed when the client
+accepts it.
+
+Response shape (columnar header + row arrays, compact for large pages)::
+
+    {"fields": [...], "rows": [[...], ...], "count": 5000, "next": "1996,1234"}
+
+    POST /api/predictions/scenarios/   {"scenarios": [{"host": "USA", "season": "Summer", ...}, ...]}
+
+scores every (scenario, country) pair in one batch (scenario format: core/scenarios.py)
+and answers in the same columnar shape, with the versions of the models used.
+"""
+import json
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET, require_POST
+from .http_cache import versioned
+from .model_registry import registry
+from .models import OlympicStats
+from .perf import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+API_FIELDS = [field.attname for field in OlympicStats._meta.concrete_fields]
+
+DEFAULT_PAGE_SIZE = 1000
+
+# Rows fetched per database round-trip while streaming
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+class ApiError(ValueError):
+    pass
+
+
+def _int_param(request, name, default=None):
+    value = request.GET.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(f"'{name}' must be an integer")
+
+
+def _list_param(request, name):
+    value = request.GET.get(name, '')
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_query(request):
+    """
+    Validates the query string. Returns (queryset, fields, limit).
+    """
+    fields = list(dict.fromkeys(_list_param(request, 'fields'))) or API_FIELDS
+    unknown = [f for f in fields if f not in API_FIELDS]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 50_000)
+    limit = _int_param(request, 'limit', DEFAULT_PAGE_SIZE)
+    if not 1 <= limit <= max_page_size:
+        raise ApiError(f"'limit' must be between 1 and {max_page_size}")
+
+    # Keyset pagination needs a non-null sort key
+    qs = OlympicStats.objects.filter(year__isnull=False)
+
+    countries = [c.upper() for c in _list_param(request, 'country')]
+    if countries:
+        qs = qs.filter(country_3_letter_code__in=countries)
+    season = request.GET.get('season')
+    if season:
+        qs = qs.filter(season=season)
+    year_min = _int_param(request, 'year_min')
+    if year_min is not None:
+        qs = qs.filter(year__gte=year_min)
+    year_max = _int_param(request, 'year_max')
+    if year_max is not None:
+        qs = qs.filter(year__lte=year_max)
+
+    after = request.GET.get('after')
+    if after:
+        try:
+            after_year, after_id = (int(part) for part in after.split(','))
+        except ValueError:
+            raise ApiError("'after' must be '<year>,<id>' (the 'next' value of the previous page)")
+        qs = qs.filter(Q(year__gt=after_year) | Q(year=after_year, id__gt=after_id))
+
+    return qs.order_by('year', 'id'), fields, limit
+
+
+def stream_page(qs, fields, limit):
+    """
+    Yields the JSON document chunk by chunk. ``year`` and ``id`` are always
+    fetched (cursor) but only emitted when projected.
+    """
+    columns = list(dict.fromkeys(list(fields) + ['year', 'id']))
+    year_pos, id_pos = columns.index('year'), columns.index('id')
+    n_fields = len(fields)
+
+    yield f'{{"fields":{_dumps(fields)},"rows":['
+
+    count, last, batch = 0, None, []
+    for row in qs.values_list(*columns)[:limit].iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        batch.append(row[:n_fields])
+        last = row
+        if len(batch) == ITERATOR_CHUNK_SIZE:
+            yield (',' if count else '') + _dumps(batch)[1:-1]
+            count += len(batch)
+            batch = []
+    if batch:
+        yield (',' if count else '') + _dumps(batch)[1:-1]
+        count += len(batch)
+
+    next_cursor = f"{last[year_pos]},{last[id_pos]}" if count == limit else None
+    yield f'],"count":{count},"next":{_dumps(next_cursor)}}}'
+
+
+@gzip_page
+@require_GET
+@versioned('dataset', cache=False)
+def olympic_stats(request):
+    try:
+        qs, fields, limit = parse_query(request)
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return StreamingHttpResponse(stream_page(qs, fields, limit), content_type='application/json')
+
+
+SCENARIO_FIELDS = [
+    'scenario', 'country', 'season', 'is_host', 'total_athletes',
+    'predicted_medals_xgb', 'predicted_medals_rf', 'predicted_medals'
+]
+
+
+@csrf_exempt
+@gzip_page
+@require_POST
+def predict_scenarios(request):
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': "Body must be JSON: {\"scenarios\": [...]}"}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': "Body must be a JSON object with a 'scenarios' list"}, status=400)
+
+    # The ML stack (pandas, models) loads on first use
+    from .ml_service import MLService
+    from .scenarios import ScenarioError
+    try:
+        df = MLService().predict_scenarios(payload.get('scenarios'))
+    except ScenarioError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    with span('api.serialize'):
+        rows = list(zip(*(df[field].tolist() for field in SCENARIO_FIELDS)))
+        body = _dumps({
+            'fields': SCENARIO_FIELDS,
+            'rows': rows,
+            'count': len(rows),
+            'models': {name: model['version'] for name, model in registry.status()['models'].items()},
+        })
+    return HttpResponse(body, content_type='application/json')
@@ -1,6 +1,33 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+
+def warm_up(force=False):
+    """
+    Optional warm-up, called by config/wsgi.py and config/asgi.py once the
+    application is built: imports the URLconf (views and their libraries),
+    loads the ML models (ML_PRELOAD_MODELS) and fills the prediction cache
+    (ML_WARMUP_ON_STARTUP). Without it, all of this happens on first use.
+
+    Runs in the calling thread, before the server accepts requests: importing
+    the heavy libraries from a background thread while requests import them
+    too can fail with an import-lock deadlock. With ``gunicorn --preload`` it
+    runs once in the master process and workers share the loaded pages.
+    """
+    preload = force or getattr(settings, 'ML_PRELOAD_MODELS', False)
+    predictions = getattr(settings, 'ML_WARMUP_ON_STARTUP', False)
+    if not (preload or predictions):
+        return
+
+    from django.urls import get_resolver
+    get_resolver().urlconf_module
+    from .ml_service import MLService
+    if predictions:
+        MLService().warm_up()
+    else:
+        MLService()
@@ -0,0 +1,58 @@
+"""
+Async versions of the dashboard views (served under ASGI, see config/asgi.py).
+
+Independent queries run concurrently, each in its own worker thread with
+its own database connection (``thread_sensitive=False``; Django's default
+``thread_sensitive=True`` would serialize them on a single thread). Figure
+building and serialization run in the same worker threads, so the event loop
+never blocks on CPU-bound work and one slow query no longer delays the others.
+"""
+import asyncio
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.shortcuts import render
+from .http_cache import versioned
+from .snapshot import load_dashboard_snapshot
+from .views import build_home_map_json, chart_source, explorer_context
+
+
+def in_worker_thread(fn):
+    """
+    Wraps a sync callable to run in the thread pool. Connections are per-thread
+    and pool threads are reused: like at the end of a request, the worker's
+    connection is kept for reuse (CONN_MAX_AGE) unless expired or broken.
+    """
+    def run(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+@versioned('dataset')
+async def home(request):
+    snapshot = await in_worker_thread(load_dashboard_snapshot)()
+    map_chart = await in_worker_thread(chart_source)('home_map', lambda: build_home_map_json(snapshot))
+
+    context = {
+        'total_games': snapshot.total_games,
+        'total_countries': snapshot.total_countries,
+        'total_athletes': snapshot.total_athletes,
+        'total_medals': snapshot.total_medals,
+        'map_chart': map_chart,
+    }
+    return render(request, 'core/home.html', context)
+
+
+@versioned('dataset')
+async def explorer(request, code=None):
+    # The country part (rollup index lookup) and the hosts chart are independent.
+    # With deferred charts the only query is the index build, once per dataset version.
+    context, hosts_bar = await asyncio.gather(
+        in_worker_thread(explorer_context)(code),
+        in_worker_thread(chart_source)('explorer_hosts_bar'),
+    )
+
+    context['hosts_bar'] = hosts_bar
+    return render(request, 'core/explorer.html', context)
@@ -0,0 +1,85 @@
+"""
+In-process cache for serialized Plotly figures.
+
+Entries are keyed on ``(chart name, dataset version)`` so a page keeps
+serving the same JSON until ``import_data.py`` bumps the version.
+Eviction is LRU, bounded by a total payload size (``CHART_CACHE_MAX_BYTES``).
+"""
+import threading
+from collections import OrderedDict
+from django.conf import settings
+
+
+class ChartCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, name, version, builder):
+        """
+        Returns the cached JSON for ``name`` at ``version``, calling ``builder()``
+        (which must return the serialized figure as a string) on a miss.
+        """
+        key = (name, version)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+
+        # Build outside the lock: figure building is the slow part
+        payload = builder()
+        self._store(key, payload)
+        return payload
+
+    def _store(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            # Bigger than the whole cache, never worth keeping
+            return
+
+        with self._lock:
+            # Drop older versions of the same chart, they can never be hit again
+            for stale_key in [k for k in self._entries if k[0] == key[0] and k != key]:
+                self.current_bytes -= len(self._entries.pop(stale_key))
+                self.evictions += 1
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+
+            self._entries[key] = payload
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+chart_cache = ChartCache(settings.CHART_CACHE_MAX_BYTES)
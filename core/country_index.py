@@ -0,0 +1,114 @@
+"""
+Per-country rollup index behind the explorer (``/explorer/<code>/``).
+
+One scan of ``olympic_stats`` (``analytics_backend().country_rows()``, rows
+ordered by country) is grouped in a single pass into every country's medal
+split and per-season timeline arrays. ``country_index()`` builds it once per
+dataset version, so a country page or chart is a dictionary lookup plus
+serialization whatever the country, and prefetching the neighbours of the
+country switcher costs no query.
+"""
+import threading
+from dataclasses import dataclass
+from itertools import groupby
+from .analytics import MEDAL_SPLIT, analytics_backend
+from .dataset_version import current_dataset_version
+from .perf import span
+
+# Country shown by /explorer/
+DEFAULT_COUNTRY = 'FRA'
+
+# Display names (the dataset has no country name column: other countries are shown by code)
+COUNTRY_LABELS = {'FRA': 'France'}
+
+
+def country_label(code):
+    return COUNTRY_LABELS.get(code, code)
+
+
+@dataclass(frozen=True)
+class CountryRollup:
+    code: str
+    # {'Or': ..., 'Argent': ..., 'Bronze': ...} totals (None without medal data), like medal_split()
+    medal_split: dict
+    # Timeline rows as parallel arrays, by year, like timeline()
+    years: tuple = ()
+    seasons: tuple = ()
+    medals: tuple = ()
+
+    @property
+    def label(self):
+        return country_label(self.code)
+
+
+@dataclass(frozen=True)
+class CountryIndex:
+    version: str = None
+    # code -> CountryRollup, codes in switcher (alphabetical) order
+    countries: dict = None
+
+    @property
+    def codes(self):
+        return tuple(self.countries)
+
+    def get(self, code):
+        return self.countries.get(code)
+
+    def neighbours(self, code):
+        """
+        (previous, next) codes of the switcher, wrapping around. None for an unknown code.
+        """
+        codes = self.codes
+        if code not in self.countries:
+            return None, None
+        position = codes.index(code)
+        return codes[position - 1], codes[(position + 1) % len(codes)]
+
+
+def _total(values):
+    values = [value for value in values if value is not None]
+    return int(sum(values)) if values else None
+
+
+def build_country_index(rows, version=None):
+    """
+    Groups ``COUNTRY_ROW_FIELDS`` rows (sorted by country, then year) into a CountryIndex.
+    """
+    countries = {}
+    for code, group in groupby(rows, key=lambda row: row[0]):
+        _, years, seasons, medals, *split = zip(*group)
+        countries[code] = CountryRollup(
+            code=code,
+            medal_split={label: _total(column) for (label, _), column in zip(MEDAL_SPLIT, split)},
+            years=years,
+            seasons=seasons,
+            medals=medals,
+        )
+    return CountryIndex(version=version, countries=dict(sorted(countries.items())))
+
+
+_index = CountryIndex(countries={})
+_index_lock = threading.Lock()
+
+
+def country_index():
+    """
+    The index at the current dataset version, rebuilt (one query) after ``import_data.py`` bumps it.
+    """
+    global _index
+    version = current_dataset_version()
+    if _index.version != version:
+        with _index_lock:
+            if _index.version != version:
+                with span('sql.country_index'):
+                    _index = build_country_index(analytics_backend().country_rows(), version)
+    return _index
+
+
+def clear_country_index():
+    """
+    Drops the index (rebuilt on next use), for cold benchmarks.
+    """
+    global _index
+    with _index_lock:
+        _index = CountryIndex(countries={})
@@ -0,0 +1,89 @@
+"""
+Dataset version token.
+
+``import_data.py`` writes a fresh token to a small stamp file after every
+successful load; the web process only has to ``stat()`` that file to know
+whether anything derived from the data (charts, predictions...) is stale.
+
+With ``ANALYTICS_BACKEND='duckdb'`` the dashboard reads ``ANALYTICS_SOURCE``
+directly and no import runs: the token then also carries a digest of the
+source files' (path, mtime, size), so editing or replacing them invalidates
+the same caches as an import.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_VERSION_FILE = Path(__file__).resolve().parent.parent / 'data' / '.dataset_version'
+
+# Token used before the first import has stamped the file
+INITIAL_VERSION = 'initial'
+
+_lock = threading.Lock()
+_cached = {'key': None, 'token': INITIAL_VERSION}
+
+
+def version_file():
+    from django.conf import settings
+    return Path(getattr(settings, 'DATASET_VERSION_FILE', DEFAULT_VERSION_FILE))
+
+
+def bump_dataset_version(path=None):
+    """
+    Writes a new version token. Called by the import scripts (no Django needed):
+    like settings.py, they honour the DATASET_VERSION_FILE environment variable.
+    """
+    path = path or os.environ.get('DATASET_VERSION_FILE', DEFAULT_VERSION_FILE)
+    token = f"{datetime.now(timezone.utc):%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+    path = Path(path)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(token)
+    # Atomic swap so readers never see a half-written token
+    os.replace(tmp_path, path)
+    return token
+
+
+def analytics_source_stamp():
+    """
+    Stamp of the DuckDB backend's source files (see core.analytics.source_stamp),
+    or None when the analytics are served from the imported table.
+    """
+    from django.conf import settings
+    if getattr(settings, 'ANALYTICS_BACKEND', 'postgres') != 'duckdb':
+        return None
+    from .analytics import source_stamp
+    return source_stamp(settings.ANALYTICS_SOURCE) or ()
+
+
+def _stamped_version():
+    """
+    The token written by the last import. The file is only re-read when it changes.
+    """
+    path = version_file()
+    try:
+        key = (str(path), os.stat(path).st_mtime_ns)
+    except OSError:
+        return INITIAL_VERSION
+
+    with _lock:
+        if _cached['key'] != key:
+            try:
+                _cached['token'] = path.read_text().strip() or INITIAL_VERSION
+            except OSError:
+                return INITIAL_VERSION
+            _cached['key'] = key
+        return _cached['token']
+
+
+def current_dataset_version():
+    """
+    Returns the current token: the import stamp, plus the DuckDB source stamp when it serves the data.
+    """
+    token = _stamped_version()
+    stamp = analytics_source_stamp()
+    if stamp is not None:
+        token = f"{token}-src{hashlib.sha256(repr(stamp).encode()).hexdigest()[:8]}"
+    return token
@@ -0,0 +1,205 @@
+"""
+Feature builder shared by the prediction code paths.
+
+Turns the OlympicStats baseline (one row per country scenario) into model
+inputs without any per-row Python loop:
+  - numeric features are mapped column by column (vectorized),
+  - the ``country_3_letter_code_*`` one-hot block is a SciPy CSR matrix
+    (one non-zero per row instead of ~200 dense columns).
+
+The one-hot block is only densified at the model boundary (``to_frame()``):
+XGBoost reads entries absent from a sparse matrix as *missing*, not as 0,
+which would change the predictions of a model trained on dense one-hot
+columns.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .analytics import analytics_backend
+
+ONEHOT_PREFIX = 'country_3_letter_code_'
+
+# Countries that no longer compete
+DEFUNCT_CODES = ['URS', 'GDR', 'FRG', 'EUN', 'ROC', 'TCH', 'YUG', 'SCG', 'BOH', 'ANZ', 'RU1', 'UAR', 'RUS', 'BLR']
+
+DEFAULT_AGE = 24.0
+
+BASELINE_FIELDS = (
+    'country_3_letter_code', 'year',
+    'total_athletes', 'total_medals',
+    'avg_age_athletes', 'cumulative_medals'
+)
+
+
+def _host_flag(df, host_code):
+    # Scenario frames carry their own flag (one host per scenario)
+    if 'is_host' in df:
+        return df['is_host']
+    return (df['country_3_letter_code'] == host_code).astype(int)
+
+
+def _winter_flag(df, host_code):
+    if 'season' in df:
+        return (df['season'] == 'Winter').astype(int)
+    return 0
+
+
+# Model feature name -> how to compute it from the baseline frame.
+# Values are either a callable(df, host_code) or a constant.
+XGB_COLUMNS = {
+    'total_athletes': lambda df, host: df['total_athletes'],
+    'avg_athlete_age': lambda df, host: df['avg_age_athletes'].fillna(DEFAULT_AGE),
+    'medalist_athletes': lambda df, host: df['total_medals'],
+    'avg_athlete_experience': 1.0,
+    'avg_games_participation': 1.0,
+    'gdp_per_capita': lambda df, host: df.get('gdp_per_capita', 0),
+    'population': lambda df, host: df.get('population', 0),
+    'is_host': _host_flag,
+    'season_Winter': _winter_flag,
+}
+
+RF_COLUMNS = {
+    'total_athletes': lambda df, host: df['total_athletes'],
+    'avg_age_athletes': lambda df, host: df['avg_age_athletes'].fillna(DEFAULT_AGE),
+    'cumulative_medals': lambda df, host: df['cumulative_medals'],
+    'is_host': _host_flag,
+    'season_Winter': _winter_flag,
+}
+
+
+def load_baseline(season):
+    """
+    Latest row of the given season per country (defunct ones included).
+    """
+    df = analytics_backend().season_rows(season, BASELINE_FIELDS)
+    if df.empty:
+        return df
+
+    # Keep latest summer entry per country. Same-Games duplicates: the later row has
+    # the higher cumulative_medals. Fully ordered, so the result does not depend
+    # on the row order of the source (table, CSV or partitioned Parquet).
+    return df.sort_values(
+        ['year', 'cumulative_medals', 'country_3_letter_code'], ascending=[False, False, True], kind='stable'
+    ).drop_duplicates('country_3_letter_code')
+
+
+def load_summer_baseline():
+    """
+    Latest Summer Games row per (still existing) country.
+    """
+    df = load_baseline('Summer')
+    if df.empty:
+        return df
+    return df[~df['country_3_letter_code'].isin(DEFUNCT_CODES)]
+
+
+class FeatureMatrix:
+    """
+    Model input split in a dense numeric block and a sparse one-hot block,
+    both laid out on the model's feature order.
+    """
+
+    def __init__(self, feature_names, numeric_cols, numeric, onehot):
+        self.feature_names = feature_names
+        self.numeric_cols = numeric_cols    # positions of the numeric block in feature_names
+        self.numeric = numeric              # (n_rows, len(numeric_cols)) float array
+        self.onehot = onehot                # (n_rows, n_features) CSR matrix
+
+    @property
+    def shape(self):
+        return (self.numeric.shape[0], len(self.feature_names))
+
+    def toarray(self, dtype=np.float64):
+        X = np.zeros(self.shape, dtype=dtype)
+        X[:, self.numeric_cols] = self.numeric
+        rows, cols = self.onehot.nonzero()
+        X[rows, cols] = self.onehot.data
+        return X
+
+    def to_frame(self, dtype=np.float64):
+        return pd.DataFrame(self.toarray(dtype), columns=self.feature_names)
+
+
+class FeatureBuilder:
+    """
+    Maps a baseline frame onto one model's feature list.
+    """
+
+    def __init__(self, feature_names, column_map):
+        self.feature_names = list(feature_names)
+        self.column_map = {name: column_map[name] for name in self.feature_names if name in column_map}
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        self.numeric_cols = np.array([index[name] for name in self.column_map], dtype=np.intp)
+        # Country code -> position of its one-hot column
+        self.onehot_index = pd.Series(
+            {name[len(ONEHOT_PREFIX):]: i for name, i in index.items() if name.startswith(ONEHOT_PREFIX)},
+            dtype=np.int64
+        )
+
+    def build(self, df, host_code='FRA'):
+        n_rows = len(df)
+
+        numeric = np.empty((n_rows, len(self.column_map)), dtype=np.float64)
+        for j, source in enumerate(self.column_map.values()):
+            value = source(df, host_code) if callable(source) else source
+            numeric[:, j] = np.asarray(value, dtype=np.float64) if np.ndim(value) else value
+
+        # One non-zero per row whose country has a column in the model
+        cols = df['country_3_letter_code'].map(self.onehot_index).to_numpy(dtype=np.float64)
+        known = ~np.isnan(cols)
+        onehot = sparse.csr_matrix(
+            (np.ones(known.sum()), (np.flatnonzero(known), cols[known].astype(np.intp))),
+            shape=(n_rows, len(self.feature_names))
+        )
+        return FeatureMatrix(self.feature_names, self.numeric_cols, numeric, onehot)
+
+
+def clip_round(predictions):
+    """
+    Rounds raw regressor outputs to medal counts (half to even, like round()), floored at 0.
+    """
+    return np.maximum(0, np.rint(np.asarray(predictions, dtype=np.float64))).astype(np.int64)
+
+
+def prediction_records(df, xgb_pred, rf_pred):
+    """
+    Result rows for the templates, sorted by consensus (descending), built column-wise.
+    """
+    consensus = np.rint((xgb_pred + rf_pred) / 2).astype(np.int64)
+    out = pd.DataFrame({
+        'country': df['country_3_letter_code'].to_numpy(),
+        'predicted_medals_xgb': xgb_pred,
+        'predicted_medals_rf': rf_pred,
+        'predicted_medals': consensus,
+        'baseline_athletes': df['total_athletes'].to_numpy().astype(np.int64),
+    })
+    order = np.argsort(-consensus, kind='stable')
+    return out.iloc[order].to_dict('records')
+
+
+def comparison_records(predictions, official):
+    """
+    Predictions (``prediction_records`` rows) joined with the official results
+    (``country``, ``real``) in one merge. Countries with neither a predicted
+    nor a real medal are left out; rows are sorted by prediction (descending).
+    """
+    if not predictions:
+        return []
+
+    preds = pd.DataFrame(predictions)
+    df = pd.DataFrame({
+        'country': preds['country'],
+        'predicted': preds['predicted_medals'],
+        'predicted_xgb': preds.get('predicted_medals_xgb', 0),
+        'predicted_rf': preds.get('predicted_medals_rf', 0),
+    })
+    df = df.merge(official[['country', 'real']], on='country', how='left')
+    df['real'] = df['real'].fillna(0).astype(np.int64)
+    df = df[(df['predicted'] != 0) | (df['real'] != 0)]
+
+    diff = df['real'] - df['predicted']
+    df['diff'] = diff
+    # under: predicted below the real count (good surprise), over: disappointment
+    df['status'] = np.select([diff == 0, diff > 0], ['perfect', 'under'], default='over')
+    df['abs_diff'] = diff.abs()
+    return df.sort_values('predicted', ascending=False, kind='stable').to_dict('records')
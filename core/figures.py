@@ -0,0 +1,223 @@
+"""
+Direct Plotly figure-spec builder.
+
+Builds the ``{"data": [...], "layout": {...}}`` dict that Plotly.js expects
+straight from NumPy / pandas columns and serializes it in one pass with
+orjson (native ndarray support). This skips the ``plotly.express`` →
+``fig.to_dict()`` (base64 ``bdata`` packing) → ``deep_decode_bdata``
+(recursive Python walk) → ``json.dumps(default=...)`` round-trip done by
+``views.safe_json_dump``.
+
+The specs mirror what ``plotly.express`` produced for the same charts
+(same trace attributes, hovertemplates, coloraxis and default template),
+so the rendered pages do not change.
+"""
+import json
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from .perf import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+# Plotly's default qualitative colour sequence ("Plotly")
+DEFAULT_COLORWAY = [
+    '#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A',
+    '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52',
+]
+
+VIRIDIS = [
+    [0.0, '#440154'], [0.1111111111111111, '#482878'], [0.2222222222222222, '#3e4989'],
+    [0.3333333333333333, '#31688e'], [0.4444444444444444, '#26828e'], [0.5555555555555556, '#1f9e89'],
+    [0.6666666666666666, '#35b779'], [0.7777777777777778, '#6ece58'], [0.8888888888888888, '#b5de2b'],
+    [1.0, '#fde725'],
+]
+
+# Default sequential scale of the "plotly" template
+PLASMA = [
+    [0.0, '#0d0887'], [0.1111111111111111, '#46039f'], [0.2222222222222222, '#7201a8'],
+    [0.3333333333333333, '#9c179e'], [0.4444444444444444, '#bd3786'], [0.5555555555555556, '#d8576b'],
+    [0.6666666666666666, '#ed7953'], [0.7777777777777778, '#fb9f3a'], [0.8888888888888888, '#fdca26'],
+    [1.0, '#f0f921'],
+]
+
+COLORSCALES = {'Viridis': VIRIDIS, 'Plasma': PLASMA}
+
+
+@lru_cache(maxsize=1)
+def default_template():
+    """
+    Plotly's default layout template, as plotly.express embeds it.
+    Resolved once per process (it is ~7 KB of static JSON).
+    """
+    import plotly.io as pio
+    return pio.templates[pio.templates.default].to_plotly_json()
+
+
+def column(values, dtype=None):
+    """
+    Normalizes a column for serialization: numeric data stays a contiguous
+    ndarray (encoded natively by orjson), text becomes a plain list.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy()
+    array = np.asarray(values, dtype=dtype)
+    if array.dtype.kind in 'biuf':
+        return np.ascontiguousarray(array)
+    return array.tolist()
+
+
+def _base_layout(title, layout):
+    base = {'template': default_template(), 'legend': {'tracegroupgap': 0}, 'title': {'text': title}}
+    base.update(layout or {})
+    return base
+
+
+def _cartesian_axes(x_label=None, y_label=None):
+    xaxis = {'anchor': 'y', 'domain': [0.0, 1.0]}
+    yaxis = {'anchor': 'x', 'domain': [0.0, 1.0]}
+    if x_label is not None:
+        xaxis['title'] = {'text': x_label}
+    if y_label is not None:
+        yaxis['title'] = {'text': y_label}
+    return {'xaxis': xaxis, 'yaxis': yaxis}
+
+
+def choropleth_figure(locations, z, title, z_label, location_label='locations',
+                      colorscale='Viridis', layout=None):
+    """
+    Equivalent of ``px.choropleth(locations=..., color=..., hover_name=locations)``
+    on ISO-3 codes, with a continuous colour axis.
+    """
+    layout = dict(layout or {})
+    locations = column(locations)
+    colorbar = {'title': {'text': z_label}}
+    colorbar.update(layout.pop('coloraxis_colorbar', {}))
+    geo = {'domain': {'x': [0.0, 1.0], 'y': [0.0, 1.0]}, 'center': {}}
+    geo.update(layout.pop('geo', {}))
+    fig_layout = {
+        'geo': geo,
+        'coloraxis': {'colorbar': colorbar, 'colorscale': COLORSCALES[colorscale], 'autocolorscale': False},
+    }
+    fig_layout.update(layout)
+    trace = {
+        'coloraxis': 'coloraxis',
+        'geo': 'geo',
+        'hovertemplate': f"<b>%{{hovertext}}</b><br><br>{location_label}=%{{location}}<br>{z_label}=%{{z}}<extra></extra>",
+        'hovertext': locations,
+        'locationmode': 'ISO-3',
+        'locations': locations,
+        'name': '',
+        'z': column(z),
+        'type': 'choropleth',
+    }
+    return {'data': [trace], 'layout': _base_layout(title, fig_layout)}
+
+
+def pie_figure(labels, values, title, colors=None, layout=None):
+    """Equivalent of ``px.pie(names=..., values=...)``."""
+    trace = {
+        'domain': {'x': [0.0, 1.0], 'y': [0.0, 1.0]},
+        'hovertemplate': 'label=%{label}<br>value=%{value}<extra></extra>',
+        'labels': column(labels),
+        'legendgroup': '',
+        'name': '',
+        'showlegend': True,
+        'values': column(values),
+        'type': 'pie',
+    }
+    fig_layout = {'piecolorway': colors} if colors else {}
+    fig_layout.update(layout or {})
+    return {'data': [trace], 'layout': _base_layout(title, fig_layout)}
+
+
+def line_figure(x, y, group, title, x_label, y_label, group_label, markers=True, layout=None):
+    """
+    Equivalent of ``px.line(x=..., y=..., color=group)``: one trace per group,
+    in order of first appearance, coloured with the default colorway.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    group = pd.Series(group)
+    codes, uniques = pd.factorize(group)
+
+    traces = []
+    for i, name in enumerate(uniques):
+        mask = codes == i
+        traces.append({
+            'hovertemplate': f"{group_label}={name}<br>{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>",
+            'legendgroup': name,
+            'line': {'color': DEFAULT_COLORWAY[i % len(DEFAULT_COLORWAY)], 'dash': 'solid'},
+            'marker': {'symbol': 'circle'},
+            'mode': 'lines+markers' if markers else 'lines',
+            'name': name,
+            'orientation': 'v',
+            'showlegend': True,
+            'x': column(x[mask]),
+            'xaxis': 'x',
+            'y': column(y[mask]),
+            'yaxis': 'y',
+            'type': 'scatter',
+        })
+
+    fig_layout = _cartesian_axes(x_label, y_label)
+    fig_layout['legend'] = {'title': {'text': group_label}, 'tracegroupgap': 0}
+    fig_layout.update(layout or {})
+    return {'data': traces, 'layout': _base_layout(title, fig_layout)}
+
+
+def bar_figure(x, y, title, x_label, y_label, colorscale='Plasma', layout=None):
+    """
+    Equivalent of ``px.bar(x=..., y=..., color=y)``: bars coloured by their
+    own value on a continuous colour axis.
+    """
+    layout = dict(layout or {})
+    y = column(y)
+    trace = {
+        'hovertemplate': f"{x_label}=%{{x}}<br>{y_label}=%{{marker.color}}<extra></extra>",
+        'legendgroup': '',
+        'marker': {'color': y, 'coloraxis': 'coloraxis', 'pattern': {'shape': ''}},
+        'name': '',
+        'orientation': 'v',
+        'showlegend': False,
+        'textposition': 'auto',
+        'x': column(x),
+        'xaxis': 'x',
+        'y': y,
+        'yaxis': 'y',
+        'type': 'bar',
+    }
+    colorbar = {'title': {'text': y_label}}
+    colorbar.update(layout.pop('coloraxis_colorbar', {}))
+    fig_layout = _cartesian_axes(x_label, y_label)
+    fig_layout['coloraxis'] = {'colorbar': colorbar, 'colorscale': COLORSCALES[colorscale]}
+    fig_layout['barmode'] = 'relative'
+    fig_layout.update(layout)
+    return {'data': [trace], 'layout': _base_layout(title, fig_layout)}
+
+
+def empty_figure(title, message, layout=None):
+    """Placeholder chart with a centred annotation (no data available)."""
+    fig_layout = _cartesian_axes()
+    fig_layout['annotations'] = [{'text': message, 'showarrow': False, 'font': {'size': 16}}]
+    fig_layout.update(layout or {})
+    return {'data': [], 'layout': _base_layout(title, fig_layout)}
+
+
+def _default(obj):
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Type {type(obj)} is not serializable")
+
+
+def dumps_figure(spec):
+    """
+    Serializes a figure spec to a JSON string in a single encoder pass.
+    """
+    with span('figure.serialize'):
+        if orjson is not None:
+            return orjson.dumps(spec, option=orjson.OPT_SERIALIZE_NUMPY, default=_default).decode('utf-8')
+        return json.dumps(spec, default=_default)
@@ -0,0 +1,265 @@
+"""
+Conditional GET and a server-side response cache, keyed on version tokens.
+
+``@versioned('dataset', 'models', ...)`` declares what a view's output
+depends on:
+  - ``'dataset'``: the dataset version token (bumped by ``import_data.py``, and
+    following the source files with the DuckDB backend),
+  - ``'models'``: the model registry fingerprint (artifact path, mtime, size),
+  - ``'reference'``: the official Paris 2024 results file.
+The code and templates of the running release are always part of it.
+
+From those tokens (file ``stat()`` calls, no query) the decorator derives a
+strong ``ETag`` and a ``Last-Modified`` date, and answers ``If-None-Match`` /
+``If-Modified-Since`` with a 304 before the view runs - same semantics as
+``django.views.decorators.http.condition``, for sync and async views. Other
+GETs are served from ``response_cache`` when the same URL was rendered at
+the same ETag; the view (queries, pandas, models) only runs on a miss.
+
+``response_cache`` is an LRU bounded by ``RESPONSE_CACHE_MAX_BYTES`` with
+per-view counters (hits, misses, 304s, render time), summarized with the
+chart cache on ``/debug/cache/``.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from inspect import iscoroutinefunction
+from pathlib import Path
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+INPUTS = ('dataset', 'models', 'reference')
+
+# Response headers kept with a cached response
+CACHED_HEADERS = ('Content-Type', 'Cache-Control', 'Content-Language')
+
+_release = {}
+_release_lock = threading.Lock()
+
+
+def release_token():
+    """
+    (hash, mtime) of the code and templates being served, computed once per process.
+    """
+    with _release_lock:
+        if not _release:
+            base = Path(settings.BASE_DIR)
+            files = sorted([*(base / 'core').glob('*.py'), *(base / 'templates').rglob('*.html')])
+            digest = hashlib.sha256()
+            mtime = 0
+            for path in files:
+                digest.update(path.read_bytes())
+                mtime = max(mtime, path.stat().st_mtime)
+            _release.update(token=digest.hexdigest(), mtime=mtime)
+        return _release['token'], _release['mtime']
+
+
+def input_state(name):
+    """
+    (token, mtime or None) of one input.
+    """
+    if name == 'dataset':
+        from .dataset_version import analytics_source_stamp, current_dataset_version, version_file
+        # The token includes the DuckDB source stamp when DuckDB serves the data
+        token = current_dataset_version()
+        mtimes = [mtime_ns / 1e9 for _, mtime_ns, _ in analytics_source_stamp() or ()]
+        try:
+            mtimes.append(os.stat(version_file()).st_mtime)
+        except OSError:
+            pass
+        return token, max(mtimes, default=None)
+    if name == 'models':
+        from .model_registry import registry
+        fingerprint = registry.fingerprint()
+        mtimes = [entry[2] / 1e9 for entry in fingerprint if len(entry) > 2]
+        return repr(fingerprint), max(mtimes, default=None)
+    if name == 'reference':
+        try:
+            stat = os.stat(settings.PARIS_2024_RESULTS_FILE)
+        except OSError:
+            return None, None
+        return f"{stat.st_mtime_ns}-{stat.st_size}", stat.st_mtime
+    raise ValueError(f"Unknown view input '{name}'")
+
+
+def validators(view_key, inputs):
+    """
+    (quoted strong ETag, Last-Modified timestamp) of a view at the current versions.
+    """
+    token, last_modified = release_token()
+    # DEFERRED_CHARTS changes the HTML (chart URLs vs inlined figures)
+    digest = hashlib.sha256(f"{view_key}|{token}|{settings.DEFERRED_CHARTS}".encode())
+    for name in inputs:
+        value, mtime = input_state(name)
+        digest.update(f"|{name}={value}".encode())
+        if mtime is not None:
+            last_modified = max(last_modified, mtime)
+    return quote_etag(digest.hexdigest()[:32]), int(last_modified)
+
+
+class ResponseCache:
+    """
+    Rendered responses keyed on (view, URL) and valid for one ETag.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # (view, url) -> (etag, status, content, headers)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.evictions = 0
+        self._views = {}
+
+    def _counters(self, view_key):
+        return self._views.setdefault(view_key, {'hits': 0, 'misses': 0, 'not_modified': 0, 'render_ms': 0.0})
+
+    def count(self, view_key, counter, ms=0.0):
+        with self._lock:
+            counters = self._counters(view_key)
+            counters[counter] += 1
+            counters['render_ms'] += ms
+
+    def get(self, view_key, url, etag):
+        with self._lock:
+            entry = self._entries.get((view_key, url))
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end((view_key, url))
+            self._counters(view_key)['hits'] += 1
+        _, status, content, headers = entry
+        response = HttpResponse(content, status=status)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    def store(self, view_key, url, etag, response):
+        content = response.content
+        if len(content) > self.max_bytes:
+            return
+        headers = {header: response[header] for header in CACHED_HEADERS if response.has_header(header)}
+        with self._lock:
+            previous = self._entries.pop((view_key, url), None)
+            if previous is not None:
+                self.current_bytes -= len(previous[2])
+            self._entries[(view_key, url)] = (etag, response.status_code, content, headers)
+            self.current_bytes += len(content)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted[2])
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._views.clear()
+            self.current_bytes = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            views = {}
+            for view_key, counters in sorted(self._views.items()):
+                served = counters['hits'] + counters['misses']
+                views[view_key] = {
+                    **{k: v for k, v in counters.items() if k != 'render_ms'},
+                    'hit_ratio': counters['hits'] / served if served else 0.0,
+                    'avg_render_ms': round(counters['render_ms'] / counters['misses'], 2) if counters['misses'] else None,
+                }
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'views': views,
+            }
+
+
+response_cache = ResponseCache(getattr(settings, 'RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+
+def versioned(*inputs, cache=True):
+    """
+    View decorator: ETag / Last-Modified from ``inputs``, early 304s, and (with
+    ``cache``) the server-side response cache for GET requests.
+    """
+    unknown = set(inputs) - set(INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown view inputs: {', '.join(sorted(unknown))}")
+
+    def decorator(view):
+        view_key = f"{view.__module__}.{view.__qualname__}"
+
+        def before(request):
+            """
+            (response or None, etag, last_modified): a 304 / cached response, or what to tag the new one with.
+            """
+            if request.method not in ('GET', 'HEAD'):
+                return None, None, None
+            etag, last_modified = validators(view_key, inputs)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                response_cache.count(view_key, 'not_modified')
+            elif cache and request.method == 'GET':
+                response = response_cache.get(view_key, request.get_full_path(), etag)
+            if response is not None:
+                tag(response, etag, last_modified)
+            return response, etag, last_modified
+
+        def after(request, response, etag, last_modified, ms):
+            if etag is None:
+                return response
+            response_cache.count(view_key, 'misses', ms)
+            cacheable = (cache and request.method == 'GET' and response.status_code == 200
+                         and not response.streaming and not response.cookies)
+            if cacheable:
+                response_cache.store(view_key, request.get_full_path(), etag, response)
+            return tag(response, etag, last_modified)
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                response, etag, last_modified = before(request)
+                if response is not None:
+                    return response
+                start = time.perf_counter()
+                response = await view(request, *args, **kwargs)
+                return after(request, response, etag, last_modified, (time.perf_counter() - start) * 1000)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                response, etag, last_modified = before(request)
+                if response is not None:
+                    return response
+                start = time.perf_counter()
+                response = view(request, *args, **kwargs)
+                return after(request, response, etag, last_modified, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def tag(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+        # Browsers revalidate (cheap 304) instead of guessing a freshness lifetime
+        response.headers.setdefault('Cache-Control', 'no-cache')
+    return response
+
+
+def cache_status(request):
+    """
+    Response cache and chart cache counters. Local use only (DEBUG or INTERNAL_IPS).
+    """
+    local = settings.DEBUG or request.META.get('REMOTE_ADDR') in getattr(settings, 'INTERNAL_IPS', [])
+    if not local:
+        raise Http404("Cache status is only served locally")
+    from .chart_cache import chart_cache
+    if request.GET.get('reset'):
+        response_cache.clear()
+    return JsonResponse({'responses': response_cache.stats(), 'charts': chart_cache.stats()},
+                        json_dumps_params={'indent': 2})
@@ -0,0 +1,92 @@
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+# Pages whose ORM queries are checked (charts inlined so the chart queries run too)
+DEFAULT_URLS = [
+    '/',
+    '/explorer/',
+    '/predictions/',
+    '/predictions/comparison/',
+    '/api/olympic-stats/?country=FRA&limit=1000',
+    '/api/olympic-stats/?season=Summer&year_min=2000&limit=1000',
+]
+
+# Read in full by design (one row per country): a sequential scan is the right plan
+FULL_READ_TABLES = {'olympic_dashboard_summary'}
+
+
+def seq_scans(plan):
+    """Relations read by a Seq Scan node anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan['Relation Name']
+    for child in plan.get('Plans', []):
+        yield from seq_scans(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs every page through the test client, EXPLAINs the SELECT queries it issues and fails "
+        "if one of them does a sequential scan on a table larger than QUERY_PLAN_SEQ_SCAN_MIN_ROWS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-rows', type=int, default=settings.QUERY_PLAN_SEQ_SCAN_MIN_ROWS,
+                            help="Table size (rows) above which a sequential scan fails the check")
+        parser.add_argument('--url', action='append', dest='urls',
+                            help="Page to check (repeatable, default: the dashboard pages and the data API)")
+
+    def table_rows(self, cursor, table):
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+        # Never analyzed: count it
+        cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+        return cursor.fetchone()[0]
+
+    def capture(self, url):
+        from core.chart_cache import chart_cache
+        from core.http_cache import response_cache
+        from core.ml_service import MLService
+
+        # Cold caches, so the page runs all its queries
+        chart_cache.clear()
+        response_cache.clear()
+        MLService().invalidate_cache()
+        with CaptureQueriesContext(connection) as captured:
+            response = Client().get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        if response.status_code != 200:
+            raise CommandError(f"{url}: HTTP {response.status_code}")
+        return [q['sql'] for q in captured.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError(f"EXPLAIN checks need PostgreSQL (configured backend: {connection.vendor})")
+
+        min_rows = options['min_rows']
+        failures = []
+        with override_settings(DEFERRED_CHARTS=False), connection.cursor() as cursor:
+            for url in options['urls'] or DEFAULT_URLS:
+                queries = self.capture(url)
+                self.stdout.write(f"{url}: {len(queries)} queries")
+                for sql in queries:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                    plan = cursor.fetchone()[0]
+                    plan = json.loads(plan) if isinstance(plan, str) else plan
+                    for table in set(seq_scans(plan[0]['Plan'])) - FULL_READ_TABLES:
+                        rows = self.table_rows(cursor, table)
+                        if rows > min_rows:
+                            failures.append((url, table, rows, sql))
+                            self.stdout.write(self.style.ERROR(f"  Seq Scan on {table} ({rows:,} rows): {sql[:200]}"))
+                        else:
+                            self.stdout.write(f"  Seq Scan on {table} ({rows:,} rows, below {min_rows:,}): ok")
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries fall back to a sequential scan above {min_rows:,} rows")
+        self.stdout.write(self.style.SUCCESS("No sequential scan above the threshold."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from core.model_registry import LEGACY_FILES, RF_FALLBACK_FEATURES, estimator_features, legacy_dir, save_artifact
+
+
+class Command(BaseCommand):
+    help = "Exports the legacy pickled models of ml_models/ to the model registry (native XGBoost UBJ + manifest)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-version', help="Version name (default: UTC timestamp)")
+
+    def handle(self, *args, **options):
+        import pickle
+        import joblib
+
+        for name, filename in LEGACY_FILES.items():
+            path = legacy_dir() / filename
+            if not path.exists():
+                self.stdout.write(self.style.WARNING(f"{name}: {path} not found, skipped"))
+                continue
+
+            if name == 'xgb':
+                with open(path, 'rb') as f:
+                    estimator = pickle.load(f)
+                features = estimator_features(estimator)
+            else:
+                estimator = joblib.load(path)
+                features = estimator_features(estimator) or RF_FALLBACK_FEATURES
+
+            target = save_artifact(name, estimator, features=features, source=filename, version=options['model_version'])
+            self.stdout.write(self.style.SUCCESS(f"{name}: exported to {target}"))
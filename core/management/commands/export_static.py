@@ -0,0 +1,239 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction
+from pathlib import Path
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+MANIFEST_NAME = 'manifest.json'
+
+# Exported pages: route -> (file stem, templates, inputs, charts fetched by the page).
+# The explorer's charts, and one /explorer/<code>/ page per country, come from the country index.
+PAGES = {
+    '/': ('index', ['core/home.html'], ('dataset',), ['home_map']),
+    '/explorer/': ('explorer', ['core/explorer.html'], ('dataset',), None),
+    '/myths/': ('myths', ['core/myths.html'], (), []),
+    '/predictions/': ('predictions', ['core/predictions.html'], ('dataset', 'models'), []),
+    '/predictions/comparison/': ('comparison', ['core/comparison.html'], ('dataset', 'models', 'reference'), []),
+}
+# Templates every page extends / includes
+SHARED_TEMPLATES = ['base.html', 'core/_chart.html']
+
+
+def export_dir():
+    return Path(getattr(settings, 'STATIC_EXPORT_DIR', Path(settings.BASE_DIR) / 'static_export'))
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_file(path, data):
+    """
+    Writes ``path`` and its gzip sibling (for gzip_static-style serving), atomically.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for target, payload in ((path, data), (path.with_name(path.name + '.gz'), gzip.compress(data, 9, mtime=0))):
+        tmp = target.with_name(target.name + '.tmp')
+        tmp.write_bytes(payload)
+        os.replace(tmp, target)
+    return len(data), path.with_name(path.name + '.gz').stat().st_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-renders the dashboard pages and chart payloads to a directory (content-hashed file names, "
+        "gzip copies, manifest.json), in parallel. Only outputs whose inputs changed are rebuilt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Export directory (default: settings.STATIC_EXPORT_DIR)")
+        parser.add_argument('--base-url', default='/', help="URL prefix the export is served under (default: /)")
+        parser.add_argument('--jobs', type=int, default=4, help="Worker threads (default: 4)")
+        parser.add_argument('--force', action='store_true', help="Rebuild everything")
+        parser.add_argument('--keep-stale', action='store_true', help="Keep files of previous exports")
+
+    # -- inputs -----------------------------------------------------------
+
+    def input_values(self):
+        """
+        Everything an exported file can depend on, resolved once per run.
+        """
+        from core.dataset_version import current_dataset_version
+        from core.model_registry import registry
+
+        code = hashlib.sha256()
+        for path in sorted((Path(settings.BASE_DIR) / 'core').glob('*.py')):
+            code.update(path.read_bytes())
+        reference = Path(settings.PARIS_2024_RESULTS_FILE)
+        return {
+            'dataset': current_dataset_version(),
+            'models': list(registry.fingerprint()),
+            'reference': [reference.stat().st_mtime_ns, reference.stat().st_size] if reference.exists() else None,
+            'code': code.hexdigest(),
+        }
+
+    @staticmethod
+    def template_hash(names):
+        digest = hashlib.sha256()
+        for name in names:
+            digest.update(Path(get_template(name).origin.name).read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def inputs_key(inputs):
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    # -- rendering (worker threads) ----------------------------------------
+
+    def render_chart(self, name, version):
+        from core.views import get_chart_json
+        try:
+            return get_chart_json(name, version).encode()
+        finally:
+            connections.close_all()
+
+    def render_page(self, route, chart_urls, version):
+        try:
+            request = RequestFactory().get(route)
+            request.resolver_match = match = resolve(route)
+            view = match.func
+            if iscoroutinefunction(view):
+                view = async_to_sync(view)
+            response = view(request, *match.args, **match.kwargs)
+            if response.status_code != 200:
+                raise CommandError(f"{route}: HTTP {response.status_code}")
+            html = response.content.decode()
+        finally:
+            connections.close_all()
+
+        # Deferred charts: point the page at the exported payloads
+        for name, url in chart_urls.items():
+            html = html.replace(f"{reverse('chart_json', args=[name])}?v={version}", url)
+        return html.encode()
+
+    # -- export -----------------------------------------------------------
+
+    def export(self, out, entries, render, previous, force):
+        """
+        Renders (in parallel) the ``entries`` {key: (file stem, suffix, inputs)} whose
+        inputs changed since ``previous``. Returns the new manifest entries.
+        """
+        todo, results = {}, {}
+        for key, (stem, suffix, inputs) in entries.items():
+            inputs_key = self.inputs_key(inputs)
+            old = previous.get(key)
+            if not force and old and old['inputs'] == inputs_key and (out / old['file']).exists():
+                results[key] = dict(old, status='unchanged')
+            else:
+                todo[key] = (stem, suffix, inputs_key)
+
+        def build(key):
+            stem, suffix, inputs_key = todo[key]
+            start = time.perf_counter()
+            data = render(key)
+            file = f"{stem}.{content_hash(data)}{suffix}"
+            size, gz_size = write_file(out / file, data)
+            return key, {'file': file, 'inputs': inputs_key, 'size': size, 'gzip_size': gz_size,
+                         'status': 'built', 'ms': round((time.perf_counter() - start) * 1000, 1)}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results.update(pool.map(build, todo))
+        return results
+
+    @staticmethod
+    def pages(codes):
+        """
+        PAGES plus one explorer page per country, with the charts each page references.
+        """
+        from core.views import explorer_chart_names
+        pages = {route: (stem, templates, needs, charts if charts is not None else explorer_chart_names())
+                 for route, (stem, templates, needs, charts) in PAGES.items()}
+        for code in codes:
+            pages[reverse('explorer_country', args=[code])] = (
+                f"explorer-{code.lower()}", ['core/explorer.html'], ('dataset',), explorer_chart_names(code)
+            )
+        return pages
+
+    def handle(self, *args, **options):
+        out = Path(options['output']) if options['output'] else export_dir()
+        base_url = options['base_url'].rstrip('/') + '/'
+        self.jobs = max(1, options['jobs'])
+        manifest_path = out / MANIFEST_NAME
+        previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        if previous.get('base_url') != base_url:
+            options['force'] = True
+
+        from core.country_index import DEFAULT_COUNTRY, country_index
+        from core.views import CHART_BUILDERS, country_chart_names
+        start = time.perf_counter()
+        values = self.input_values()
+        version = values['dataset']
+        codes = country_index().codes
+
+        # 1. Chart payloads (per-country ones from the index: no query each)
+        countries = dict.fromkeys([DEFAULT_COUNTRY, *codes])
+        chart_names = [*CHART_BUILDERS, *(name for code in countries for name in country_chart_names(code))]
+        chart_entries = {
+            name: (f"charts/{name}", '.json', {'dataset': version, 'code': values['code']})
+            for name in chart_names
+        }
+        charts = self.export(out, chart_entries, lambda name: self.render_chart(name, version),
+                             previous.get('charts', {}), options['force'])
+        chart_urls = {name: base_url + entry['file'] for name, entry in charts.items()}
+
+        # 2. Pages, with the chart URLs they reference as inputs
+        page_entries, page_chart_urls = {}, {}
+        for route, (stem, templates, needs, page_charts) in self.pages(codes).items():
+            page_chart_urls[route] = {name: chart_urls[name] for name in page_charts}
+            inputs = {
+                'templates': self.template_hash(SHARED_TEMPLATES + templates),
+                'code': values['code'],
+                'charts': list(page_chart_urls[route].values()),
+                **{need: values[need] for need in needs},
+            }
+            page_entries[route] = (f"pages/{stem}", '.html', inputs)
+        pages = self.export(out, page_entries, lambda route: self.render_page(route, page_chart_urls[route], version),
+                            previous.get('pages', {}), options['force'])
+
+        # Stable entry points (<route>/index.html) for plain static servers
+        for route, entry in pages.items():
+            alias = out / route.strip('/') / 'index.html'
+            if entry['status'] == 'built' or not alias.exists():
+                write_file(alias, (out / entry['file']).read_bytes())
+
+        manifest = {
+            'base_url': base_url,
+            'dataset_version': version,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'charts': {name: {k: v for k, v in entry.items() if k not in ('status', 'ms')} for name, entry in charts.items()},
+            'pages': {route: {k: v for k, v in entry.items() if k not in ('status', 'ms')} for route, entry in pages.items()},
+        }
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+
+        if not options['keep_stale']:
+            current = {entry['file'] for group in ('charts', 'pages') for entry in manifest[group].values()}
+            for folder in ('charts', 'pages'):
+                for path in (out / folder).glob('*'):
+                    if path.name.removesuffix('.gz') not in {Path(f).name for f in current}:
+                        path.unlink()
+
+        for group, entries in (('charts', charts), ('pages', pages)):
+            for key, entry in entries.items():
+                detail = f"{entry['size'] / 1024:7.1f} KiB ({entry['gzip_size'] / 1024:6.1f} KiB gz)"
+                timing = f"{entry['ms']:8.1f} ms" if entry['status'] == 'built' else ' ' * 11
+                self.stdout.write(f"  {entry['status']:<9} {timing}  {detail}  {key} -> {entry['file']}")
+        built = sum(e['status'] == 'built' for e in (*charts.values(), *pages.values()))
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported to {out}: {built} built, {len(charts) + len(pages) - built} unchanged "
+            f"in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,48 @@
+import json
+from django.core.management.base import BaseCommand
+from core.model_registry import MANIFEST_NAME, ModelRegistry, registry_dir, write_tree_arrays
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds NumPy tree arrays (trees.npz, see core/tree_ensemble.py) to the model registry versions "
+        "that lack them, after checking they reproduce the library predictions exactly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all-versions', action='store_true', help="Every version, not only the latest ones")
+        parser.add_argument('--force', action='store_true', help="Rewrite existing tree arrays")
+
+    def handle(self, *args, **options):
+        import joblib
+        import xgboost as xgb
+
+        for name in ModelRegistry.MODEL_NAMES:
+            model_dir = registry_dir() / name
+            versions = sorted(p for p in model_dir.iterdir() if (p / MANIFEST_NAME).exists()) if model_dir.is_dir() else []
+            if not versions:
+                self.stdout.write(self.style.WARNING(f"{name}: no registry version (run export_models first), skipped"))
+                continue
+
+            for target in (versions if options['all_versions'] else versions[-1:]):
+                manifest = json.loads((target / MANIFEST_NAME).read_text())
+                if manifest.get('tree_arrays') and not options['force']:
+                    self.stdout.write(f"{name} {target.name}: tree arrays already present")
+                    continue
+
+                if manifest['format'].startswith('xgboost'):
+                    model = xgb.Booster()
+                    model.load_model(str(target / manifest['artifact']))
+                else:
+                    model = joblib.load(target / manifest['artifact'])
+
+                tree_arrays = write_tree_arrays(model, target)
+                if tree_arrays is None:
+                    self.stdout.write(self.style.WARNING(f"{name} {target.name}: no tree arrays exported"))
+                    continue
+                manifest['tree_arrays'] = tree_arrays
+                (target / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name} {target.name}: {tree_arrays['n_trees']} trees, {tree_arrays['n_nodes']} nodes, "
+                    f"depth {tree_arrays['depth']} -> {target / tree_arrays['artifact']}"
+                ))
@@ -0,0 +1,100 @@
+import time
+from pathlib import Path
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core import training
+from core.analytics import analytics_backend
+from core.dataset_version import current_dataset_version
+from core.model_registry import new_version, save_artifact
+from core.scenarios import SEASONS
+
+
+def cache_dir():
+    return Path(getattr(settings, 'TRAINING_CACHE_DIR', Path(settings.BASE_DIR) / 'ml_models' / '.cache'))
+
+
+class Command(BaseCommand):
+    help = (
+        "Trains the XGBoost and Random Forest models: hyperparameter search scored by leave-one-Games-out "
+        "backtests across a process pool, then a final fit of the best configuration on all rows, saved to "
+        "the model registry (new version) with its backtest metrics."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--models', default=','.join(training.MODEL_FEATURES),
+                            help="Comma-separated models to train (default: xgb,rf)")
+        parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: one per core)")
+        parser.add_argument('--backtest-games', type=int, default=12,
+                            help="Held-out Games, most recent first (0: every Games)")
+        parser.add_argument('--model-version', help="Version name (default: UTC timestamp)")
+        parser.add_argument('--no-cache', action='store_true', help="Rebuild the training features")
+        parser.add_argument('--dry-run', action='store_true', help="Search and report, write no artifact")
+
+    def training_frame(self, rebuild=False):
+        """
+        Training rows built from OlympicStats once per dataset version (cached as Parquet).
+        """
+        backend = analytics_backend()
+        path = cache_dir() / f"training_{backend.name}_{current_dataset_version()}.parquet"
+        if path.exists() and not rebuild:
+            self.stdout.write(f"Training features: {path} (cached)")
+            return pd.read_parquet(path)
+
+        start = time.perf_counter()
+        rows = pd.concat(
+            [backend.season_rows(season, training.FRAME_FIELDS) for season in SEASONS], ignore_index=True
+        )
+        frame = training.build_training_frame(rows)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame.to_parquet(path, index=False)
+        self.stdout.write(f"Training features: {len(frame)} rows built in {time.perf_counter() - start:.2f}s -> {path}")
+        return frame
+
+    def handle(self, *args, **options):
+        models = [m.strip() for m in options['models'].split(',') if m.strip()]
+        unknown = set(models) - set(training.MODEL_FEATURES)
+        if not models or unknown:
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown)) or '(none)'} "
+                               f"(available: {', '.join(training.MODEL_FEATURES)})")
+
+        frame = self.training_frame(rebuild=options['no_cache'])
+        if frame.empty:
+            raise CommandError("No training rows (is olympic_stats loaded?)")
+        games = training.backtest_games(frame, options['backtest_games'] or None)
+        matrices = {name: training.design_matrix(name, frame) for name in models}
+
+        n_fits = sum(len(training.param_grid(name)) for name in models) * len(games)
+        self.stdout.write(f"Search: {n_fits} fits ({', '.join(models)}) on {len(games)} held-out Games "
+                          f"({games[0]} .. {games[-1]})")
+        start = time.perf_counter()
+        report = training.run_search(frame, matrices, games, jobs=options['jobs'], progress=self.stdout.write)
+        search_seconds = time.perf_counter() - start
+
+        version = options['model_version'] or new_version()
+        for name in models:
+            best = report[name]['best']
+            self.stdout.write(
+                f"{name}: best {best['params']} - backtest MAE {best['mae']:.2f}, RMSE {best['rmse']:.2f} "
+                f"(previous Games as prediction: MAE {report[name]['naive']['mae']:.2f})"
+            )
+            if options['dry_run']:
+                continue
+
+            features, X = matrices[name]
+            start = time.perf_counter()
+            estimator = training.fit(name, best['params'], X, frame['target'].to_numpy(), features)
+            metrics = {
+                'backtest': {key: best[key] for key in ('mae', 'rmse', 'n_rows', 'mae_per_games')},
+                'naive_backtest': report[name]['naive'],
+                'params': best['params'],
+                'search': [{key: r[key] for key in ('params', 'mae', 'rmse')} for r in report[name]['results']],
+                'backtest_games': games,
+                'training_rows': len(frame),
+                'dataset_version': current_dataset_version(),
+                'search_seconds': round(search_seconds, 2),
+                'fit_seconds': round(time.perf_counter() - start, 2),
+            }
+            target = save_artifact(name, estimator, features=features, metrics=metrics,
+                                   source='train_models', version=version)
+            self.stdout.write(self.style.SUCCESS(f"{name}: saved {target}"))
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_total', models.BooleanField()),
+                ('country_3_letter_code', models.CharField(blank=True, max_length=10, null=True)),
+                ('total_games', models.IntegerField()),
+                ('total_countries', models.IntegerField()),
+                ('total_athletes', models.BigIntegerField()),
+                ('total_medals', models.BigIntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'olympic_dashboard_summary',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OlympicStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(blank=True, null=True)),
+                ('slug_game', models.CharField(blank=True, max_length=255, null=True)),
+                ('country_3_letter_code', models.CharField(blank=True, max_length=10, null=True)),
+                ('bronze_medals', models.IntegerField(blank=True, null=True)),
+                ('gold_medals', models.IntegerField(blank=True, null=True)),
+                ('silver_medals', models.IntegerField(blank=True, null=True)),
+                ('total_medals', models.IntegerField(blank=True, null=True)),
+                ('total_athletes', models.IntegerField(blank=True, null=True)),
+                ('avg_age_athletes', models.FloatField(blank=True, null=True)),
+                ('medals_in_current_year', models.IntegerField(blank=True, null=True)),
+                ('city', models.CharField(blank=True, max_length=255, null=True)),
+                ('season', models.CharField(blank=True, max_length=50, null=True)),
+                ('game_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('cumulative_medals', models.FloatField(blank=True, null=True)),
+                ('is_host', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'olympic_stats',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+"""
+Composite, covering and partial indexes matched to the app's queries
+(same definitions as db.sql, which import_data.py uses for fresh loads).
+
+olympic_stats is created by db.sql / import_data.py, not by Django: the
+indexes are only added on PostgreSQL and when the table already exists.
+Built CONCURRENTLY (hence non-atomic) so the site keeps serving during the
+migration.
+"""
+from django.db import migrations
+
+TABLE = 'olympic_stats'
+
+NEW_INDEXES = {
+    # France charts: WHERE country_3_letter_code = ... [ORDER BY year]
+    'idx_stats_country_year': (
+        "ON olympic_stats(country_3_letter_code, year) "
+        "INCLUDE (season, total_medals, gold_medals, silver_medals, bronze_medals)"
+    ),
+    # ML baseline: Summer Games rows per country
+    'idx_stats_summer_country_year': (
+        "ON olympic_stats(country_3_letter_code, year) "
+        "INCLUDE (total_athletes, total_medals, avg_age_athletes, cumulative_medals) "
+        "WHERE season = 'Summer'"
+    ),
+    # Host countries chart: WHERE is_host = 1 GROUP BY country_3_letter_code
+    'idx_stats_hosts': "ON olympic_stats(country_3_letter_code) INCLUDE (year) WHERE is_host = 1",
+    # Data API keyset pagination: ORDER BY year, id
+    'idx_stats_year_id': "ON olympic_stats(year, id)",
+}
+
+# Leading columns of the new composite indexes: now redundant
+REPLACED_INDEXES = {
+    'idx_stats_country': "ON olympic_stats(country_3_letter_code)",
+    'idx_stats_year': "ON olympic_stats(year)",
+}
+
+
+def _applicable(schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        return TABLE in connection.introspection.table_names(cursor)
+
+
+def _swap(schema_editor, create, drop):
+    if not _applicable(schema_editor):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name, definition in create.items():
+            cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+        for name in drop:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        cursor.execute(f"ANALYZE {TABLE}")
+
+
+def add_indexes(apps, schema_editor):
+    _swap(schema_editor, NEW_INDEXES, REPLACED_INDEXES)
+
+
+def remove_indexes(apps, schema_editor):
+    _swap(schema_editor, REPLACED_INDEXES, NEW_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
@@ -0,0 +1,75 @@
+"""
+Rebuilds the olympic_dashboard_summary materialized view so its game and
+country counts count NULL as one value, like the ORM's
+``values().distinct().count()`` the home page KPIs used before the view
+(same definition as db.sql).
+
+The view is created by db.sql / import_data.py, not by Django: it is only
+rebuilt on PostgreSQL and when it already exists.
+"""
+from django.db import migrations
+
+VIEW = 'olympic_dashboard_summary'
+
+VIEW_SQL = """
+CREATE MATERIALIZED VIEW olympic_dashboard_summary AS
+SELECT
+    ROW_NUMBER() OVER () AS id,
+    GROUPING(country_3_letter_code) = 1 AS is_total,
+    country_3_letter_code,
+    {total_games} AS total_games,
+    {total_countries} AS total_countries,
+    COALESCE(SUM(total_athletes), 0) AS total_athletes,
+    COALESCE(SUM(total_medals), 0) AS total_medals,
+    now() AS refreshed_at
+FROM olympic_stats
+GROUP BY GROUPING SETS ((country_3_letter_code), ())
+"""
+
+NULL_COUNTING = {
+    'total_games': "COUNT(DISTINCT slug_game) + (COUNT(*) > COUNT(slug_game))::int",
+    'total_countries': "COUNT(DISTINCT country_3_letter_code) + (COUNT(*) > COUNT(country_3_letter_code))::int",
+}
+
+NULL_SKIPPING = {
+    'total_games': "COUNT(DISTINCT slug_game)",
+    'total_countries': "COUNT(DISTINCT country_3_letter_code)",
+}
+
+
+def _applicable(schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        return VIEW in connection.introspection.table_names(cursor, include_views=True)
+
+
+def _rebuild(schema_editor, counts):
+    if not _applicable(schema_editor):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP MATERIALIZED VIEW {VIEW}")
+        cursor.execute(VIEW_SQL.format(**counts))
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_dashboard_summary_total ON {VIEW}(is_total, total_medals DESC)"
+        )
+
+
+def count_nulls(apps, schema_editor):
+    _rebuild(schema_editor, NULL_COUNTING)
+
+
+def skip_nulls(apps, schema_editor):
+    _rebuild(schema_editor, NULL_SKIPPING)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_olympic_stats_workload_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_nulls, skip_nulls),
+    ]
@@ -1,166 +1,163 @@
-import pickle
-import joblib
-import pandas as pd
 import numpy as np
-import xgboost as xgb
+import pandas as pd
 from django.conf import settings
-from .models import OlympicStats
-import os
+from .dataset_version import current_dataset_version
+from .features import (
+    FeatureBuilder, RF_COLUMNS, XGB_COLUMNS, clip_round, load_baseline, load_summer_baseline, prediction_records
+)
+from .model_registry import registry
+from .perf import span
+from .scenarios import SEASONS, parse_scenarios, scenario_frame
+import threading
 
 class MLService:
+    """
+    Prediction service (process-wide singleton). Models come from the model
+    registry (core/model_registry.py), which loads them once per process.
+    """
     _instance = None
+    _instance_lock = threading.Lock()
     xgb_model = None
     rf_model = None
     xgb_features = None
     rf_features = None
 
+    # Prediction cache: results only change with the data or the model files
+    _cache_lock = threading.Lock()
+    _cache_key = None
+    _cached_results = None
+
+    # Per-season baselines of the scenario API, keyed on the dataset version
+    _baseline_lock = threading.Lock()
+    _baseline_version = None
+    _baselines = None
+
     def __new__(cls):
+        # Double-checked locking: concurrent first requests share one instance / one model load
         if cls._instance is None:
-            cls._instance = super(MLService, cls).__new__(cls)
-            cls._instance.load_models()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(MLService, cls).__new__(cls)
+                    instance.load_models()
+                    cls._instance = instance
         return cls._instance
 
-    def load_models(self):
-        # 1. Load Legacy XGBoost Model (Pickle)
-        try:
-            xgb_path = os.path.join(settings.BASE_DIR, 'ml_models', 'best_xgb_model.pkl')
-            print(f"Loading XGBoost from: {xgb_path}")
-            with open(xgb_path, 'rb') as f:
-                self.xgb_model = pickle.load(f)
-            
-            # Extract features for XGB
-            if hasattr(self.xgb_model, 'feature_names_in_'):
-                self.xgb_features = list(self.xgb_model.feature_names_in_)
-            elif hasattr(self.xgb_model, 'get_booster'):
-                self.xgb_features = self.xgb_model.get_booster().feature_names
-            else:
-                self.xgb_features = []
-            print(f"XGBoost loaded. Features: {len(self.xgb_features)}")
-            
-        except Exception as e:
-            print(f"Failed to load XGBoost: {e}")
-            self.xgb_model = None
+    @staticmethod
+    def model_fingerprint():
+        """
+        Identity (path, mtime, size) of the model artifacts currently served.
+        """
+        return registry.fingerprint()
+
+    def load_models(self, force=False):
+        registry.load_all(force=force)
+        xgb_loaded, rf_loaded = registry.get('xgb'), registry.get('rf')
+        self.xgb_model, self.xgb_features = (xgb_loaded, xgb_loaded.features) if xgb_loaded else (None, None)
+        self.rf_model, self.rf_features = (rf_loaded, rf_loaded.features) if rf_loaded else (None, None)
+
+    def predict_paris_2024(self):
+        """
+        Cached predictions, keyed on the dataset version and the model files.
+        Concurrent misses are computed once: other threads wait for the result.
+        """
+        cache_key = (current_dataset_version(), self.model_fingerprint())
+
+        with self._cache_lock:
+            if self._cache_key != cache_key:
+                self._cached_results = self._compute_paris_2024(*self._serving_models())
+                self._cache_key = cache_key
+            return list(self._cached_results)
+
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self._cache_key = None
+            self._cached_results = None
+        with self._baseline_lock:
+            self._baseline_version = None
+            self._baselines = None
 
-        # 2. Load New Random Forest Model (Joblib)
+    def _reload_models_if_changed(self):
+        if registry.reload_if_changed():
+            self.load_models()
+
+    def _serving_models(self):
+        """
+        (xgb, rf) LoadedModel snapshot for one call, reloaded first if the artifacts
+        changed. Each model carries its own feature list, so a reload by another
+        thread (which swaps the attributes above) can't pair a model with the
+        features of another version.
+        """
+        self._reload_models_if_changed()
+        return registry.get('xgb'), registry.get('rf')
+
+    def baselines(self):
+        """
+        {season: latest row per country}, reloaded when the dataset version changes.
+        """
+        version = current_dataset_version()
+        with self._baseline_lock:
+            if self._baseline_version != version:
+                self._baselines = {season: load_baseline(season) for season in SEASONS}
+                self._baseline_version = version
+            return self._baselines
+
+    def predict_scenarios(self, scenarios):
+        """
+        Scores a batch of what-if scenarios (see core/scenarios.py) with one
+        vectorized call per model. Returns a DataFrame with one row per
+        (scenario, country), in request order. Raises ScenarioError on invalid input.
+        """
+        with span('ml.scenarios'):
+            parsed, overrides = parse_scenarios(scenarios, getattr(settings, 'SCENARIO_MAX_SCENARIOS', 10_000))
+            df = scenario_frame(parsed, overrides, self.baselines(), getattr(settings, 'SCENARIO_MAX_ROWS', 100_000))
+
+        xgb_model, rf_model = self._serving_models()
+        xgb_pred = self._predict_model(xgb_model, XGB_COLUMNS, df, 'XGB', host_code=None)
+        rf_pred = self._predict_model(rf_model, RF_COLUMNS, df, 'RF', host_code=None)
+        return pd.DataFrame({
+            'scenario': df['scenario'].to_numpy(),
+            'country': df['country_3_letter_code'].to_numpy(),
+            'season': df['season'].to_numpy(),
+            'is_host': df['is_host'].to_numpy(),
+            'total_athletes': df['total_athletes'].to_numpy(),
+            'predicted_medals_xgb': xgb_pred,
+            'predicted_medals_rf': rf_pred,
+            'predicted_medals': np.rint((xgb_pred + rf_pred) / 2).astype(np.int64),
+        })
+
+    def warm_up(self):
+        """
+        Loads the models and fills the prediction cache (see core.apps.warm_up()).
+        """
         try:
-            rf_path = os.path.join(settings.BASE_DIR, 'ml_models', 'medals_prediction_model.pkl')
-            print(f"Loading Random Forest from: {rf_path}")
-            # Ensure we use joblib as identified
-            self.rf_model = joblib.load(rf_path)
-            
-            # Extract features for RF
-            if hasattr(self.rf_model, 'feature_names_in_'):
-                self.rf_features = list(self.rf_model.feature_names_in_)
-            else:
-                # Fallback based on inspection
-                self.rf_features = ['total_athletes', 'avg_age_athletes', 'cumulative_medals', 'is_host', 'season_Winter']
-            print(f"Random Forest loaded. Features: {len(self.rf_features)}")
-            
+            results = self.predict_paris_2024()
+            print(f"ML warm-up done ({len(results)} predictions cached).")
         except Exception as e:
-            print(f"Failed to load Random Forest: {e}")
-            self.rf_model = None
+            print(f"ML warm-up failed: {e}")
 
-    def predict_paris_2024(self):
+    def _compute_paris_2024(self, xgb_model, rf_model):
         # 1. Get Baseline Data (Latest Summer Games - Tokyo 2020)
-        qs = OlympicStats.objects.filter(season='Summer').values(
-            'country_3_letter_code', 'year',
-            'total_athletes', 'total_medals',
-            'avg_age_athletes', 'cumulative_medals'
-        )
-        
-        df = pd.DataFrame(list(qs))
+        with span('ml.baseline'):
+            df = load_summer_baseline()
         if df.empty:
             return []
 
-        # Keep latest summer entry per country
-        df = df.sort_values('year', ascending=False).drop_duplicates('country_3_letter_code')
-        
-        # Filter Defunct
-        defunct_codes = ['URS', 'GDR', 'FRG', 'EUN', 'ROC', 'TCH', 'YUG', 'SCG', 'BOH', 'ANZ', 'RU1', 'UAR', 'RUS', 'BLR']
-        df = df[~df['country_3_letter_code'].isin(defunct_codes)]
+        # 2. Batch inference, one vectorized feature matrix per model
+        xgb_pred = self._predict_model(xgb_model, XGB_COLUMNS, df, 'XGB')
+        rf_pred = self._predict_model(rf_model, RF_COLUMNS, df, 'RF')
 
-        results = []
-        if df.empty:
-            return results
-
-        # --- PREPARE BATCH INPUT ---
-        # We need a DataFrame that matches the model's expected features exactly.
-        
-        # 1. XGBoost Preparation
-        if self.xgb_model and self.xgb_features:
-            # Init with 0 using index from df
-            X_xgb = pd.DataFrame(0, index=df.index, columns=self.xgb_features)
-            
-            # Map features available in DB
-            # Note: feature names must match exactly what XGB expects
-            if 'total_athletes' in self.xgb_features: X_xgb['total_athletes'] = df['total_athletes']
-            if 'avg_athlete_age' in self.xgb_features: X_xgb['avg_athlete_age'] = df['avg_age_athletes'].fillna(24.0)
-            if 'medalist_athletes' in self.xgb_features: X_xgb['medalist_athletes'] = df['total_medals']
-            if 'avg_athlete_experience' in self.xgb_features: X_xgb['avg_athlete_experience'] = 1.0
-            if 'avg_games_participation' in self.xgb_features: X_xgb['avg_games_participation'] = 1.0
-            if 'gdp_per_capita' in self.xgb_features: X_xgb['gdp_per_capita'] = df.get('gdp_per_capita', 0)
-            if 'population' in self.xgb_features: X_xgb['population'] = df.get('population', 0)
-            
-            # Host logic (France)
-            if 'is_host' in self.xgb_features:
-                X_xgb['is_host'] = (df['country_3_letter_code'] == 'FRA').astype(int)
-            
-            # OHE (Country Codes)
-            # This is tricky in batch if we don't know all columns, but self.xgb_features has them.
-            # We iterate only over countries present to set their specific OHE column
-            for idx, row in df.iterrows():
-                code = row['country_3_letter_code']
-                ohe_col = f"country_3_letter_code_{code}"
-                if ohe_col in self.xgb_features:
-                    X_xgb.at[idx, ohe_col] = 1
-
-            # Predict Batch
-            try:
-                # Ensure column order matches
-                X_xgb = X_xgb[self.xgb_features]
-                xgb_preds = self.xgb_model.predict(X_xgb)
-                df['xgb_pred'] = [max(0, int(round(x))) for x in xgb_preds]
-            except Exception as e:
-                print(f"XGB Batch Error: {e}")
-                df['xgb_pred'] = 0
-        else:
-            df['xgb_pred'] = 0
-
-        # 2. Random Forest Preparation
-        if self.rf_model and self.rf_features:
-            X_rf = pd.DataFrame(0, index=df.index, columns=self.rf_features)
-            
-            if 'total_athletes' in self.rf_features: X_rf['total_athletes'] = df['total_athletes']
-            if 'avg_age_athletes' in self.rf_features: X_rf['avg_age_athletes'] = df['avg_age_athletes'].fillna(24.0)
-            if 'cumulative_medals' in self.rf_features: X_rf['cumulative_medals'] = df['cumulative_medals']
-            if 'is_host' in self.rf_features: X_rf['is_host'] = (df['country_3_letter_code'] == 'FRA').astype(int)
-            if 'season_Winter' in self.rf_features: X_rf['season_Winter'] = 0
-            
-            try:
-                X_rf = X_rf[self.rf_features]
-                rf_preds = self.rf_model.predict(X_rf)
-                df['rf_pred'] = [max(0, int(round(x))) for x in rf_preds]
-            except Exception as e:
-                print(f"RF Batch Error: {e}")
-                df['rf_pred'] = 0
-        else:
-             df['rf_pred'] = 0
-
-        # 3. Aggregate Results
-        for _, row in df.iterrows():
-             xgb_p = row.get('xgb_pred', 0)
-             rf_p = row.get('rf_pred', 0)
-             consensus = int(round((xgb_p + rf_p) / 2))
-             
-             results.append({
-                'country': row['country_3_letter_code'],
-                'predicted_medals_xgb': xgb_p, 
-                'predicted_medals_rf': rf_p,
-                'predicted_medals': consensus,
-                'baseline_athletes': int(row['total_athletes'])
-             })
-
-        # Sort by Consensus
-        results.sort(key=lambda x: x['predicted_medals'], reverse=True)
-        
-        return results
+        # 3. Aggregate Results (sorted by consensus)
+        with span('ml.records'):
+            return prediction_records(df, xgb_pred, rf_pred)
+
+    def _predict_model(self, model, column_map, df, label, host_code='FRA'):
+        if not (model and model.features):
+            return np.zeros(len(df), dtype=np.int64)
+        try:
+            with span(f'ml.features_{label.lower()}'):
+                X = FeatureBuilder(model.features, column_map).build(df, host_code)
+            with span(f'ml.inference_{label.lower()}'):
+                return clip_round(model.predict(X))
+        except Exception as e:
+            print(f"{label} Batch Error: {e}")
+            return np.zeros(len(df), dtype=np.int64)
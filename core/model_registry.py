@@ -0,0 +1,390 @@
+"""
+Model registry: versioned artifacts + feature manifest, loaded once per process.
+
+Layout (``settings.MODEL_REGISTRY_DIR``, default ``ml_models/registry``)::
+
+    <model name>/<version>/manifest.json   # format, features, sha256, metrics...
+    <model name>/<version>/model.ubj       # XGBoost native format (or model.json)
+    <model name>/<version>/model.joblib    # scikit-learn estimators
+    <model name>/<version>/trees.npz       # same trees as NumPy node arrays (core/tree_ensemble.py)
+
+The latest version (lexicographic order, versions are timestamps) is used
+unless ``settings.MODEL_VERSIONS`` pins one. When a model has no registry
+artifact yet, the legacy pickle in ``ml_models/`` is loaded instead.
+XGBoost boosters are scored with ``Booster.inplace_predict`` (no DMatrix copy).
+
+When a version has tree arrays (written by ``save_artifact`` or
+``manage.py export_tree_arrays`` after an exact-match check) and
+``settings.ML_TREE_INFERENCE`` is on, only ``trees.npz`` is loaded and scored
+with NumPy: xgboost, scikit-learn and joblib are not imported at serve time.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from django.conf import settings
+
+MANIFEST_NAME = 'manifest.json'
+TREE_ARRAYS_NAME = 'trees.npz'
+
+# Legacy artifacts (pre-registry), see MLService
+LEGACY_FILES = {
+    'xgb': 'best_xgb_model.pkl',
+    'rf': 'medals_prediction_model.pkl',
+}
+
+# Feature list used when a legacy Random Forest doesn't carry its own
+RF_FALLBACK_FEATURES = ['total_athletes', 'avg_age_athletes', 'cumulative_medals', 'is_host', 'season_Winter']
+
+
+def registry_dir():
+    return Path(getattr(settings, 'MODEL_REGISTRY_DIR', Path(settings.BASE_DIR) / 'ml_models' / 'registry'))
+
+
+def legacy_dir():
+    return Path(settings.BASE_DIR) / 'ml_models'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def new_version():
+    return datetime.now(timezone.utc).strftime('v%Y%m%d%H%M%S')
+
+
+def estimator_features(estimator):
+    if hasattr(estimator, 'feature_names_in_'):
+        return [str(f) for f in estimator.feature_names_in_]
+    if hasattr(estimator, 'get_booster'):
+        return list(estimator.get_booster().feature_names or [])
+    if hasattr(estimator, 'feature_names'):
+        return list(estimator.feature_names or [])
+    return []
+
+
+def tree_inference_enabled():
+    return getattr(settings, 'ML_TREE_INFERENCE', True)
+
+
+def reference_predict(model, features):
+    """
+    Library prediction on a dense matrix, as LoadedModel.predict() serves it.
+    """
+    if hasattr(model, 'inplace_predict'):
+        best_iteration = model.attr('best_iteration')
+        iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+        return model.inplace_predict(features, iteration_range=iteration_range, validate_features=False)
+    import pandas as pd
+    names = getattr(model, 'feature_names_in_', None)
+    return model.predict(pd.DataFrame(features, columns=names) if names is not None else features)
+
+
+def write_tree_arrays(model, target, n_rows=2000, seed=0):
+    """
+    Flattens ``model`` (XGBoost Booster or scikit-learn forest) to
+    ``target/trees.npz`` if its predictions match the library's exactly on
+    random inputs (with missing values). Returns the manifest entry, or None
+    when the model can't be flattened.
+    """
+    from .tree_ensemble import TreeEnsemble
+
+    try:
+        if hasattr(model, 'inplace_predict'):
+            best_iteration = model.attr('best_iteration')
+            iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else None
+            ensemble = TreeEnsemble.from_xgboost(model, iteration_range)
+        elif hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+            ensemble = TreeEnsemble.from_sklearn_forest(model)
+        else:
+            return None
+    except ValueError as e:
+        print(f"Tree arrays not exported: {e}")
+        return None
+
+    # Count-like and 0/1 one-hot columns, plus missing values
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    X = rng.random((n_rows, ensemble.n_features)) * rng.choice([1.0, 30.0, 1000.0], (n_rows, ensemble.n_features))
+    X[:, ::3] = np.round(X[:, ::3])
+    inputs = [X.astype(np.float32)]
+    X = inputs[0].copy()
+    X[rng.random(X.shape) < 0.05] = np.nan
+    inputs.append(X)
+    for X in inputs:
+        try:
+            expected = reference_predict(model, X)
+        except ValueError:
+            continue  # estimator without missing-value support
+        if not np.array_equal(ensemble.predict(X), expected):
+            print("Tree arrays not exported: predictions differ from the library's")
+            return None
+
+    path = Path(target) / TREE_ARRAYS_NAME
+    ensemble.save(path)
+    return {
+        'artifact': path.name,
+        'sha256': file_sha256(path),
+        'n_trees': ensemble.n_trees,
+        'n_nodes': ensemble.n_nodes,
+        'depth': ensemble.depth,
+    }
+
+
+def save_artifact(name, estimator, features=None, metrics=None, source=None, version=None, root=None):
+    """
+    Writes a new registry version for ``estimator`` and returns its directory.
+    XGBoost models are stored in the native UBJSON format, anything else with joblib.
+    """
+    version = version or new_version()
+    target = Path(root or registry_dir()) / name / version
+    target.mkdir(parents=True, exist_ok=True)
+
+    booster = estimator.get_booster() if hasattr(estimator, 'get_booster') else None
+    if booster is None and type(estimator).__module__.startswith('xgboost'):
+        booster = estimator
+
+    if booster is not None:
+        artifact, fmt = target / 'model.ubj', 'xgboost-ubj'
+        booster.save_model(str(artifact))
+    else:
+        import joblib
+        artifact, fmt = target / 'model.joblib', 'joblib'
+        joblib.dump(estimator, artifact)
+    tree_arrays = write_tree_arrays(booster if booster is not None else estimator, target)
+
+    manifest = {
+        'name': name,
+        'version': version,
+        'format': fmt,
+        'artifact': artifact.name,
+        'sha256': file_sha256(artifact),
+        'features': list(features if features is not None else estimator_features(estimator)),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'source': source,
+        'metrics': metrics or {},
+    }
+    if tree_arrays:
+        manifest['tree_arrays'] = tree_arrays
+    (target / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return target
+
+
+class LoadedModel:
+    """
+    A model ready for inference, with its load statistics.
+    """
+
+    def __init__(self, name, version, fmt, features, model, artifact, load_seconds):
+        self.name = name
+        self.version = version
+        self.format = fmt
+        self.features = features
+        self.model = model
+        self.artifact = artifact
+        self.load_seconds = load_seconds
+        self.artifact_bytes = os.path.getsize(artifact)
+
+    def predict(self, features):
+        """
+        ``features`` is a core.features.FeatureMatrix laid out on ``self.features``.
+        """
+        if self.format == 'tree-arrays':
+            return self.model.predict(features.toarray())
+        if self.format.startswith('xgboost'):
+            # Same float32 conversion and NaN-as-missing semantics as XGBRegressor.predict()
+            best_iteration = self.model.attr('best_iteration')
+            iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+            return self.model.inplace_predict(
+                features.toarray(), iteration_range=iteration_range, validate_features=False
+            )
+        return self.model.predict(features.to_frame())
+
+    def status(self):
+        return {
+            'version': self.version,
+            'format': self.format,
+            'artifact': str(self.artifact),
+            'n_features': len(self.features),
+            'load_seconds': round(self.load_seconds, 4),
+            # File on disk; memory is only known for tree arrays (the library models don't expose it)
+            'artifact_bytes': self.artifact_bytes,
+            'memory_bytes': self.model.nbytes if self.format == 'tree-arrays' else None,
+        }
+
+
+class ModelRegistry:
+    """
+    Resolves and loads the current artifact of every model, once, under a lock.
+    """
+
+    MODEL_NAMES = ('xgb', 'rf')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models = {}
+        self._errors = {}
+        self._loaded_fingerprint = None
+        self._versions = {}   # name -> (cache key, manifest path, manifest mtime, (manifest, version dir))
+        self.ready = False
+
+    # -- resolution -------------------------------------------------------
+
+    def _registry_version(self, name):
+        """
+        (manifest, version dir) of the registry version to serve, or None.
+
+        Called on every request (through fingerprint()): the directory listing and
+        the manifest are only read again when the model directory (a version added
+        or removed) or the chosen manifest changes, otherwise this costs two stat() calls.
+        """
+        pinned = getattr(settings, 'MODEL_VERSIONS', {}).get(name)
+        model_dir = registry_dir() / name
+        try:
+            key = (str(model_dir), os.stat(model_dir).st_mtime_ns, pinned)
+        except OSError:
+            return None
+        cached = self._versions.get(name)
+        if cached is not None and cached[0] == key:
+            _, manifest_path, manifest_mtime, result = cached
+            if manifest_path is None or _mtime_ns(manifest_path) == manifest_mtime:
+                return result
+
+        versions = sorted(p.name for p in model_dir.iterdir() if (p / MANIFEST_NAME).exists())
+        version = pinned if pinned in versions else (versions[-1] if versions else None)
+        manifest_path = manifest_mtime = result = None
+        if version:
+            manifest_path = model_dir / version / MANIFEST_NAME
+            manifest_mtime = _mtime_ns(manifest_path)
+            result = (json.loads(manifest_path.read_text()), model_dir / version)
+        self._versions[name] = (key, manifest_path, manifest_mtime, result)
+        return result
+
+    def resolve(self, name):
+        """
+        Returns (manifest dict or None, artifact path or None) for the version to serve.
+        """
+        found = self._registry_version(name)
+        if found:
+            manifest, version_dir = found
+            if tree_inference_enabled() and manifest.get('tree_arrays'):
+                return manifest, version_dir / manifest['tree_arrays']['artifact']
+            return manifest, version_dir / manifest['artifact']
+
+        legacy = legacy_dir() / LEGACY_FILES[name]
+        return None, (legacy if legacy.exists() else None)
+
+    def fingerprint(self):
+        """
+        (artifact, mtime, size) of what would be served now; changes when a model is
+        exported, retrained or its file replaced.
+        """
+        fingerprint = []
+        for name in self.MODEL_NAMES:
+            _, artifact = self.resolve(name)
+            if artifact is None:
+                fingerprint.append((name, None))
+            else:
+                stat = os.stat(artifact)
+                fingerprint.append((name, str(artifact), stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    # -- loading ----------------------------------------------------------
+
+    def _load_one(self, name):
+        manifest, artifact = self.resolve(name)
+        if artifact is None:
+            raise FileNotFoundError(f"No artifact for model '{name}'")
+
+        if manifest is not None and artifact.name == (manifest.get('tree_arrays') or {}).get('artifact'):
+            from .tree_ensemble import TreeEnsemble
+            start = time.perf_counter()
+            model = TreeEnsemble.load(artifact)
+            return LoadedModel(name, manifest['version'], 'tree-arrays', manifest['features'], model, artifact,
+                               time.perf_counter() - start)
+
+        # Library imports are not part of the measured load time
+        import joblib
+        import pickle
+        import xgboost as xgb
+
+        start = time.perf_counter()
+        if manifest is None:
+            # Legacy pickle / joblib file
+            if name == 'xgb':
+                with open(artifact, 'rb') as f:
+                    estimator = pickle.load(f)
+                features = estimator_features(estimator)
+                model, fmt = estimator.get_booster(), 'xgboost-legacy-pickle'
+            else:
+                model = joblib.load(artifact)
+                features = estimator_features(model) or RF_FALLBACK_FEATURES
+                fmt = 'joblib-legacy'
+            version = 'legacy'
+        else:
+            features, fmt, version = manifest['features'], manifest['format'], manifest['version']
+            if fmt.startswith('xgboost'):
+                model = xgb.Booster()
+                model.load_model(str(artifact))
+            else:
+                model = joblib.load(artifact)
+
+        return LoadedModel(name, version, fmt, features, model, artifact, time.perf_counter() - start)
+
+    def load_all(self, force=False):
+        """
+        Loads every model once. Safe to call from many threads: the first caller
+        loads, the others wait and reuse the result.
+        """
+        if self.ready and not force:
+            return
+        with self._lock:
+            if self.ready and not force:
+                return
+            models, errors = {}, {}
+            for name in self.MODEL_NAMES:
+                try:
+                    models[name] = self._load_one(name)
+                    print(f"Model '{name}' loaded ({models[name].format} {models[name].version}, "
+                          f"{len(models[name].features)} features, {models[name].load_seconds:.3f}s)")
+                except Exception as e:
+                    errors[name] = str(e)
+                    print(f"Failed to load model '{name}': {e}")
+            self._models, self._errors = models, errors
+            self._loaded_fingerprint = self.fingerprint()
+            self.ready = True
+
+    def reload_if_changed(self):
+        if self.fingerprint() != self._loaded_fingerprint:
+            print("Model artifacts changed, reloading...")
+            self.load_all(force=True)
+            return True
+        return False
+
+    def get(self, name):
+        self.load_all()
+        return self._models.get(name)
+
+    def status(self):
+        return {
+            'ready': self.ready,
+            'models': {name: model.status() for name, model in self._models.items()},
+            'errors': dict(self._errors),
+        }
+
+
+registry = ModelRegistry()
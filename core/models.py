@@ -23,3 +23,24 @@ class OlympicStats(models.Model):
 
     def __str__(self):
         return f"{self.slug_game} - {self.country_3_letter_code}"
+
+
+class DashboardSummary(models.Model):
+    """
+    Read-only mapping of the ``olympic_dashboard_summary`` materialized view (see db.sql).
+    The row flagged ``is_total`` carries the home KPIs, the other rows the per-country rollup.
+    """
+    is_total = models.BooleanField()
+    country_3_letter_code = models.CharField(max_length=10, blank=True, null=True)
+    total_games = models.IntegerField()
+    total_countries = models.IntegerField()
+    total_athletes = models.BigIntegerField()
+    total_medals = models.BigIntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'olympic_dashboard_summary'
+
+    def __str__(self):
+        return "TOTAL" if self.is_total else f"{self.country_3_letter_code}"
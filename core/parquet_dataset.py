@@ -0,0 +1,203 @@
+"""
+Columnar copy of data/dataset.csv: Parquet files partitioned by season and year.
+
+    data/parquet/season=Summer/year=2008/part-0.parquet
+
+Columns are stored with compact types (dictionary-encoded strings for the
+country / city / Games columns, 8 and 16-bit integers for the counts) and the
+CSV's ``country_3_letter_code_x`` is stored as ``country_3_letter_code``, like
+the olympic_stats table. Rows keep their CSV order inside each partition, so
+import_data.py computes the same row keys from either file.
+
+``read_dataset()`` / ``iter_batches()`` only read what is asked for:
+    - columns not listed are never decoded (column pruning),
+    - ``season`` / ``years`` skip whole directories (partition pruning),
+    - ``countries`` is pushed down to the row group statistics,
+    - files are memory-mapped instead of copied into read buffers.
+
+No Django import here: import_data.py uses this module without settings.
+"""
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_CSV = os.path.join(BASE_DIR, 'data', 'dataset.csv')
+PARQUET_DIR = os.path.join(BASE_DIR, 'data', 'parquet')
+
+CSV_RENAMES = {'country_3_letter_code_x': 'country_3_letter_code'}
+
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.string()), ('year', pa.int16())]), flavor='hive')
+PARTITION_COLUMNS = PARTITIONING.schema.names
+
+# Columns stored in the files (the partition columns live in the paths)
+FILE_SCHEMA = pa.schema([
+    ('slug_game', pa.string()),
+    ('country_3_letter_code', pa.string()),
+    ('bronze_medals', pa.int16()),
+    ('gold_medals', pa.int16()),
+    ('silver_medals', pa.int16()),
+    ('total_medals', pa.int16()),
+    ('total_athletes', pa.int16()),
+    ('avg_age_athletes', pa.float64()),
+    ('medals_in_current_year', pa.int16()),
+    ('city', pa.string()),
+    ('game_name', pa.string()),
+    ('cumulative_medals', pa.float64()),
+    ('is_host', pa.int8()),
+])
+
+# Dictionary-encoded in the files, read back as pandas categoricals
+CATEGORY_COLUMNS = ['slug_game', 'country_3_letter_code', 'city', 'game_name']
+# Integers read back as nullable pandas dtypes (NULLs don't turn them into floats)
+PANDAS_INT_TYPES = {pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype()}
+
+# Rows per CSV chunk during the conversion, rows per Parquet row group
+DEFAULT_CHUNK_SIZE = 50_000
+ROW_GROUP_SIZE = 128_000
+
+
+def compact(df):
+    """
+    Maps a raw CSV chunk onto the stored columns, as an Arrow table per
+    (season, year) partition. Raises ValueError if a row has no season or
+    year (it would have no partition) or a count does not fit its small
+    integer type.
+    """
+    df = df.rename(columns=CSV_RENAMES)
+    missing = df[PARTITION_COLUMNS].isna().any(axis=1)
+    if missing.any():
+        raise ValueError(f"{int(missing.sum())} rows without season / year (first at line {missing.idxmax() + 2} of the CSV)")
+    for field in FILE_SCHEMA:
+        if pa.types.is_integer(field.type):
+            values = pd.to_numeric(df[field.name])
+            limits = np.iinfo(field.type.to_pandas_dtype())
+            if values.min() < limits.min or values.max() > limits.max:
+                raise ValueError(f"Column '{field.name}' does not fit {field.type} ({values.min()}..{values.max()})")
+    # sort=False: CSV order is kept within each partition
+    for (season, year), part in df.groupby(PARTITION_COLUMNS, sort=False):
+        table = pa.Table.from_pandas(part[FILE_SCHEMA.names], schema=FILE_SCHEMA, preserve_index=False)
+        yield (season, int(year)), table.replace_schema_metadata(None)
+
+
+def convert_csv(csv_path=DATASET_CSV, output_dir=PARQUET_DIR, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Writes the partitioned copy of ``csv_path`` to ``output_dir``, replacing it
+    as a whole once complete (readers never see a half-written dataset).
+    One file per partition, written in row groups of up to ROW_GROUP_SIZE rows.
+    Returns (rows written, files). Raises ValueError (see compact()) before
+    touching ``output_dir``.
+    """
+    tmp_dir = f"{output_dir.rstrip(os.sep)}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    writers, pending = {}, {}
+
+    def flush(key):
+        if key not in writers:
+            part_dir = os.path.join(tmp_dir, f"season={key[0]}", f"year={key[1]}")
+            os.makedirs(part_dir, exist_ok=True)
+            writers[key] = pq.ParquetWriter(os.path.join(part_dir, "part-0.parquet"), FILE_SCHEMA,
+                                            compression='zstd', use_dictionary=CATEGORY_COLUMNS)
+        writers[key].write_table(pa.concat_tables(pending.pop(key)), row_group_size=ROW_GROUP_SIZE)
+
+    rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            for key, table in compact(chunk):
+                pending.setdefault(key, []).append(table)
+                rows += table.num_rows
+                if sum(t.num_rows for t in pending[key]) >= ROW_GROUP_SIZE:
+                    flush(key)
+        for key in list(pending):
+            flush(key)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    old_dir = f"{output_dir.rstrip(os.sep)}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(tmp_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return rows, len(writers)
+
+
+def _dataset(path):
+    parquet_format = ds.ParquetFileFormat(read_options={'dictionary_columns': CATEGORY_COLUMNS})
+    # use_mmap: pages are mapped from the file on demand instead of copied into read buffers
+    return ds.dataset(path, format=parquet_format, partitioning=PARTITIONING,
+                      filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def _filter(season=None, years=None, countries=None):
+    conditions = []
+    if season is not None:
+        conditions.append(ds.field('season') == season)
+    if years is not None:
+        if isinstance(years, range):
+            conditions.append((ds.field('year') >= years.start) & (ds.field('year') < years.stop))
+        else:
+            conditions.append(ds.field('year').isin(list(years)))
+    if countries is not None:
+        conditions.append(ds.field('country_3_letter_code').isin(list(countries)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _to_pandas(table):
+    df = table.to_pandas(types_mapper=PANDAS_INT_TYPES.get)
+    if 'season' in df.columns:
+        df['season'] = df['season'].astype('category')
+    return df
+
+
+def read_dataset(path=PARQUET_DIR, columns=None, season=None, years=None, countries=None):
+    """
+    DataFrame of the selected ``columns`` (default: all) for the rows matching
+    ``season`` ('Summer' / 'Winter'), ``years`` (iterable or range) and
+    ``countries`` (iterable of codes). None means no restriction.
+    """
+    table = _dataset(path).to_table(columns=columns, filter=_filter(season, years, countries))
+    return _to_pandas(table)
+
+
+def iter_batches(path=PARQUET_DIR, columns=None, batch_size=DEFAULT_CHUNK_SIZE, season=None, years=None, countries=None):
+    """
+    Same selection as read_dataset(), as DataFrames of at most ``batch_size`` rows
+    (partitions in path order, rows in file order).
+    """
+    scanner = _dataset(path).scanner(columns=columns, filter=_filter(season, years, countries), batch_size=batch_size)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield _to_pandas(pa.Table.from_batches([batch]))
+
+
+def is_parquet_source(path):
+    return os.path.isdir(path) or str(path).endswith('.parquet')
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert data/dataset.csv to Parquet partitioned by season / year.")
+    parser.add_argument("--csv", default=DATASET_CSV, help="CSV file to convert")
+    parser.add_argument("--output", default=PARQUET_DIR, help="Output directory (replaced)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="CSV rows read per chunk")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_rows, n_files = convert_csv(args.csv, args.output, args.chunk_size)
+    size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs_ in os.walk(args.output) for f in fs_)
+    print(f"Wrote {n_rows} rows to {args.output} ({n_files} files, {size / 1024:,.0f} KiB) "
+          f"in {time.perf_counter() - start:.2f}s "
+          f"(CSV: {os.path.getsize(args.csv) / 1024:,.0f} KiB)")
@@ -0,0 +1,273 @@
+"""
+Per-request performance instrumentation (enabled with ``PERF_INSTRUMENTATION``).
+
+``PerfMiddleware`` times every request, counts its SQL queries (through a
+``connection.execute_wrapper``) and collects the ``span()`` sections hit
+while serving it. The breakdown is sent back in a ``Server-Timing`` header
+(visible in the browser dev tools) and kept in an in-process ring buffer
+(the last ``PERF_BUFFER_SIZE`` requests), summarized by ``/debug/perf/``.
+It also times the database connections each request had to open (the
+backends' ``connect()``, wrapped while instrumentation is on). There is no
+connection pool in the app: with persistent connections (``CONN_MAX_AGE``)
+each thread keeps one, so most requests that query reuse it and open none,
+and behind an external pooler (Supabase, port 6543) the pool size is set on
+the pooler.
+
+    with span('ml.inference'):
+        ...
+
+When instrumentation is off the middleware removes itself at startup
+(``MiddlewareNotUsed``) and ``span()`` returns a shared no-op object: the
+cost is one context variable lookup. The middleware is sync and async
+capable: under ASGI the async views keep their async path when instrumented.
+Queries run by the worker threads of the async views are not counted
+(execute wrappers are per connection, hence per thread); their spans are.
+"""
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, connections
+from django.http import Http404, JsonResponse
+
+_profile = ContextVar('perf_profile', default=None)
+
+
+class RequestProfile:
+    """
+    Timings collected while serving one request.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = {}        # name -> total ms (a span hit twice is summed)
+        self.queries = 0
+        self.query_ms = 0.0
+        self.connections = 0
+        self.connect_ms = 0.0
+
+    def add_span(self, name, ms):
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_ms += (time.perf_counter() - start) * 1000
+
+
+def _timed_connect(connect):
+    """
+    Wraps a backend's ``connect()``: counts and times the connections opened
+    while serving an instrumented request.
+    """
+    @wraps(connect)
+    def wrapper(self, *args, **kwargs):
+        profile = _profile.get()
+        if profile is None:
+            return connect(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return connect(self, *args, **kwargs)
+        finally:
+            profile.connections += 1
+            profile.connect_ms += (time.perf_counter() - start) * 1000
+
+    wrapper.perf_timed = True
+    return wrapper
+
+
+def time_connections():
+    for alias in connections:
+        backend = type(connections[alias])
+        if not getattr(backend.connect, 'perf_timed', False):
+            backend.connect = _timed_connect(backend.connect)
+
+
+class _Span:
+    __slots__ = ('profile', 'name', 'start')
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.add_span(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """
+    Times a section of the current request (no-op outside an instrumented request).
+    Span names are Server-Timing metric names: no spaces.
+    """
+    profile = _profile.get()
+    if profile is None:
+        return _NULL_SPAN
+    return _Span(profile, name)
+
+
+class PerfRecorder:
+    """
+    Ring buffer of the last N request records, with percentile summaries.
+    """
+
+    def __init__(self, size):
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    @staticmethod
+    def _percentiles(values):
+        import numpy as np
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {'count': len(values), 'p50': round(p50, 2), 'p95': round(p95, 2), 'p99': round(p99, 2)}
+
+    def summary(self):
+        by_view, by_span = {}, {}
+        for record in self.records():
+            by_view.setdefault(record['view'], []).append(record)
+            for name, ms in record['spans'].items():
+                by_span.setdefault(name, []).append(ms)
+
+        views = {}
+        for view, records in sorted(by_view.items()):
+            views[view] = {
+                'total_ms': self._percentiles([r['total_ms'] for r in records]),
+                'db_ms': self._percentiles([r['query_ms'] for r in records]),
+                'queries': self._percentiles([r['queries'] for r in records]),
+                'connections_opened': sum(r['connections'] for r in records),
+                'connect_ms': round(sum(r['connect_ms'] for r in records), 2),
+            }
+        spans = {name: self._percentiles(values) for name, values in sorted(by_span.items())}
+        requests = [r for view_records in by_view.values() for r in view_records]
+        opened = sum(r['connections'] for r in requests)
+        connect_ms = [r['connect_ms'] for r in requests if r['connections']]
+        return {
+            'requests': len(requests),
+            # ~0 per request with persistent connections, >= 1 with one connection per request
+            'db_connections': {
+                'opened': opened,
+                'per_request': round(opened / len(requests), 3) if requests else None,
+                # Requests that queried on a connection kept from an earlier request
+                'reused': sum(1 for r in requests if r['queries'] and not r['connections']),
+                # Setup time (connect + session init) of the requests that opened one
+                'connect_ms': self._percentiles(connect_ms) if connect_ms else None,
+            },
+            'views': views,
+            'spans': spans,
+        }
+
+
+recorder = PerfRecorder(getattr(settings, 'PERF_BUFFER_SIZE', 1000))
+
+
+def server_timing(total_ms, profile):
+    metrics = [f'total;dur={total_ms:.1f}', f'db;dur={profile.query_ms:.1f};desc="{profile.queries} queries"']
+    if profile.connections:
+        metrics.append(f'db-connect;dur={profile.connect_ms:.1f};desc="{profile.connections} opened"')
+    metrics += [f'{name};dur={ms:.1f}' for name, ms in profile.spans.items()]
+    return ', '.join(metrics)
+
+
+class PerfMiddleware:
+    """
+    Put it first in MIDDLEWARE so the total includes the other middleware.
+    Sync and async: under ASGI the async views are timed on their own path,
+    not through a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        time_connections()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            with connection.execute_wrapper(profile.query_wrapper):
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        return self.record(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            with connection.execute_wrapper(profile.query_wrapper):
+                response = await self.get_response(request)
+        finally:
+            _profile.reset(token)
+        return self.record(request, response, profile)
+
+    def record(self, request, response, profile):
+        total_ms = (time.perf_counter() - profile.start) * 1000
+        match = getattr(request, 'resolver_match', None)
+        recorder.add({
+            'view': match.view_name if match and match.view_name else '<unresolved>',
+            'status': response.status_code,
+            'total_ms': total_ms,
+            'queries': profile.queries,
+            'query_ms': profile.query_ms,
+            'connections': profile.connections,
+            'connect_ms': profile.connect_ms,
+            'spans': profile.spans,
+        })
+        response['Server-Timing'] = server_timing(total_ms, profile)
+        return response
+
+
+def perf_summary(request):
+    """
+    p50/p95/p99 per view and per span over the ring buffer. Local use only:
+    served in DEBUG or to INTERNAL_IPS, and only when instrumentation is on.
+    """
+    local = settings.DEBUG or request.META.get('REMOTE_ADDR') in getattr(settings, 'INTERNAL_IPS', [])
+    if not (getattr(settings, 'PERF_INSTRUMENTATION', False) and local):
+        raise Http404("Performance instrumentation is disabled")
+    if request.GET.get('reset'):
+        recorder.clear()
+    return JsonResponse(recorder.summary(), json_dumps_params={'indent': 2})
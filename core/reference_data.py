@@ -0,0 +1,130 @@
+"""
+Reference data registry: small files that are not in the database
+(official Paris 2024 results, ``data/res2024.csv``).
+
+Each dataset is parsed once per process into a DataFrame and re-parsed only
+when its file changes (mtime / size), so requests only pay a ``stat()``.
+Country names are resolved to IOC codes through one precomputed index.
+"""
+import os
+import threading
+from pathlib import Path
+import pandas as pd
+from django.conf import settings
+
+# Country name (as published in the official medal tables) -> IOC code
+NOC_NAME_TO_CODE = {
+    'United States': 'USA', 'China': 'CHN', 'Japan': 'JPN', 'Australia': 'AUS', 'France': 'FRA',
+    'Netherlands': 'NED', 'Great Britain': 'GBR', 'South Korea': 'KOR', 'Italy': 'ITA', 'Germany': 'GER',
+    'New Zealand': 'NZL', 'Canada': 'CAN', 'Uzbekistan': 'UZB', 'Hungary': 'HUN', 'Spain': 'ESP',
+    'Sweden': 'SWE', 'Kenya': 'KEN', 'Norway': 'NOR', 'Ireland': 'IRL', 'Brazil': 'BRA',
+    'Iran': 'IRI', 'Ukraine': 'UKR', 'Romania': 'ROU', 'Georgia': 'GEO', 'Belgium': 'BEL',
+    'Bulgaria': 'BUL', 'Serbia': 'SRB', 'Czech Republic': 'CZE', 'Denmark': 'DEN', 'Azerbaijan': 'AZE',
+    'Croatia': 'CRO', 'Cuba': 'CUB', 'Bahrain': 'BRN', 'Slovenia': 'SLO', 'Chinese Taipei': 'TPE',
+    'Austria': 'AUT', 'Hong Kong': 'HKG', 'Philippines': 'PHI', 'Algeria': 'ALG', 'Indonesia': 'INA',
+    'Israel': 'ISR', 'Poland': 'POL', 'Kazakhstan': 'KAZ', 'Jamaica': 'JAM', 'South Africa': 'RSA',
+    'Thailand': 'THA', 'Ethiopia': 'ETH', 'Switzerland': 'SUI', 'Ecuador': 'ECU', 'Portugal': 'POR',
+    'Greece': 'GRE', 'Argentina': 'ARG', 'Egypt': 'EGY', 'Tunisia': 'TUN', 'Botswana': 'BOT',
+    'Chile': 'CHI', 'Saint Lucia': 'LCA', 'Uganda': 'UGA', 'Dominican Republic': 'DOM', 'Guatemala': 'GUA',
+    'Morocco': 'MAR', 'Dominica': 'DMA', 'Pakistan': 'PAK', 'Turkey': 'TUR', 'Mexico': 'MEX',
+    'Armenia': 'ARM', 'Colombia': 'COL', 'Kyrgyzstan': 'KGZ', 'North Korea': 'PRK', 'Lithuania': 'LTU',
+    'India': 'IND', 'Moldova': 'MDA', 'Kosovo': 'KOS', 'Cyprus': 'CYP', 'Fiji': 'FIJ',
+    'Jordan': 'JOR', 'Mongolia': 'MGL', 'Panama': 'PAN', 'Tajikistan': 'TJK', 'Albania': 'ALB',
+    'Grenada': 'GRN', 'Malaysia': 'MAS', 'Puerto Rico': 'PUR', 'Cape Verde': 'CPV', 'Ivory Coast': 'CIV',
+    'Peru': 'PER', 'Qatar': 'QAT', 'Refugee Olympic Team': 'EOR', 'Singapore': 'SGP', 'Slovakia': 'SVK',
+    'Zambia': 'ZAM',
+    # Official IOC spellings
+    "People's Republic of China": 'CHN',
+    'Republic of Korea': 'KOR',
+    'Hong Kong, China': 'HKG',
+    'United States of America': 'USA',
+    'Islamic Republic of Iran': 'IRI',
+    "Democratic People's Republic of Korea": 'PRK',
+    'Türkiye': 'TUR',
+    'Czechia': 'CZE',
+    'Republic of Moldova': 'MDA',
+}
+
+OFFICIAL_RESULTS_COLUMNS = ['country', 'real']
+
+
+def load_official_results(path):
+    """
+    Medal table (Rank,NOC,Gold,Silver,Bronze,Total) -> one row per IOC code
+    with its total. Unknown country names are dropped; for a code listed
+    twice the last row wins.
+    """
+    df = pd.read_csv(path)
+    if 'NOC' not in df.columns or 'Total' not in df.columns:
+        print(f"Unexpected columns in {path}: {list(df.columns)}")
+        return pd.DataFrame(columns=OFFICIAL_RESULTS_COLUMNS)
+
+    codes = df['NOC'].astype(str).str.strip().map(NOC_NAME_TO_CODE)
+    results = pd.DataFrame({'country': codes, 'real': df['Total'].astype('int64')})
+    results = results.dropna(subset=['country']).drop_duplicates('country', keep='last')
+    return results.reset_index(drop=True)
+
+
+class ReferenceDataRegistry:
+    """
+    Named reference datasets, each backed by a file and a loader(path) -> DataFrame.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources = {}
+        self._entries = {}  # name -> (file stamp, frame)
+
+    def register(self, name, path, loader, empty_columns=()):
+        self._sources[name] = (Path(path), loader, list(empty_columns))
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, name):
+        """
+        Returns the dataset, (re)loading it if its file changed since the last load.
+        A missing or unreadable file gives an empty frame.
+        """
+        path, loader, empty_columns = self._sources[name]
+        stamp = self._stamp(path)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+            frame = pd.DataFrame(columns=empty_columns)
+            if stamp is None:
+                print(f"Reference data '{name}' not found at {path}")
+            else:
+                try:
+                    frame = loader(path)
+                    print(f"Reference data '{name}' loaded ({len(frame)} rows)")
+                except Exception as e:
+                    print(f"Error loading reference data '{name}': {e}")
+            self._entries[name] = (stamp, frame)
+            return frame
+
+    def status(self):
+        return {
+            name: {'path': str(path), 'rows': len(self._entries[name][1]) if name in self._entries else None}
+            for name, (path, _, _) in self._sources.items()
+        }
+
+
+reference_data = ReferenceDataRegistry()
+reference_data.register(
+    'paris_2024_results',
+    getattr(settings, 'PARIS_2024_RESULTS_FILE', Path(settings.BASE_DIR) / 'data' / 'res2024.csv'),
+    load_official_results,
+    empty_columns=OFFICIAL_RESULTS_COLUMNS,
+)
@@ -0,0 +1,150 @@
+"""
+What-if prediction scenarios.
+
+A scenario describes one Games and the countries taking part::
+
+    {
+        "id": "la-2028",                # optional (default: position in the batch)
+        "season": "Summer",             # "Summer" (default) or "Winter"
+        "host": "USA",                  # optional host country
+        "countries": ["USA", "FRA"],    # optional, default: every current country
+        "total_athletes": 300,          # optional, applies to every country of the scenario
+        "overrides": {"FRA": {"total_athletes": 420, "avg_age_athletes": 26.5}}
+    }
+
+Each (scenario, country) pair becomes one model input row: the country's
+latest row for that season (see ``features.load_baseline``) with the
+overrides applied, the host flag and the season. Rows of all scenarios are
+built column-wise into one frame, so a batch costs one model call per model.
+"""
+import numbers
+import numpy as np
+import pandas as pd
+from .features import DEFUNCT_CODES
+
+SEASONS = ('Summer', 'Winter')
+
+# Inputs a scenario can override (baseline columns read by the models)
+OVERRIDE_FIELDS = ('total_athletes', 'total_medals', 'avg_age_athletes', 'cumulative_medals')
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+def _code(value, where):
+    if not isinstance(value, str) or not value.strip():
+        raise ScenarioError(f"{where}: country codes must be non-empty strings")
+    return value.strip().upper()
+
+
+def _fields(spec, where):
+    values = {}
+    for field in OVERRIDE_FIELDS:
+        if field in spec:
+            value = spec[field]
+            if isinstance(value, bool) or not isinstance(value, numbers.Real) or not value >= 0:
+                raise ScenarioError(f"{where}: '{field}' must be a number >= 0")
+            values[field] = float(value)
+    return values
+
+
+def parse_scenarios(payload, max_scenarios):
+    """
+    Validates a list of scenario dicts. Returns (scenarios, overrides):
+    a frame with one row per scenario (scenario, season, host, countries +
+    the scenario-wide fields) and one with one row per country override
+    (pos, country_3_letter_code + fields).
+    """
+    if not isinstance(payload, list) or not payload:
+        raise ScenarioError("'scenarios' must be a non-empty list")
+    if len(payload) > max_scenarios:
+        raise ScenarioError(f"At most {max_scenarios} scenarios per call")
+
+    allowed = {'id', 'season', 'host', 'countries', 'overrides', *OVERRIDE_FIELDS}
+    scenarios, overrides = [], []
+    for pos, spec in enumerate(payload):
+        where = f"scenarios[{pos}]"
+        if not isinstance(spec, dict):
+            raise ScenarioError(f"{where} must be an object")
+        unknown = set(spec) - allowed
+        if unknown:
+            raise ScenarioError(f"{where}: unknown keys {', '.join(sorted(unknown))}")
+
+        season = spec.get('season', 'Summer')
+        if season not in SEASONS:
+            raise ScenarioError(f"{where}: 'season' must be one of {', '.join(SEASONS)}")
+        host = _code(spec['host'], where) if spec.get('host') is not None else None
+        countries = spec.get('countries')
+        if countries is not None:
+            if not isinstance(countries, list) or not countries:
+                raise ScenarioError(f"{where}: 'countries' must be a non-empty list")
+            countries = list(dict.fromkeys(_code(c, where) for c in countries))
+
+        per_country = spec.get('overrides') or {}
+        if not isinstance(per_country, dict):
+            raise ScenarioError(f"{where}: 'overrides' must map country codes to fields")
+        for code, fields in per_country.items():
+            if not isinstance(fields, dict):
+                raise ScenarioError(f"{where}.overrides.{code} must be an object")
+            overrides.append({'pos': pos, 'country_3_letter_code': _code(code, where), **_fields(fields, where)})
+
+        scenarios.append({
+            'pos': pos,
+            'scenario': str(spec.get('id', pos)),
+            'season': season,
+            'host': host,
+            'countries': countries,
+            **_fields(spec, where),
+        })
+
+    scenarios = pd.DataFrame(scenarios).reindex(columns=['pos', 'scenario', 'season', 'host', 'countries', *OVERRIDE_FIELDS])
+    overrides = pd.DataFrame(overrides).reindex(columns=['pos', 'country_3_letter_code', *OVERRIDE_FIELDS])
+    return scenarios, overrides
+
+
+def scenario_frame(scenarios, overrides, baselines, max_rows):
+    """
+    One row per (scenario, country): baseline values (``baselines[season]``,
+    one row per country) overridden by the scenario-wide fields, then by the
+    per-country overrides. Adds ``season`` and ``is_host``.
+    """
+    parts, n_rows = [], 0
+    for season, group in scenarios.groupby('season', sort=False):
+        baseline = baselines[season].drop(columns=['year'], errors='ignore')
+        default_countries = baseline.loc[
+            ~baseline['country_3_letter_code'].isin(DEFUNCT_CODES), 'country_3_letter_code'
+        ].to_numpy()
+
+        # Scenarios without a country list take every current country
+        countries = group['countries'].map(lambda c: default_countries if c is None else c)
+        n_rows += int(countries.map(len).sum())
+        if n_rows > max_rows:
+            raise ScenarioError(f"Too many scenario rows ({n_rows}+, at most {max_rows})")
+        pairs = pd.DataFrame({'pos': group['pos'].to_numpy(), 'country_3_letter_code': countries.to_numpy()})
+        pairs = pairs.explode('country_3_letter_code', ignore_index=True)
+        parts.append(pairs.merge(baseline, on='country_3_letter_code', how='left'))
+
+    frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    frame = frame.merge(scenarios.drop(columns=['countries']), on='pos', how='left', suffixes=('', '_scenario'))
+    if len(overrides):
+        frame = frame.merge(overrides, on=['pos', 'country_3_letter_code'], how='left', suffixes=('', '_country'))
+
+    for field in OVERRIDE_FIELDS:
+        values = frame[field].astype(np.float64)
+        values = frame[f'{field}_scenario'].fillna(values)
+        if f'{field}_country' in frame:
+            values = frame[f'{field}_country'].fillna(values)
+        frame[field] = values
+
+    # Countries with no row for the season need every input but the age (defaulted)
+    missing = frame[['total_athletes', 'total_medals', 'cumulative_medals']].isna().any(axis=1)
+    if missing.any():
+        row = frame[missing].iloc[0]
+        raise ScenarioError(
+            f"No {row['season']} history for '{row['country_3_letter_code']}' (scenario '{row['scenario']}'): "
+            f"set total_athletes, total_medals and cumulative_medals"
+        )
+
+    frame['is_host'] = (frame['country_3_letter_code'] == frame['host']).astype(np.int64)
+    return frame[['pos', 'scenario', 'season', 'host', 'country_3_letter_code', 'is_host', *OVERRIDE_FIELDS]]
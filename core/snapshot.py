@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """
+    Home page KPIs and per-country medal rollup, precomputed by the
+    ``olympic_dashboard_summary`` materialized view (see core/analytics.py).
+    """
+    total_games: int = 0
+    total_countries: int = 0
+    total_athletes: int = 0
+    total_medals: int = 0
+    # ((country_3_letter_code, total_medals), ...) sorted by medals, descending
+    country_medals: tuple = ()
+    refreshed_at: object = None
+
+
+def load_dashboard_snapshot():
+    """
+    Reads the whole snapshot with a single query (the summary view on
+    PostgreSQL, one GROUPING SETS pass with the DuckDB backend) instead of
+    rescanning ``olympic_stats`` several times.
+    """
+    from .analytics import analytics_backend
+
+    totals = None
+    country_medals = []
+    for is_total, code, games, countries, athletes, medals, refreshed_at in analytics_backend().dashboard_rows():
+        if is_total:
+            totals = (games, countries, athletes, medals, refreshed_at)
+        else:
+            country_medals.append((code, medals))
+
+    if totals is None:
+        # View not populated yet (no import has run)
+        return DashboardSnapshot()
+
+    games, countries, athletes, medals, refreshed_at = totals
+    return DashboardSnapshot(
+        total_games=games,
+        total_countries=countries,
+        total_athletes=athletes,
+        total_medals=medals,
+        country_medals=tuple(country_medals),
+        refreshed_at=refreshed_at,
+    )
@@ -1,3 +1,425 @@
-from django.test import TestCase
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+import numpy as np
+from asgiref.sync import iscoroutinefunction
+from django.db import connection
+from django.shortcuts import render as django_render
+from django.test import SimpleTestCase, TestCase, override_settings
+from core import analytics
+from core.dataset_version import bump_dataset_version, current_dataset_version
+from core.http_cache import response_cache
+from core.models import OlympicStats
+from core.scenarios import ScenarioError, parse_scenarios
 
-# Create your tests here.
+CSV_HEADER = (
+    'year,slug_game,country_3_letter_code_x,bronze_medals,gold_medals,silver_medals,total_medals,'
+    'total_athletes,avg_age_athletes,medals_in_current_year,city,season,game_name,cumulative_medals,is_host'
+)
+CSV_ROWS = [
+    (2016, 'rio-2016', 'FRA', 14, 10, 18, 42, 395, 27.1, 42, 'Brazil', 'Summer', 'Rio 2016', 1000.0, 0),
+    (2016, 'rio-2016', 'USA', 38, 46, 37, 121, 554, 26.5, 121, 'Brazil', 'Summer', 'Rio 2016', 2500.0, 0),
+    (2018, 'pyeongchang-2018', 'FRA', 4, 5, 4, 13, 106, 26.0, 13, 'South Korea', 'Winter', 'PyeongChang 2018', 1042.0, 0),
+]
+
+
+def write_dataset_csv(path, rows, medal_factor=1):
+    lines = [CSV_HEADER]
+    for row in rows:
+        row = list(row)
+        row[3:7] = [value * medal_factor for value in row[3:7]]
+        lines.append(','.join(str(value) for value in row))
+    Path(path).write_text('\n'.join(lines) + '\n')
+
+
+_touches = itertools.count(1)
+
+
+def touch_later(path):
+    """
+    Moves the mtime of ``path`` forward, past every earlier call: distinct mtimes
+    even on filesystems with a coarse clock.
+    """
+    mtime_ns = time.time_ns() + next(_touches) * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class DuckDBTestMixin:
+    """
+    DuckDB backend over a small CSV in a temporary directory (no PostgreSQL needed).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.source = self.tmp / 'dataset.csv'
+        write_dataset_csv(self.source, CSV_ROWS)
+
+        settings = override_settings(
+            ANALYTICS_BACKEND='duckdb',
+            ANALYTICS_SOURCE=str(self.source),
+            DATASET_VERSION_FILE=str(self.tmp / '.dataset_version'),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        analytics._backend = None
+        self.addCleanup(setattr, analytics, '_backend', None)
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+
+    def rewrite_source(self, medal_factor):
+        write_dataset_csv(self.source, CSV_ROWS, medal_factor)
+        touch_later(self.source)
+
+
+class DuckDBSourceVersionTests(DuckDBTestMixin, SimpleTestCase):
+    def test_source_change_bumps_the_version(self):
+        before = current_dataset_version()
+        self.assertEqual(current_dataset_version(), before)
+        self.rewrite_source(medal_factor=2)
+        self.assertNotEqual(current_dataset_version(), before)
+
+    def test_source_change_invalidates_pages(self):
+        first = self.client.get('/')
+        self.assertEqual(first.context['total_medals'], 176)
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        self.rewrite_source(medal_factor=2)
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.context['total_medals'], 352)
+
+    def test_source_change_moves_last_modified(self):
+        first = self.client.get('/')
+        self.rewrite_source(medal_factor=2)
+        response = self.client.get('/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['Last-Modified'], first['Last-Modified'])
+
+
+class DashboardCountsTests(DuckDBTestMixin, SimpleTestCase):
+    def test_null_country_counts_as_one_value(self):
+        # Same KPI as the ORM's values('country_3_letter_code').distinct().count()
+        with open(self.source, 'a') as f:
+            f.write('2020,tokyo-2020,,1,1,1,3,10,25.0,3,Japan,Summer,Tokyo 2020,3.0,0\n')
+        total = analytics.analytics_backend().dashboard_rows()[0]
+        self.assertEqual(total[:4], (True, None, 3, 3))
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def database(self, **env):
+        from config.database import django_database
+        with mock.patch.dict(os.environ, env, clear=True):
+            return django_database()
+
+    def test_transaction_pooler_disables_server_side_cursors(self):
+        self.assertTrue(self.database(host='aws-0-eu.pooler.supabase.com', port='6543')['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertTrue(self.database(DATABASE_URL='postgresql://u:p@db.example.com:6543/postgres')['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertFalse(self.database(host='db.example.com', port='5432')['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_server_side_cursors_setting_wins(self):
+        database = self.database(port='6543', DISABLE_SERVER_SIDE_CURSORS='False')
+        self.assertFalse(database['DISABLE_SERVER_SIDE_CURSORS'])
+
+
+class ConnectionMetricsTests(SimpleTestCase):
+    def test_connections_are_counted_and_timed(self):
+        from core.perf import PerfRecorder, RequestProfile, _profile, _timed_connect
+
+        class Backend:
+            def connect(self):
+                time.sleep(0.002)
+
+        connect = _timed_connect(Backend.connect)
+        connect(Backend())  # outside a request: not recorded
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        try:
+            connect(Backend())
+        finally:
+            _profile.reset(token)
+        self.assertEqual(profile.connections, 1)
+        self.assertGreaterEqual(profile.connect_ms, 2)
+
+        recorder = PerfRecorder(10)
+        for queries, connections, connect_ms in ((3, 1, profile.connect_ms), (2, 0, 0.0), (0, 0, 0.0)):
+            recorder.add({'view': 'home', 'status': 200, 'total_ms': 5.0, 'queries': queries, 'query_ms': 1.0,
+                          'connections': connections, 'connect_ms': connect_ms, 'spans': {}})
+        summary = recorder.summary()['db_connections']
+        self.assertEqual((summary['opened'], summary['reused'], summary['connect_ms']['count']), (1, 1, 1))
+
+
+class AsyncPerfMiddlewareTests(DuckDBTestMixin, SimpleTestCase):
+    async def test_async_views_stay_async_when_instrumented(self):
+        from django.test import AsyncClient
+        from core.perf import PerfMiddleware, recorder
+
+        async def view(request):
+            pass
+
+        with override_settings(PERF_INSTRUMENTATION=True):
+            self.assertTrue(iscoroutinefunction(PerfMiddleware(view)))
+            self.assertFalse(iscoroutinefunction(PerfMiddleware(lambda request: None)))
+
+            recorder.clear()
+            self.addCleanup(recorder.clear)
+            response = await AsyncClient().get('/async/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertEqual([record['view'] for record in recorder.records()], ['home_async'])
+
+
+class ModelRegistryResolveTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        settings = override_settings(MODEL_REGISTRY_DIR=str(self.tmp), MODEL_VERSIONS={}, ML_TREE_INFERENCE=True)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def write_version(self, version, **manifest):
+        target = self.tmp / 'xgb' / version
+        target.mkdir(parents=True)
+        (target / 'model.ubj').write_bytes(b'model')
+        manifest = {'version': version, 'format': 'xgboost-ubj', 'artifact': 'model.ubj', 'features': [], **manifest}
+        (target / 'manifest.json').write_text(json.dumps(manifest))
+        touch_later(self.tmp / 'xgb')
+
+    def test_manifest_is_read_once_until_something_changes(self):
+        from core.model_registry import ModelRegistry
+        registry = ModelRegistry()
+        self.write_version('v1')
+        self.assertEqual(registry.resolve('xgb')[0]['version'], 'v1')
+
+        with mock.patch('core.model_registry.json.loads', wraps=json.loads) as loads:
+            for _ in range(3):
+                registry.fingerprint()
+            self.assertEqual(loads.call_count, 0)
+
+        self.write_version('v2')
+        manifest, artifact = registry.resolve('xgb')
+        self.assertEqual((manifest['version'], artifact.name), ('v2', 'model.ubj'))
+
+        # Tree arrays exported into an existing version: the manifest is rewritten in place
+        (self.tmp / 'xgb' / 'v2' / 'trees.npz').write_bytes(b'trees')
+        manifest_path = self.tmp / 'xgb' / 'v2' / 'manifest.json'
+        manifest_path.write_text(json.dumps(dict(manifest, tree_arrays={'artifact': 'trees.npz'})))
+        touch_later(manifest_path)
+        self.assertEqual(registry.resolve('xgb')[1].name, 'trees.npz')
+
+
+class ConditionalGetTests(DuckDBTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        bump_dataset_version(self.tmp / '.dataset_version')
+
+    def test_not_modified_and_cache_hits_skip_the_view(self):
+        first = self.client.get('/')
+        self.assertEqual(first.status_code, 200)
+        with mock.patch('core.views.render') as render:
+            self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+            cached = self.client.get('/')
+            render.assert_not_called()
+        self.assertEqual((cached['ETag'], cached.content), (first['ETag'], first.content))
+
+    def test_dataset_bump_invalidates(self):
+        first = self.client.get('/')
+        bump_dataset_version(self.tmp / '.dataset_version')
+        with mock.patch('core.views.render', wraps=django_render) as render:
+            response = self.client.get('/', HTTP_IF_NONE_MATCH=first['ETag'])
+            again = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(again['ETag'], response['ETag'])
+        self.assertEqual(render.call_count, 1)
+
+
+class OlympicStatsApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Unmanaged table: created outside the test transaction (SQLite schema changes can't run inside one)
+        with connection.schema_editor() as editor:
+            editor.create_model(OlympicStats)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(OlympicStats)
+
+    @classmethod
+    def setUpTestData(cls):
+        OlympicStats.objects.bulk_create(
+            OlympicStats(year=year, slug_game=f'games-{year}', country_3_letter_code=code, total_medals=n, season='Summer')
+            for n, (year, code) in enumerate(itertools.product((2016, 2000, 2008), ('FRA', 'USA', 'CHN', 'GBR')))
+        )
+        OlympicStats.objects.create(year=None, country_3_letter_code='FRA')
+
+    def get(self, **params):
+        response = self.client.get('/api/olympic-stats/', params)
+        return response, (json.loads(b''.join(response.streaming_content)) if response.streaming else response.json())
+
+    def test_cursor_walks_every_row_once(self):
+        seen, after, pages = [], None, 0
+        while True:
+            _, page = self.get(fields='id,year,country_3_letter_code', limit=5, **({'after': after} if after else {}))
+            seen.extend(page['rows'])
+            pages += 1
+            after = page['next']
+            if after is None:
+                break
+        expected = list(OlympicStats.objects.filter(year__isnull=False).order_by('year', 'id')
+                        .values_list('id', 'year', 'country_3_letter_code'))
+        self.assertEqual([tuple(row) for row in seen], expected)
+        self.assertEqual(pages, 3)
+
+    def test_cursor_with_filters_and_projection(self):
+        _, page = self.get(fields='total_medals', country='fra,usa', year_min=2008, limit=3)
+        self.assertEqual(page['fields'], ['total_medals'])
+        self.assertEqual(page['count'], 3)
+        _, rest = self.get(fields='total_medals', country='fra,usa', year_min=2008, limit=3, after=page['next'])
+        self.assertEqual([row[0] for row in page['rows'] + rest['rows']], [8, 9, 0, 1])
+        self.assertIsNone(rest['next'])
+
+    def test_invalid_queries(self):
+        for params in ({'after': '2016'}, {'after': 'x,1'}, {'limit': 0}, {'limit': 'ten'}, {'fields': 'year,nope'}):
+            response, body = self.get(**params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', body)
+
+
+class ScenarioValidationTests(SimpleTestCase):
+    def assertInvalid(self, payload, message, max_scenarios=10):
+        with self.assertRaisesMessage(ScenarioError, message):
+            parse_scenarios(payload, max_scenarios)
+
+    def test_invalid_scenarios(self):
+        self.assertInvalid([], "non-empty list")
+        self.assertInvalid(None, "non-empty list")
+        self.assertInvalid([{}, {}, {}], "At most 2", max_scenarios=2)
+        self.assertInvalid(['FRA'], "must be an object")
+        self.assertInvalid([{'name': 'x'}], "unknown keys name")
+        self.assertInvalid([{'season': 'Spring'}], "'season' must be one of")
+        self.assertInvalid([{'countries': []}], "'countries' must be a non-empty list")
+        self.assertInvalid([{'countries': ['FRA', '']}], "country codes must be non-empty strings")
+        self.assertInvalid([{'total_athletes': -1}], "'total_athletes' must be a number >= 0")
+        self.assertInvalid([{'overrides': {'FRA': {'total_medals': 'many'}}}], "'total_medals' must be a number >= 0")
+        self.assertInvalid([{'overrides': ['FRA']}], "'overrides' must map country codes to fields")
+
+    def test_api_rejects_invalid_bodies(self):
+        for body in ('not json', '[1, 2]'):
+            response = self.client.post('/api/predictions/scenarios/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn('error', response.json())
+
+        with mock.patch('core.ml_service.MLService.__new__') as service:
+            service.return_value.predict_scenarios.side_effect = ScenarioError("At most 1 scenarios per call")
+            response = self.client.post('/api/predictions/scenarios/', {'scenarios': [{}, {}]}, content_type='application/json')
+        self.assertEqual((response.status_code, response.json()), (400, {'error': "At most 1 scenarios per call"}))
+
+
+class TreeEnsembleTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = (rng.random((400, 6)) * [1, 30, 1000, 1, 1, 50]).astype(np.float32)
+        self.X[:, 0] = np.round(self.X[:, 0])
+        self.y = self.X[:, 1] * 2 + np.sqrt(self.X[:, 2]) + rng.normal(size=400)
+        self.X_missing = self.X.copy()
+        self.X_missing[rng.random(self.X.shape) < 0.1] = np.nan
+
+    def assertExact(self, model, ensemble):
+        from core.model_registry import reference_predict
+        from core.tree_ensemble import TreeEnsemble
+        path = Path(tempfile.mkdtemp()) / 'trees.npz'
+        self.addCleanup(shutil.rmtree, path.parent)
+        ensemble.save(path)
+        for restored in (ensemble, TreeEnsemble.load(path)):
+            for X in (self.X, self.X_missing):
+                np.testing.assert_array_equal(restored.predict(X), reference_predict(model, X))
+
+    def test_xgboost_predictions_match_exactly(self):
+        import xgboost as xgb
+        from core.tree_ensemble import TreeEnsemble
+        booster = xgb.XGBRegressor(n_estimators=40, max_depth=4, learning_rate=0.3).fit(self.X_missing, self.y).get_booster()
+        self.assertExact(booster, TreeEnsemble.from_xgboost(booster))
+
+    def test_forest_predictions_match_exactly(self):
+        from sklearn.ensemble import RandomForestRegressor
+        from core.tree_ensemble import TreeEnsemble
+        forest = RandomForestRegressor(n_estimators=15, max_depth=6, random_state=0).fit(self.X_missing, self.y)
+        self.assertExact(forest, TreeEnsemble.from_sklearn_forest(forest))
+
+
+class ParquetRowHashTests(SimpleTestCase):
+    def test_csv_and_parquet_rows_hash_alike(self):
+        from core.parquet_dataset import convert_csv
+        from import_data import add_row_keys, prepare_chunk, read_chunks
+
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        csv_path = tmp / 'dataset.csv'
+        # A repeated (game, country) pair and a row with missing values
+        rows = CSV_ROWS + [CSV_ROWS[0], (2018, 'pyeongchang-2018', 'USA', '', '', '', '', 2, '', '', 'South Korea', 'Winter', 'PyeongChang 2018', '', 0)]
+        write_dataset_csv(csv_path, [])
+        with open(csv_path, 'a') as f:
+            f.writelines(','.join(str(value) for value in row) + '\n' for row in rows)
+        convert_csv(str(csv_path), str(tmp / 'parquet'), chunk_size=2)
+
+        def row_keys(source):
+            seen = {}
+            keyed = [add_row_keys(prepare_chunk(chunk), seen) for chunk in read_chunks(source, chunk_size=2)]
+            return sorted(tuple(row) for chunk in keyed
+                          for row in chunk[['slug_game', 'country_3_letter_code', 'key_seq', 'row_hash']].astype(str).values)
+
+        from_csv = row_keys(str(csv_path))
+        self.assertEqual(len(from_csv), len(rows))
+        self.assertEqual(row_keys(str(tmp / 'parquet')), from_csv)
+
+    def test_rows_without_partition_are_rejected(self):
+        from core.parquet_dataset import convert_csv, read_dataset
+
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        output = tmp / 'parquet'
+        write_dataset_csv(tmp / 'dataset.csv', CSV_ROWS)
+        self.assertEqual(convert_csv(str(tmp / 'dataset.csv'), str(output)), (len(CSV_ROWS), 2))
+        self.assertEqual(len(read_dataset(str(output))), len(CSV_ROWS))
+
+        for blank in (0, 11):  # year, season
+            rows = [list(row) for row in CSV_ROWS]
+            rows[1][blank] = ''
+            write_dataset_csv(tmp / 'dataset.csv', rows)
+            with self.assertRaisesMessage(ValueError, "1 rows without season / year (first at line 3"):
+                convert_csv(str(tmp / 'dataset.csv'), str(output))
+            # The previous copy is still served
+            self.assertEqual(len(read_dataset(str(output))), len(CSV_ROWS))
+
+
+class RowKeyTests(SimpleTestCase):
+    def keys(self, df):
+        return sorted(map(tuple, df[['slug_game', 'country_3_letter_code', 'key_seq', 'row_hash']].astype(str).values))
+
+    def test_duplicate_pairs_dont_depend_on_row_order(self):
+        import pandas as pd
+        from import_data import add_row_keys, duplicate_seq, prepare_chunk
+
+        # Same (game, country) pair, rows differing only in cumulative_medals
+        rows = CSV_ROWS + [CSV_ROWS[0][:13] + (1100.0, 0), CSV_ROWS[0][:13] + (900.0, 0)]
+        frame = pd.DataFrame(rows, columns=CSV_HEADER.split(','))
+        expected = self.keys(add_row_keys(prepare_chunk(frame)))
+        self.assertEqual(self.keys(add_row_keys(prepare_chunk(frame.iloc[::-1].reset_index(drop=True)))), expected)
+
+        # Chunk by chunk, then renumbered over the whole file (incremental mode)
+        seen = {}
+        chunked = pd.concat([add_row_keys(prepare_chunk(frame.iloc[i:i + 2]), seen) for i in range(0, len(frame), 2)],
+                            ignore_index=True)
+        chunked['key_seq'] = duplicate_seq(chunked)
+        self.assertEqual(self.keys(chunked), expected)
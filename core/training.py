@@ -0,0 +1,197 @@
+"""
+Model training: hyperparameter search + leave-one-Games-out backtests,
+spread over a process pool (see ``manage.py train_models``).
+
+Training rows mirror how the models are served: the features of a
+(country, Games) row come from the country's previous Games of the same
+season (the "latest row" baseline of core/features.py), the host flag and
+season from the Games itself, and the target is the medal count won there.
+Features are built once, with the same FeatureBuilder as at prediction time,
+and the design matrices are shipped to each worker process once.
+
+Every (model, hyperparameters, held-out Games) fit is an independent task:
+the search scores each configuration by its backtest MAE, the best one is
+refit on all rows and saved to the model registry with its metrics.
+
+The worker side of this module (everything but ``build_training_frame`` /
+``design_matrix``) only needs numpy, pandas, scikit-learn and xgboost.
+"""
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+FRAME_FIELDS = (
+    'country_3_letter_code', 'slug_game', 'year', 'season', 'is_host',
+    'total_athletes', 'total_medals', 'avg_age_athletes', 'cumulative_medals'
+)
+# Previous-Games values used as features (baseline columns)
+LAGGED_FIELDS = ('total_athletes', 'total_medals', 'avg_age_athletes', 'cumulative_medals')
+
+# Numeric features per model (the country one-hot block is added to XGBoost).
+# Not 'cumulative_medals' for XGBoost: the legacy model lists it but has always
+# been served a 0 for it (absent from XGB_COLUMNS).
+MODEL_FEATURES = {
+    'xgb': ['total_athletes', 'avg_athlete_age', 'medalist_athletes', 'is_host', 'season_Winter'],
+    'rf': ['total_athletes', 'avg_age_athletes', 'cumulative_medals', 'is_host', 'season_Winter'],
+}
+ONEHOT_MODELS = {'xgb'}
+
+PARAM_GRIDS = {
+    'xgb': {
+        'n_estimators': [200, 400],
+        'max_depth': [3, 5],
+        'learning_rate': [0.05, 0.1],
+    },
+    'rf': {
+        'n_estimators': [300],
+        'max_depth': [None, 12],
+        'min_samples_leaf': [1, 3],
+        'max_features': [1.0, 0.5],
+    },
+}
+
+
+def param_grid(name):
+    grid = PARAM_GRIDS[name]
+    return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+
+# -- features (parent process) ---------------------------------------------
+
+def build_training_frame(rows):
+    """
+    One training row per (country, Games) with a previous Games of the same
+    season: lagged baseline columns, current host flag / season, target.
+    ``rows`` holds FRAME_FIELDS for every OlympicStats row.
+    """
+    # Same-Games duplicates: keep the later row (higher cumulative_medals), like load_baseline()
+    df = rows.sort_values(
+        ['country_3_letter_code', 'season', 'year', 'cumulative_medals'], kind='stable'
+    ).drop_duplicates(['country_3_letter_code', 'slug_game'], keep='last')
+
+    previous = df.groupby(['country_3_letter_code', 'season'], sort=False)[list(LAGGED_FIELDS)].shift(1)
+    frame = pd.DataFrame({
+        'country_3_letter_code': df['country_3_letter_code'].astype(str).to_numpy(),
+        'slug_game': df['slug_game'].astype(str).to_numpy(),
+        'year': df['year'].to_numpy(dtype=np.int64),
+        'season': df['season'].astype(str).to_numpy(),
+        'is_host': df['is_host'].fillna(0).to_numpy(dtype=np.int64),
+        **{field: previous[field].to_numpy(dtype=np.float64) for field in LAGGED_FIELDS},
+        'target': df['total_medals'].to_numpy(dtype=np.float64),
+    })
+    frame = frame[frame['total_athletes'].notna()]
+    return frame.sort_values(['year', 'slug_game', 'country_3_letter_code'], kind='stable').reset_index(drop=True)
+
+
+def feature_names(name, frame):
+    names = list(MODEL_FEATURES[name])
+    if name in ONEHOT_MODELS:
+        from .features import ONEHOT_PREFIX
+        names += [f"{ONEHOT_PREFIX}{code}" for code in sorted(frame['country_3_letter_code'].unique())]
+    return names
+
+
+def design_matrix(name, frame):
+    """
+    (feature names, dense X) for one model, through the serving FeatureBuilder.
+    """
+    from .features import RF_COLUMNS, XGB_COLUMNS, FeatureBuilder
+
+    names = feature_names(name, frame)
+    column_map = XGB_COLUMNS if name == 'xgb' else RF_COLUMNS
+    return names, FeatureBuilder(names, column_map).build(frame, host_code=None).toarray()
+
+
+def backtest_games(frame, n_games=None):
+    """
+    Held-out Games: the last ``n_games`` Games (all of them if None), chronologically.
+    """
+    games = frame.drop_duplicates('slug_game').sort_values(['year', 'slug_game'])['slug_game'].tolist()
+    return games[-n_games:] if n_games else games
+
+
+# -- fitting (worker processes) --------------------------------------------
+
+def make_estimator(name, params, seed=0):
+    if name == 'xgb':
+        from xgboost import XGBRegressor
+        return XGBRegressor(objective='reg:squarederror', n_jobs=1, random_state=seed, **params)
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_jobs=1, random_state=seed, **params)
+
+
+def fit(name, params, X, y, features):
+    estimator = make_estimator(name, params)
+    # Random forests are served from a DataFrame (named features)
+    estimator.fit(pd.DataFrame(X, columns=features) if name == 'rf' else X, y)
+    return estimator
+
+
+def predict(name, estimator, X, features):
+    return estimator.predict(pd.DataFrame(X, columns=features) if name == 'rf' else X)
+
+
+_worker = {}
+
+
+def _init_worker(matrices, y, groups):
+    _worker.update(matrices=matrices, y=y, groups=groups)
+
+
+def _backtest_task(task):
+    """
+    Fits one configuration without one Games, predicts that Games.
+    """
+    name, config_id, params, game = task
+    features, X = _worker['matrices'][name]
+    y, groups = _worker['y'], _worker['groups']
+    held_out = groups == game
+    estimator = fit(name, params, X[~held_out], y[~held_out], features)
+    return name, config_id, game, np.flatnonzero(held_out), predict(name, estimator, X[held_out], features)
+
+
+def _errors(y_true, y_pred):
+    diff = np.maximum(0, np.rint(y_pred)) - y_true
+    return {'mae': float(np.abs(diff).mean()), 'rmse': float(np.sqrt((diff ** 2).mean())), 'n_rows': int(len(diff))}
+
+
+def run_search(frame, matrices, games, jobs=None, progress=print):
+    """
+    Backtests every configuration of the models in ``matrices`` ({model:
+    design_matrix()}) on ``games`` across ``jobs`` processes.
+    Returns {model: {'results': [...], 'best': {...}, 'naive': {...}}},
+    results sorted by MAE.
+    """
+    models = list(matrices)
+    y = frame['target'].to_numpy()
+    groups = frame['slug_game'].to_numpy()
+    configs = {name: param_grid(name) for name in models}
+    tasks = [
+        (name, config_id, params, game)
+        for name in models for config_id, params in enumerate(configs[name]) for game in games
+    ]
+
+    predictions = {name: np.full((len(configs[name]), len(frame)), np.nan) for name in models}
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(matrices, y, groups)) as pool:
+        for done, (name, config_id, game, rows, pred) in enumerate(pool.map(_backtest_task, tasks, chunksize=4), 1):
+            predictions[name][config_id, rows] = pred
+            if done % max(1, len(tasks) // 10) == 0 or done == len(tasks):
+                progress(f"  {done}/{len(tasks)} fits ({time.perf_counter() - start:.1f}s)")
+
+    held_out = np.isin(groups, games)
+    naive = _errors(y[held_out], frame['total_medals'].to_numpy()[held_out])
+    report = {}
+    for name in models:
+        results = []
+        for config_id, params in enumerate(configs[name]):
+            pred = predictions[name][config_id]
+            per_game = {game: _errors(y[groups == game], pred[groups == game])['mae'] for game in games}
+            results.append({'params': params, **_errors(y[held_out], pred[held_out]), 'mae_per_games': per_game})
+        results.sort(key=lambda r: r['mae'])
+        report[name] = {'results': results, 'best': results[0], 'naive': naive}
+    return report
@@ -0,0 +1,207 @@
+"""
+Tree ensembles flattened into NumPy node arrays, scored without xgboost or
+scikit-learn.
+
+``TreeEnsemble.from_xgboost()`` / ``from_sklearn_forest()`` export a trained
+model (export time: the libraries are needed); ``save()`` / ``load()`` store
+the arrays in one ``.npz`` file; ``predict()`` only needs NumPy.
+
+All trees share flat node arrays (``feature``, ``threshold``, ``left``,
+``right``, ``missing_left``, ``value``). A leaf points to itself, so
+``predict()`` walks every row through every tree at once, one tree level per
+step (``depth`` vectorized steps for the whole batch).
+
+Predictions are bit-identical to the libraries', because the evaluator uses
+the same arithmetic:
+  - XGBoost: float32 inputs and thresholds, ``x < threshold``, NaN follows
+    ``default_left``, leaves summed in float32 in tree order onto base_score.
+  - scikit-learn forests: float32 inputs, float64 thresholds,
+    ``x <= threshold``, tree outputs summed in float64 in tree order, then
+    divided by the number of trees.
+"""
+import json
+import numpy as np
+
+# XGBoost objectives whose prediction is the raw margin (identity link)
+XGB_IDENTITY_OBJECTIVES = {'reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror', 'reg:quantileerror'}
+
+ARRAY_FIELDS = ('roots', 'feature', 'threshold', 'left', 'right', 'missing_left', 'value')
+
+
+class TreeEnsemble:
+
+    def __init__(self, kind, roots, feature, threshold, left, right, missing_left, value, depth, base_score, n_features):
+        self.kind = kind                    # 'xgboost' (sum + base_score) or 'forest' (mean)
+        self.roots = roots                  # (n_trees,) index of each tree's root node
+        self.feature = feature              # (n_nodes,) split feature (0 on leaves)
+        self.threshold = threshold          # (n_nodes,) split threshold
+        self.left = left                    # (n_nodes,) child when the test passes (itself on leaves)
+        self.right = right                  # (n_nodes,) other child (itself on leaves)
+        self.missing_left = missing_left    # (n_nodes,) NaN goes left
+        self.value = value                  # (n_nodes,) leaf output (0 on split nodes)
+        self.depth = depth
+        self.base_score = base_score
+        self.n_features = n_features
+        # left/right interleaved: the next node is _children[2 * node + goes_right]
+        self._children = np.stack([left, right], axis=1).ravel().astype(np.intp)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ARRAY_FIELDS)
+
+    # -- export -----------------------------------------------------------
+
+    @classmethod
+    def _from_trees(cls, kind, trees, base_score, n_features, threshold_dtype, value_dtype):
+        """
+        ``trees``: list of (feature, threshold, left, right, missing_left, value) per-tree
+        arrays, children as tree-local indices and -1 on leaves.
+        """
+        offsets = np.cumsum([0] + [len(t[0]) for t in trees])
+        feature, threshold, left, right, missing_left, value, depth = [], [], [], [], [], [], 0
+        for offset, (feat, thr, lft, rgt, miss, val) in zip(offsets, trees):
+            leaf = lft < 0
+            nodes = np.arange(len(feat)) + offset
+            feature.append(np.where(leaf, 0, feat))
+            threshold.append(np.where(leaf, 0, thr))
+            left.append(np.where(leaf, nodes, lft + offset))
+            right.append(np.where(leaf, nodes, rgt + offset))
+            missing_left.append(miss)
+            value.append(np.where(leaf, val, 0))
+            depth = max(depth, _tree_depth(lft, rgt))
+
+        return cls(
+            kind,
+            roots=offsets[:-1].astype(np.int32),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(threshold_dtype),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            missing_left=np.concatenate(missing_left).astype(bool),
+            value=np.concatenate(value).astype(value_dtype),
+            depth=depth,
+            base_score=base_score,
+            n_features=n_features,
+        )
+
+    @classmethod
+    def from_xgboost(cls, booster, iteration_range=None):
+        """
+        From an ``xgboost.Booster`` (gbtree, numerical splits, single target).
+        """
+        model = json.loads(booster.save_raw('json'))['learner']
+        objective = model['objective']['name']
+        if objective not in XGB_IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported XGBoost objective '{objective}'")
+        if model['gradient_booster']['name'] != 'gbtree':
+            raise ValueError(f"Unsupported XGBoost booster '{model['gradient_booster']['name']}'")
+        params = model['learner_model_param']
+        if int(params.get('num_target', 1)) != 1 or int(params.get('num_class', 0)) > 1:
+            raise ValueError("Multi-output XGBoost models are not supported")
+
+        gbtree = model['gradient_booster']['model']
+        trees = gbtree['trees']
+        if iteration_range and iteration_range[1] > 0:
+            indptr = gbtree['iteration_indptr']
+            trees = trees[indptr[iteration_range[0]]:indptr[iteration_range[1]]]
+
+        exported = []
+        for tree in trees:
+            if any(tree['split_type']):
+                raise ValueError("Categorical XGBoost splits are not supported")
+            exported.append((
+                np.asarray(tree['split_indices']),
+                np.asarray(tree['split_conditions'], dtype=np.float32),
+                np.asarray(tree['left_children']),
+                np.asarray(tree['right_children']),
+                np.asarray(tree['default_left']),
+                # Leaves keep their weight in split_conditions
+                np.asarray(tree['split_conditions'], dtype=np.float32),
+            ))
+        base_score = np.float32(float(params['base_score'].strip('[]')))
+        return cls._from_trees('xgboost', exported, base_score, int(params['num_feature']), np.float32, np.float32)
+
+    @classmethod
+    def from_sklearn_forest(cls, forest):
+        """
+        From a fitted scikit-learn RandomForestRegressor / ExtraTreesRegressor (single output).
+        """
+        exported = []
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            if tree.n_outputs != 1:
+                raise ValueError("Multi-output forests are not supported")
+            missing = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+            exported.append((
+                tree.feature, tree.threshold, tree.children_left, tree.children_right,
+                missing, tree.value[:, 0, 0],
+            ))
+        return cls._from_trees('forest', exported, 0.0, forest.n_features_in_, np.float64, np.float64)
+
+    # -- storage ----------------------------------------------------------
+
+    def save(self, path):
+        meta = {'kind': self.kind, 'depth': self.depth, 'base_score': float(self.base_score),
+                'n_features': self.n_features}
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **{name: getattr(self, name) for name in ARRAY_FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {name: data[name] for name in ARRAY_FIELDS}
+        base_score = np.float32(meta['base_score']) if meta['kind'] == 'xgboost' else meta['base_score']
+        return cls(meta['kind'], depth=meta['depth'], base_score=base_score, n_features=meta['n_features'], **arrays)
+
+    # -- inference --------------------------------------------------------
+
+    def predict(self, X):
+        """
+        Scores a (n_rows, n_features) batch. NaN is "missing".
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected a (n, {self.n_features}) matrix, got {X.shape}")
+        n_rows = X.shape[0]
+        if self.kind == 'forest':
+            X = X.astype(np.float64)
+        values = X.ravel()
+        has_missing = bool(np.isnan(values).any())
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * self.n_features)[:, None]
+        below = np.less if self.kind == 'xgboost' else np.less_equal
+
+        # (n_rows, n_trees) current node of every row in every tree
+        nodes = np.tile(self.roots.astype(np.intp), (n_rows, 1))
+        for _ in range(self.depth):
+            x = values.take(row_offsets + self.feature.take(nodes))
+            goes_left = below(x, self.threshold.take(nodes))
+            if has_missing:
+                goes_left |= np.isnan(x) & self.missing_left.take(nodes)
+            nodes = self._children.take(2 * nodes + ~goes_left)
+        leaves = self.value.take(nodes)
+
+        if self.kind == 'xgboost':
+            # Sequential float32 sum in tree order (cumsum, not pairwise summation)
+            leaves = np.concatenate([np.full((n_rows, 1), self.base_score, np.float32), leaves], axis=1)
+            return np.cumsum(leaves, axis=1, dtype=np.float32)[:, -1]
+        return np.cumsum(leaves, axis=1)[:, -1] / self.n_trees
+
+
+def _tree_depth(left, right):
+    depth, level = 0, np.array([0])
+    while True:
+        children = np.concatenate([left[level], right[level]])
+        children = children[children >= 0]
+        if not len(children):
+            return depth
+        depth += 1
+        level = children
@@ -1,165 +1,256 @@
 from django.shortcuts import render
-from django.db.models import Count, Sum
-from .models import OlympicStats
-import plotly.express as px
-import pandas as pd
-import os
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.gzip import gzip_page
+from .analytics import MEDAL_SPLIT, analytics_backend
+from .snapshot import load_dashboard_snapshot
+from .chart_cache import chart_cache
+from .dataset_version import current_dataset_version
+from .perf import span
+from .http_cache import versioned
+from .model_registry import registry
 from django.conf import settings
 
+# numpy / pandas (core.figures) and the ML stack (core.ml_service) are imported
+# by the views that need them, not when the URLconf loads (see core.apps.warm_up)
+
+@versioned('dataset')
 def home(request):
-    # 1. Calculate KPIs
-    total_games = OlympicStats.objects.values('slug_game').distinct().count()
-    total_countries = OlympicStats.objects.values('country_3_letter_code').distinct().count()
-    kpi_athletes = OlympicStats.objects.aggregate(total=Sum('total_athletes'))['total']
-    kpi_medals = OlympicStats.objects.aggregate(total=Sum('total_medals'))['total']
-
-    # 2. Charts (Global Map)
-    country_medals = (
-        OlympicStats.objects
-        .values('country_3_letter_code')
-        .annotate(total_medals=Sum('total_medals'))
-        .order_by('-total_medals')
-    )
-    
-    df_map = pd.DataFrame(list(country_medals))
-    
-    if not df_map.empty:
-        # data type fix - use float to avoid binary packing issues
-        df_map['total_medals'] = df_map['total_medals'].fillna(0).astype(float)
-
-        # Create Choropleth
-        map_fig = px.choropleth(
-            df_map,
-            locations="country_3_letter_code",
-            locationmode="ISO-3",
-            color="total_medals",
-            hover_name="country_3_letter_code",
-            color_continuous_scale="Viridis",
-            title="Répartition Mondiale des Médailles (1896-2022)",
-            labels={'total_medals': 'Médailles'}
-        )
-        
-        map_fig.update_layout(
+    # 1. KPIs + per-country rollup, precomputed in one pass (olympic_dashboard_summary)
+    with span('sql.snapshot'):
+        snapshot = load_dashboard_snapshot()
+
+    # 2. Charts (Global Map) - fetched by the page from its JSON endpoint (or inlined)
+    context = {
+        'total_games': snapshot.total_games,
+        'total_countries': snapshot.total_countries,
+        'total_athletes': snapshot.total_athletes,
+        'total_medals': snapshot.total_medals,
+        'map_chart': chart_source('home_map', lambda: build_home_map_json(snapshot)),
+    }
+    return render(request, 'core/home.html', context)
+
+# Shared dark-theme layout for every dashboard chart
+DARK_LAYOUT = dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font=dict(family="Inter", color="#f8fafc"),
+)
+
+def build_home_map_json(snapshot):
+    import numpy as np
+    from .figures import choropleth_figure, dumps_figure
+
+    if not snapshot.country_medals:
+        return "null"
+
+    codes, medals = zip(*snapshot.country_medals)
+    map_fig = choropleth_figure(
+        locations=codes,
+        # float keeps the payload identical to the former px output
+        z=np.asarray(medals, dtype=float),
+        title="Répartition Mondiale des Médailles (1896-2022)",
+        z_label='Médailles',
+        location_label='country_3_letter_code',
+        colorscale='Viridis',
+        layout=dict(
+            DARK_LAYOUT,
             geo=dict(
+                projection=dict(type='equirectangular'),
                 showframe=False,
                 showcoastlines=False,
-                projection_type='equirectangular',
                 bgcolor='rgba(0,0,0,0)'
             ),
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Inter", color="#f8fafc"),
             margin={"r":0,"t":40,"l":0,"b":0},
             coloraxis_colorbar=dict(
                 title=dict(text="Médailles", font=dict(color="#f8fafc")),
                 tickfont=dict(color="#f8fafc")
             )
         )
-        
-        chart_json = safe_json_dump(map_fig)
-    else:
-        chart_json = "null"
+    )
+    return dumps_figure(map_fig)
 
-    context = {
-        'total_games': total_games,
-        'total_countries': total_countries,
-        'total_athletes': kpi_athletes if kpi_athletes else 0,
-        'total_medals': kpi_medals if kpi_medals else 0,
-        'chart_json': chart_json
+@versioned('dataset')
+def explorer(request, code=None):
+    # Country data comes from the rollup index (one query per dataset version);
+    # with deferred charts the page then fetches each chart
+    context = explorer_context(code)
+    context['hosts_bar'] = chart_source('explorer_hosts_bar')
+    return render(request, 'core/explorer.html', context)
+
+def explorer_context(code=None):
+    """
+    Country part of the explorer context: the country's charts, the switcher
+    and what to prefetch for its neighbours. ``code=None`` is /explorer/.
+    """
+    from .country_index import DEFAULT_COUNTRY, country_index, country_label
+
+    index = country_index()
+    if code is not None and index.get(code) is None:
+        raise Http404(f"Unknown country '{code}'")
+    code = code or DEFAULT_COUNTRY
+    previous_country, next_country = index.neighbours(code)
+    neighbours = [c for c in dict.fromkeys((previous_country, next_country)) if c not in (None, code)]
+
+    # Neighbour pages, and their chart payloads when the page fetches them
+    prefetch = [reverse('explorer_country', args=[c]) for c in neighbours]
+    if settings.DEFERRED_CHARTS:
+        prefetch += [chart_source(name)['url'] for c in neighbours for name in country_chart_names(c)]
+
+    pie_name, line_name = country_chart_names(code)
+    return {
+        'country_code': code,
+        'country_label': country_label(code),
+        'countries': index.codes,
+        'previous_country': previous_country,
+        'next_country': next_country,
+        'prefetch_urls': prefetch,
+        'country_pie': chart_source(pie_name),
+        'country_line': chart_source(line_name),
     }
-    return render(request, 'core/home.html', context)
 
-def explorer(request):
-    # 1. France Specific Data 🇫🇷
-    france_qs = OlympicStats.objects.filter(country_3_letter_code='FRA')
-    
-    # Medal Distribution (Pie Chart)
-    # Sum gold, silver, bronze separately
-    fra_medals = france_qs.aggregate(
-        Or=Sum('gold_medals'),
-        Argent=Sum('silver_medals'),
-        Bronze=Sum('bronze_medals')
-    )
-    
-    # Transform for Plotly
-    # Use float to ensure JSON serialization creates numbers, not binary
-    vals = [float(v) if v else 0.0 for v in fra_medals.values()]
-    
-    fra_pie_fig = px.pie(
-        names=list(fra_medals.keys()),
+def explorer_chart_names(code=None):
+    """
+    Charts an explorer page references: its own and its neighbours' (prefetched).
+    """
+    from .country_index import DEFAULT_COUNTRY, country_index
+
+    code = code or DEFAULT_COUNTRY
+    codes = dict.fromkeys([code, *country_index().neighbours(code)])
+    return [name for c in codes if c for name in country_chart_names(c)] + ['explorer_hosts_bar']
+
+def build_country_pie_json(code):
+    from .country_index import country_index, country_label
+    from .figures import dumps_figure, pie_figure
+
+    # Medal Distribution (Pie Chart): gold, silver, bronze totals from the rollup index
+    country = country_index().get(code)
+    medals = country.medal_split if country else {label: None for label, _ in MEDAL_SPLIT}
+
+    vals = [float(v) if v else 0.0 for v in medals.values()]
+
+    pie_fig = pie_figure(
+        labels=list(medals.keys()),
         values=vals,
-        title="Répartition des Médailles (France)",
-        color_discrete_sequence=['#FFD700', '#C0C0C0', '#CD7F32'] # Gold, Silver, Bronze colors
+        title=f"Répartition des Médailles ({country_label(code)})",
+        colors=['#FFD700', '#C0C0C0', '#CD7F32'], # Gold, Silver, Bronze colors
+        layout=dict(paper_bgcolor='rgba(0,0,0,0)', font=DARK_LAYOUT['font'])
     )
-    fra_pie_fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font_family="Inter", font_color="#f8fafc")
-    fra_pie_json = safe_json_dump(fra_pie_fig)
+    return dumps_figure(pie_fig)
 
-    # Performance Over Time (Line Chart)
-    fra_timeline = list(france_qs.values('year', 'season', 'total_medals').order_by('year'))
-    fra_timeline_df = pd.DataFrame(fra_timeline)
-    
-    if not fra_timeline_df.empty:
-        fra_line_fig = px.line(
-            fra_timeline_df, 
-            x='year', 
-            y='total_medals', 
-            color='season',
-            title="Évolution du Nombre de Médailles (France)",
+def build_country_line_json(code):
+    from .country_index import country_index, country_label
+    from .figures import dumps_figure, empty_figure, line_figure
+
+    # Performance Over Time (Line Chart), one line per season
+    title = f"Évolution du Nombre de Médailles ({country_label(code)})"
+    country = country_index().get(code)
+
+    if country and country.years:
+        line_fig = line_figure(
+            x=country.years,
+            y=country.medals,
+            group=country.seasons,
+            title=title,
+            x_label='Année',
+            y_label='Médailles',
+            group_label='Saison',
             markers=True,
-            labels={'year': 'Année', 'total_medals': 'Médailles', 'season': 'Saison'}
+            layout=DARK_LAYOUT
         )
-        fra_line_fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_family="Inter", font_color="#f8fafc")
     else:
         # Fallback empty chart
-        fra_line_fig = px.line(title="Évolution du Nombre de Médailles (France)")
-        fra_line_fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
-            font_family="Inter", 
-            font_color="#f8fafc",
-            annotations=[dict(text="Aucune donnée disponible", showarrow=False, font_size=16)]
-        )
-    fra_line_json = safe_json_dump(fra_line_fig)
+        line_fig = empty_figure(title, "Aucune donnée disponible", layout=DARK_LAYOUT)
+    return dumps_figure(line_fig)
+
+def build_hosts_bar_json():
+    from .figures import bar_figure, dumps_figure, empty_figure
 
     # 2. General Trends 🌍
-    top_hosts = (
-        OlympicStats.objects
-        .filter(is_host=1)
-        .values('country_3_letter_code')
-        .annotate(host_count=Count('year'))
-        .order_by('-host_count')[:10]
-    )
-    top_hosts_df = pd.DataFrame(list(top_hosts))
+    title = "Pays ayant accueilli le plus de Jeux"
+    top_hosts = analytics_backend().top_hosts(10)
     
-    if not top_hosts_df.empty:
-        hosts_bar_fig = px.bar(
-            top_hosts_df,
-            x='country_3_letter_code',
-            y='host_count',
-            title="Pays ayant accueilli le plus de Jeux",
-            labels={'country_3_letter_code': 'Pays', 'host_count': 'Jeux Accueillis'},
-            color='host_count'
+    if top_hosts:
+        codes, host_counts = zip(*top_hosts)
+        hosts_bar_fig = bar_figure(
+            x=codes,
+            y=host_counts,
+            title=title,
+            x_label='Pays',
+            y_label='Jeux Accueillis',
+            layout=dict(DARK_LAYOUT, coloraxis_colorbar=dict(tickfont=dict(color="#f8fafc")))
         )
-        hosts_bar_fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_family="Inter", font_color="#f8fafc", coloraxis_colorbar=dict(tickfont=dict(color="#f8fafc")))
     else:
         # Fallback empty chart
-        hosts_bar_fig = px.bar(title="Pays ayant accueilli le plus de Jeux")
-        hosts_bar_fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
-            font_family="Inter", 
-            font_color="#f8fafc",
-            annotations=[dict(text="Aucune donnée disponible", showarrow=False, font_size=16)]
-        )
-    hosts_bar_json = safe_json_dump(hosts_bar_fig)
+        hosts_bar_fig = empty_figure(title, "Aucune donnée disponible", layout=DARK_LAYOUT)
+    return dumps_figure(hosts_bar_fig)
 
-    context = {
-        'fra_pie_json': fra_pie_json,
-        'fra_line_json': fra_line_json,
-        'hosts_bar_json': hosts_bar_json
-    }
-    return render(request, 'core/explorer.html', context)
+# CHART ENDPOINTS
+# Every dashboard chart, by name. Payloads are cached per dataset version (chart_cache).
+CHART_BUILDERS = {
+    'home_map': lambda: build_home_map_json(load_dashboard_snapshot()),
+    'explorer_hosts_bar': build_hosts_bar_json,
+}
+# Per-country charts, named '<prefix>.<country code>' (e.g. 'explorer_pie.FRA')
+COUNTRY_CHART_BUILDERS = {
+    'explorer_pie': build_country_pie_json,
+    'explorer_line': build_country_line_json,
+}
+
+def country_chart_names(code):
+    return [f"{prefix}.{code}" for prefix in COUNTRY_CHART_BUILDERS]
+
+def chart_builder(name):
+    """
+    Builder of a chart name, or None for an unknown chart (or country).
+    """
+    if name in CHART_BUILDERS:
+        return CHART_BUILDERS[name]
+    prefix, _, code = name.partition('.')
+    if prefix in COUNTRY_CHART_BUILDERS:
+        from .country_index import DEFAULT_COUNTRY, country_index
+        # The default country's charts exist without data (empty charts, before the first import)
+        if code == DEFAULT_COUNTRY or country_index().get(code) is not None:
+            return lambda: COUNTRY_CHART_BUILDERS[prefix](code)
+    return None
+
+def get_chart_json(name, version=None, builder=None):
+    builder = builder or chart_builder(name)
+
+    def build():
+        # Only timed on a cache miss
+        with span(f'chart.{name}'):
+            return builder()
+
+    return chart_cache.get_or_build(name, version or current_dataset_version(), build)
+
+def chart_source(name, builder=None):
+    """
+    Template context for one chart. With DEFERRED_CHARTS (default) the page only gets
+    the URL of the chart endpoint, versioned so browsers can cache it for good;
+    otherwise the figure JSON is inlined in the HTML.
+    """
+    version = current_dataset_version()
+    if settings.DEFERRED_CHARTS:
+        return {'url': f"{reverse('chart_json', args=[name])}?v={version}"}
+    return {'json': get_chart_json(name, version, builder)}
+
+@gzip_page
+@versioned('dataset')
+def chart_json(request, name):
+    if chart_builder(name) is None:
+        raise Http404(f"Unknown chart '{name}'")
 
+    version = current_dataset_version()
+    response = HttpResponse(get_chart_json(name, version), content_type='application/json')
+    if request.GET.get('v') == version:
+        # Versioned URL: the content can never change
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
+
+@versioned()
 def myths(request):
     # Data for the 11 Myths (Sample subset for prototype)
     myths_list = [
@@ -205,12 +296,14 @@ def myths(request):
     }
     return render(request, 'core/myths.html', context)
 
-from .ml_service import MLService
-
 
+@versioned('dataset', 'models')
 def predictions(request):
+    from .ml_service import MLService
+
     ml_service = MLService()
-    results = ml_service.predict_paris_2024()
+    with span('ml.predict'):
+        results = ml_service.predict_paris_2024()
     
     # Separate France for "Golden Card"
     fra_prediction = next((item for item in results if item['country'] == 'FRA'), None)
@@ -238,130 +331,31 @@ def predictions(request):
     }
     return render(request, 'core/predictions.html', context)
 
+def model_status(request):
+    """
+    Model registry readiness, versions, load times and artifact sizes (503 until loaded).
+    """
+    status = registry.status()
+    return JsonResponse(status, status=200 if status['ready'] else 503)
+
+@versioned('dataset', 'models', 'reference')
 def comparison(request):
     """
     Compares AI predictions with OFFICIAL Paris 2024 results.
     """
-    ml_service = MLService()
-    preds = ml_service.predict_paris_2024()
-    
-    # OFFICIAL PARIS 2024 RESULTS (Source: User Provided)
-    # Mapping Country Name -> (Gold, Silver, Bronze, Total)
-    # We need to map these Names to our 3-Letter Codes.
-    # Common IOC Code Mapping:
-    name_to_code = {
-        'United States': 'USA', 'China': 'CHN', 'Japan': 'JPN', 'Australia': 'AUS', 'France': 'FRA',
-        'Netherlands': 'NED', 'Great Britain': 'GBR', 'South Korea': 'KOR', 'Italy': 'ITA', 'Germany': 'GER',
-        'New Zealand': 'NZL', 'Canada': 'CAN', 'Uzbekistan': 'UZB', 'Hungary': 'HUN', 'Spain': 'ESP',
-        'Sweden': 'SWE', 'Kenya': 'KEN', 'Norway': 'NOR', 'Ireland': 'IRL', 'Brazil': 'BRA',
-        'Iran': 'IRI', 'Ukraine': 'UKR', 'Romania': 'ROU', 'Georgia': 'GEO', 'Belgium': 'BEL',
-        'Bulgaria': 'BUL', 'Serbia': 'SRB', 'Czech Republic': 'CZE', 'Denmark': 'DEN', 'Azerbaijan': 'AZE',
-        'Croatia': 'CRO', 'Cuba': 'CUB', 'Bahrain': 'BRN', 'Slovenia': 'SLO', 'Chinese Taipei': 'TPE',
-        'Austria': 'AUT', 'Hong Kong': 'HKG', 'Philippines': 'PHI', 'Algeria': 'ALG', 'Indonesia': 'INA',
-        'Israel': 'ISR', 'Poland': 'POL', 'Kazakhstan': 'KAZ', 'Jamaica': 'JAM', 'South Africa': 'RSA',
-        'Thailand': 'THA', 'Ethiopia': 'ETH', 'Switzerland': 'SUI', 'Ecuador': 'ECU', 'Portugal': 'POR',
-        'Greece': 'GRE', 'Argentina': 'ARG', 'Egypt': 'EGY', 'Tunisia': 'TUN', 'Botswana': 'BOT',
-        'Chile': 'CHI', 'Saint Lucia': 'LCA', 'Uganda': 'UGA', 'Dominican Republic': 'DOM', 'Guatemala': 'GUA',
-        'Morocco': 'MAR', 'Dominica': 'DMA', 'Pakistan': 'PAK', 'Turkey': 'TUR', 'Mexico': 'MEX',
-        'Armenia': 'ARM', 'Colombia': 'COL', 'Kyrgyzstan': 'KGZ', 'North Korea': 'PRK', 'Lithuania': 'LTU',
-        'India': 'IND', 'Moldova': 'MDA', 'Kosovo': 'KOS', 'Cyprus': 'CYP', 'Fiji': 'FIJ',
-        'Jordan': 'JOR', 'Mongolia': 'MGL', 'Panama': 'PAN', 'Tajikistan': 'TJK', 'Albania': 'ALB',
-        'Grenada': 'GRN', 'Malaysia': 'MAS', 'Puerto Rico': 'PUR', 'Cape Verde': 'CPV', 'Ivory Coast': 'CIV',
-        'Peru': 'PER', 'Qatar': 'QAT', 'Refugee Olympic Team': 'EOR', 'Singapore': 'SGP', 'Slovakia': 'SVK',
-        'Zambia': 'ZAM'
-    }
+    from .features import comparison_records
+    from .ml_service import MLService
+    from .reference_data import reference_data
 
-    # Data: Total Medals - Load from CSV
-    official_by_code = {}
-    try:
-        csv_path = os.path.join(settings.BASE_DIR, 'data', 'res2024.csv')
-        # Use pandas for easy reading (assuming simple format: Rank,NOC,Gold,Silver,Bronze,Total)
-        if os.path.exists(csv_path):
-            df_res = pd.read_csv(csv_path)
-            # Ensure columns exist
-            if 'NOC' in df_res.columns and 'Total' in df_res.columns:
-                for _, row in df_res.iterrows():
-                    country_name = str(row['NOC']).strip()
-                    total = int(row['Total'])
-                    
-                    # Map Name -> Code
-                    # First try direct map
-                    code = name_to_code.get(country_name)
-                    
-                    # If failed, try some manual overrides for common mismatches in Olympic data
-                    if not code:
-                        manual_map = {
-                            "People's Republic of China": "CHN",
-                            "Republic of Korea": "KOR",
-                            "Chinese Taipei": "TPE", 
-                            "Hong Kong, China": "HKG",
-                            "Great Britain": "GBR",
-                            "United States of America": "USA",
-                            "Islamic Republic of Iran": "IRI",
-                            "Democratic People's Republic of Korea": "PRK",
-                            "Türkiye": "TUR",
-                            "Czechia": "CZE",
-                            "Republic of Moldova": "MDA"
-                        }
-                        code = manual_map.get(country_name)
-                        if not code:
-                           # Reverse lookup in name_to_code (risky but better than nothing)? 
-                           # No, stick to safe maps.
-                           pass
-
-                    if code:
-                        official_by_code[code] = total
-        else:
-            print(f"RES2024 CSV not found at {csv_path}")
+    ml_service = MLService()
+    with span('ml.predict'):
+        preds = ml_service.predict_paris_2024()
 
-        print(f"DEBUG: Official Data Loaded. Count: {len(official_by_code)}")
-        if 'USA' in official_by_code:
-            print(f"DEBUG: USA found -> {official_by_code['USA']}")
-        else:
-            print("DEBUG: USA NOT FOUND in official_by_code")
+    # Official results (data/res2024.csv), parsed once and reloaded when the file changes
+    with span('comparison.merge'):
+        official = reference_data.get('paris_2024_results')
+        comp_data = comparison_records(preds, official)
 
-    except Exception as e:
-        print(f"Error loading RES2024 CSV: {e}")
-            
-    comp_data = []
-    
-    for p in preds:
-        code = p['country']
-        predicted = p['predicted_medals']
-        xgb_val = p.get('predicted_medals_xgb', 0)
-        rf_val = p.get('predicted_medals_rf', 0)
-        
-        # Get real or default to 0 if not in list
-        real = official_by_code.get(code, 0)
-        
-        # Only compare if we have real data (or if predicted > 0, we assume real is 0 if missing)
-        # To avoid clutter, let's include if either predicted > 0 or real > 0
-        if predicted == 0 and real == 0:
-            continue
-            
-        diff = real - predicted
-        
-        if diff == 0:
-            status = 'perfect'
-        elif diff > 0:
-            status = 'under' # Predicted under real -> Good surprise
-        else:
-            status = 'over' # Predicted over real -> Disappointment
-            
-        comp_data.append({
-            'country': code,
-            'predicted': predicted,
-            'predicted_xgb': xgb_val,
-            'predicted_rf': rf_val,
-            'real': real,
-            'diff': diff,
-            'status': status,
-            'abs_diff': abs(diff)
-        })
-        
-    # Sort by 'Real' medals count
-    comp_data.sort(key=lambda x: x['predicted'], reverse=True)
-    
     context = {
         'comparison': comp_data
     }
@@ -369,7 +363,6 @@ def comparison(request):
 
 # UTILITY
 import json
-import numpy as np
 import base64
 
 def deep_decode_bdata(obj):
@@ -382,6 +375,7 @@ def deep_decode_bdata(obj):
             bdata = obj['bdata']
             dtype_str = obj['dtype']
             try:
+                import numpy as np
                 decoded_bytes = base64.b64decode(bdata)
                 # Map plotly dtype strings to numpy dtypes
                 # 'f8' = float64, 'f4' = float32, 'i8' = int64, etc.
@@ -402,6 +396,10 @@ def safe_json_dump(fig):
     """
     Serializes a Plotly figure to a JSON string, ensuring NO binary packing.
     """
+    with span('safe_json_dump'):
+        return _safe_json_dump(fig)
+
+def _safe_json_dump(fig):
     # 1. Get dictionary (which might contain bdata)
     fig_dict = fig.to_dict()
     
@@ -409,6 +407,8 @@ def safe_json_dump(fig):
     clean_dict = deep_decode_bdata(fig_dict)
     
     # 3. Dump to JSON (numpy types are now lists, but handle any stragglers)
+    import numpy as np
+
     def default_serializer(obj):
         if hasattr(obj, 'tolist'):
             return obj.tolist()
@@ -26,10 +26,55 @@ CREATE TABLE IF NOT EXISTS olympic_stats (
     season VARCHAR(50),
     game_name VARCHAR(255),
     cumulative_medals FLOAT,
-    is_host INTEGER
+    is_host INTEGER,
+    -- Load bookkeeping (import_data.py):
+    --   key_seq  : occurrence number of the (slug_game, country) pair. 852 of the 2205 CSV
+    --              rows share their pair with another row (426 pairs, e.g. albertville-1992,
+    --              differing in medals_in_current_year / cumulative_medals); they are numbered
+    --              in row_hash order, so the keys don't depend on the file's row order
+    --   row_hash : hash of the row content, used by the incremental import to detect updates
+    key_seq SMALLINT NOT NULL DEFAULT 0,
+    row_hash BIGINT
 );
 
+-- Natural key (target of the incremental import's INSERT ... ON CONFLICT)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_stats_natural_key ON olympic_stats(slug_game, country_3_letter_code, key_seq);
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_stats_slug_game ON olympic_stats(slug_game);
-CREATE INDEX IF NOT EXISTS idx_stats_country ON olympic_stats(country_3_letter_code);
-CREATE INDEX IF NOT EXISTS idx_stats_year ON olympic_stats(year);
+
+-- Workload-driven indexes, matched to the app's queries (see core/migrations/0002_*)
+-- The INCLUDE columns let those queries run as index-only scans.
+-- France charts: WHERE country_3_letter_code = ... [ORDER BY year]
+CREATE INDEX IF NOT EXISTS idx_stats_country_year ON olympic_stats(country_3_letter_code, year)
+    INCLUDE (season, total_medals, gold_medals, silver_medals, bronze_medals);
+-- ML baseline (core/features.py): Summer Games rows per country
+CREATE INDEX IF NOT EXISTS idx_stats_summer_country_year ON olympic_stats(country_3_letter_code, year)
+    INCLUDE (total_athletes, total_medals, avg_age_athletes, cumulative_medals)
+    WHERE season = 'Summer';
+-- Host countries chart: WHERE is_host = 1 GROUP BY country_3_letter_code
+CREATE INDEX IF NOT EXISTS idx_stats_hosts ON olympic_stats(country_3_letter_code) INCLUDE (year)
+    WHERE is_host = 1;
+-- Data API keyset pagination (core/api.py): ORDER BY year, id
+CREATE INDEX IF NOT EXISTS idx_stats_year_id ON olympic_stats(year, id);
+
+-- Precomputed dashboard snapshot (home page KPIs + per-country medal rollup)
+-- Computed in a single pass over olympic_stats with GROUPING SETS:
+--   * is_total = TRUE  -> one grand-total row holding the KPIs
+--   * is_total = FALSE -> one row per country with its medal / athlete totals
+-- Game / country counts count NULL as one value, like the ORM's values().distinct().count().
+-- Refreshed by import_data.py after every load.
+CREATE MATERIALIZED VIEW IF NOT EXISTS olympic_dashboard_summary AS
+SELECT
+    ROW_NUMBER() OVER () AS id,
+    GROUPING(country_3_letter_code) = 1 AS is_total,
+    country_3_letter_code,
+    COUNT(DISTINCT slug_game) + (COUNT(*) > COUNT(slug_game))::int AS total_games,
+    COUNT(DISTINCT country_3_letter_code) + (COUNT(*) > COUNT(country_3_letter_code))::int AS total_countries,
+    COALESCE(SUM(total_athletes), 0) AS total_athletes,
+    COALESCE(SUM(total_medals), 0) AS total_medals,
+    now() AS refreshed_at
+FROM olympic_stats
+GROUP BY GROUPING SETS ((country_3_letter_code), ());
+
+CREATE INDEX IF NOT EXISTS idx_dashboard_summary_total ON olympic_dashboard_summary(is_total, total_medals DESC);
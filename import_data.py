@@ -1,22 +1,57 @@
 import pandas as pd
-import psycopg2
+from psycopg2.extras import execute_values
 import os
-from dotenv import load_dotenv
-import numpy as np
+import argparse
+import io
+import re
+import time
+from config.database import connect, db_params
+from core.dataset_version import bump_dataset_version
+from core.parquet_dataset import is_parquet_source, iter_batches
 
-# Load environment variables
-load_dotenv()
-
-# Database connection details
-DB_USER = os.getenv("user")
-DB_PASSWORD = os.getenv("password")
-DB_HOST = os.getenv("host")
-DB_PORT = os.getenv("port")
-DB_NAME = os.getenv("dbname")
+# Database connection details (shared env parsing, see config/database.py)
+DB_PARAMS = db_params()
 
 # CSV file path
 CSV_FILE_PATH = os.path.join("data", "dataset.csv")
 
+# Schema file (source of truth for the table, its indexes and the summary view)
+SCHEMA_FILE_PATH = "db.sql"
+
+TABLE_NAME = "olympic_stats"
+STAGING_TABLE = "olympic_stats_staging"
+
+# Column order used by the loaders (matches the db.sql table definition)
+COLUMNS = [
+    'year', 'slug_game', 'country_3_letter_code',
+    'bronze_medals', 'gold_medals', 'silver_medals', 'total_medals',
+    'total_athletes', 'avg_age_athletes', 'medals_in_current_year',
+    'city', 'season', 'game_name', 'cumulative_medals', 'is_host'
+]
+# Natural key and bookkeeping columns (see db.sql)
+KEY_COLUMNS = ['slug_game', 'country_3_letter_code', 'key_seq']
+LOAD_COLUMNS = COLUMNS + ['key_seq', 'row_hash']
+
+INTEGER_COLUMNS = [
+    'year', 'bronze_medals', 'gold_medals', 'silver_medals', 'total_medals',
+    'total_athletes', 'medals_in_current_year', 'is_host'
+]
+
+# Rows per chunk streamed to COPY (bounds memory whatever the file size)
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Precomputed dashboard snapshot (see db.sql), rebuilt after every load
+SUMMARY_VIEW = "olympic_dashboard_summary"
+
+def refresh_dashboard_summary(cur):
+    """
+    Recomputes the home page KPIs / per-country rollup in one pass.
+    Runs inside the import transaction so readers never see a stale snapshot
+    next to fresh data.
+    """
+    print(f"Refreshing materialized view '{SUMMARY_VIEW}'...")
+    cur.execute(f"REFRESH MATERIALIZED VIEW {SUMMARY_VIEW};")
+
 def import_data():
     if not os.path.exists(CSV_FILE_PATH):
         print(f"Error: File not found at {CSV_FILE_PATH}")
@@ -30,30 +65,15 @@ def import_data():
         return
 
     # Data transformation to match DB Schema
-    # 1. Rename 'country_3_letter_code_x' -> 'country_3_letter_code'
-    if 'country_3_letter_code_x' in df.columns:
-        df = df.rename(columns={'country_3_letter_code_x': 'country_3_letter_code'})
-    
-    # 2. Check for missing columns (e.g. game_slug is gone, which is good)
-    expected_cols = [
-        'year', 'slug_game', 'country_3_letter_code', 
-        'bronze_medals', 'gold_medals', 'silver_medals', 'total_medals', 
-        'total_athletes', 'avg_age_athletes', 'medals_in_current_year', 
-        'city', 'season', 'game_name', 'cumulative_medals', 'is_host'
-    ]
+    # (column rename / order, natural-key sequence and content hash)
+    df = add_row_keys(prepare_chunk(df))
     
     # Fill NaN with None (for SQL NULL)
-    df = df.replace({np.nan: None})
+    df = df.astype(object).where(df.notna(), None)
 
     print("Connecting to database...")
     try:
-        conn = psycopg2.connect(
-            user=DB_USER,
-            password=DB_PASSWORD,
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME
-        )
+        conn = get_connection()
         cur = conn.cursor()
 
         # Optional: Truncate table before import
@@ -66,12 +86,14 @@ def import_data():
                 year, slug_game, country_3_letter_code, 
                 bronze_medals, gold_medals, silver_medals, total_medals, 
                 total_athletes, avg_age_athletes, medals_in_current_year, 
-                city, season, game_name, cumulative_medals, is_host
+                city, season, game_name, cumulative_medals, is_host,
+                key_seq, row_hash
             ) VALUES (
                 %s, %s, %s, 
                 %s, %s, %s, %s, 
                 %s, %s, %s, 
-                %s, %s, %s, %s, %s
+                %s, %s, %s, %s, %s,
+                %s, %s
             )
         """
 
@@ -80,12 +102,283 @@ def import_data():
                 row.get('year'), row.get('slug_game'), row.get('country_3_letter_code'),
                 row.get('bronze_medals'), row.get('gold_medals'), row.get('silver_medals'), row.get('total_medals'),
                 row.get('total_athletes'), row.get('avg_age_athletes'), row.get('medals_in_current_year'),
-                row.get('city'), row.get('season'), row.get('game_name'), row.get('cumulative_medals'), row.get('is_host')
+                row.get('city'), row.get('season'), row.get('game_name'), row.get('cumulative_medals'), row.get('is_host'),
+                row.get('key_seq'), row.get('row_hash')
             )
             cur.execute(insert_query, values)
 
+        refresh_dashboard_summary(cur)
+
         conn.commit()
         print(f"Successfully inserted {len(df)} rows.")
+        print(f"Dataset version bumped to {bump_dataset_version()}")
+
+        cur.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"Database error: {e}")
+
+def get_connection():
+    return connect(DB_PARAMS)
+
+def schema_statements(kind):
+    """
+    Returns the db.sql statements of a given kind, so the bulk loader rebuilds
+    exactly what the schema defines:
+      - 'table'   : CREATE TABLE olympic_stats
+      - 'indexes' : CREATE INDEX ... ON olympic_stats
+      - 'summary' : the dashboard materialized view and its indexes
+    """
+    with open(SCHEMA_FILE_PATH, 'r') as f:
+        sql = re.sub(r'--[^\n]*', '', f.read())
+
+    statements = [stmt.strip() for stmt in sql.split(';') if stmt.strip()]
+    if kind == 'table':
+        return [s for s in statements if re.match(rf'CREATE TABLE (IF NOT EXISTS )?{TABLE_NAME}\b', s)]
+    if kind == 'indexes':
+        return [s for s in statements if re.match(rf'CREATE (UNIQUE )?INDEX .* ON {TABLE_NAME}\b', s, re.S)]
+    if kind == 'summary':
+        return [
+            s for s in statements
+            if re.match(rf'CREATE MATERIALIZED VIEW (IF NOT EXISTS )?{SUMMARY_VIEW}\b', s)
+            or re.match(rf'CREATE (UNIQUE )?INDEX .* ON {SUMMARY_VIEW}\b', s, re.S)
+        ]
+    raise ValueError(f"Unknown statement kind: {kind}")
+
+def index_name(statement):
+    return re.match(r'CREATE (?:UNIQUE )?INDEX (?:IF NOT EXISTS )?(\w+)', statement).group(1)
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Raw chunks of the source file: the CSV, or its Parquet conversion
+    (core/parquet_dataset.py, a directory or a single .parquet file).
+    """
+    if is_parquet_source(path):
+        return iter_batches(path, batch_size=chunk_size)
+    return pd.read_csv(path, chunksize=chunk_size)
+
+def prepare_chunk(df):
+    """
+    Maps a raw CSV / Parquet chunk onto the table columns (same rules as import_data()).
+    Integer columns use the nullable Int64 dtype so NULLs don't turn them into floats;
+    Parquet categoricals go back to plain strings, so row hashes match the CSV's.
+    """
+    if 'country_3_letter_code_x' in df.columns:
+        df = df.rename(columns={'country_3_letter_code_x': 'country_3_letter_code'})
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+    df = df[COLUMNS].copy()
+    for col in df.select_dtypes('category').columns:
+        df[col] = df[col].astype(df[col].cat.categories.dtype)
+    for col in INTEGER_COLUMNS:
+        df[col] = pd.to_numeric(df[col]).astype('Int64')
+    return df
+
+def duplicate_seq(df):
+    """
+    Occurrence number of each row's (slug_game, country_3_letter_code) pair in ``df``.
+    Rows sharing a pair are numbered in row_hash order, not file order, so the same
+    rows re-exported in another order keep their keys.
+    """
+    pair = (df['slug_game'].astype(str) + '|' + df['country_3_letter_code'].astype(str)).reset_index(drop=True)
+    ranked = pair.iloc[df['row_hash'].to_numpy().argsort(kind='stable')]
+    return ranked.groupby(ranked, sort=False, dropna=False).cumcount().sort_index().astype('int16').to_numpy()
+
+def add_row_keys(df, seen_counts=None):
+    """
+    Adds the bookkeeping columns (vectorized):
+      - key_seq  : occurrence number of (slug_game, country_3_letter_code), see duplicate_seq().
+                   ``seen_counts`` carries the counts across chunks and is updated in place
+                   (pairs spread over several chunks are then numbered chunk by chunk).
+      - row_hash : 64-bit hash of the row content (signed, to fit a BIGINT)
+    """
+    df = df.copy()
+    df['key_seq'] = 0
+    df['row_hash'] = pd.util.hash_pandas_object(df[COLUMNS], index=False).to_numpy().view('int64')
+    df['key_seq'] = duplicate_seq(df)
+    if seen_counts is not None:
+        pair = df['slug_game'].astype(str) + '|' + df['country_3_letter_code'].astype(str)
+        df['key_seq'] += pair.map(seen_counts).fillna(0).astype('int16')
+        for key, count in pair.value_counts(sort=False, dropna=False).items():
+            seen_counts[key] = seen_counts.get(key, 0) + int(count)
+    return df
+
+def bulk_import_data(csv_path=CSV_FILE_PATH, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Bulk load mode: streams the CSV in chunks through COPY FROM STDIN into a
+    staging table, builds the db.sql indexes once the data is in, then swaps
+    the staging table in atomically (readers see either the old or the new
+    data, never an empty table).
+    """
+    if not os.path.exists(csv_path):
+        print(f"Error: File not found at {csv_path}")
+        return
+
+    print("Connecting to database...")
+    try:
+        conn = get_connection()
+        cur = conn.cursor()
+
+        # 1. Fresh staging table, no secondary index during the load
+        cur.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE};")
+        create_table = schema_statements('table')[0]
+        cur.execute(re.sub(rf'CREATE TABLE (IF NOT EXISTS )?{TABLE_NAME}\b', f'CREATE TABLE {STAGING_TABLE}', create_table))
+
+        # 2. Stream chunks through COPY
+        copy_sql = f"COPY {STAGING_TABLE} ({', '.join(LOAD_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+        seen_counts = {}
+        total_rows = 0
+        start = time.perf_counter()
+        for chunk in read_chunks(csv_path, chunk_size):
+            buf = io.StringIO()
+            add_row_keys(prepare_chunk(chunk), seen_counts).to_csv(buf, index=False, header=False)
+            buf.seek(0)
+            cur.copy_expert(copy_sql, buf)
+
+            total_rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"  {total_rows:>10,} rows loaded ({total_rows / elapsed:,.0f} rows/sec)")
+
+        # Pairs spread over several chunks were numbered chunk by chunk: renumber them
+        # in row_hash order over the whole file, like duplicate_seq() in incremental mode
+        cur.execute(f"""
+            UPDATE {STAGING_TABLE} AS t SET key_seq = r.key_seq
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY slug_game, country_3_letter_code ORDER BY row_hash, id
+                ) - 1 AS key_seq
+                FROM {STAGING_TABLE}
+            ) AS r
+            WHERE t.id = r.id AND t.key_seq <> r.key_seq;
+        """)
+
+        # 3. Build the db.sql indexes on the loaded data (temporary names)
+        index_statements = schema_statements('indexes')
+        print(f"Building {len(index_statements)} indexes...")
+        for stmt in index_statements:
+            name = index_name(stmt)
+            stmt = stmt.replace(name, f"{name}_staging", 1)
+            cur.execute(re.sub(rf'\bON {TABLE_NAME}\b', f'ON {STAGING_TABLE}', stmt))
+        cur.execute(f"ANALYZE {STAGING_TABLE};")
+
+        # 4. Atomic swap (DDL is transactional in PostgreSQL)
+        print("Swapping staging table in...")
+        cur.execute(f"DROP TABLE IF EXISTS {TABLE_NAME} CASCADE;")
+        cur.execute(f"ALTER TABLE {STAGING_TABLE} RENAME TO {TABLE_NAME};")
+        cur.execute(f"ALTER SEQUENCE IF EXISTS {STAGING_TABLE}_id_seq RENAME TO {TABLE_NAME}_id_seq;")
+        cur.execute(f"ALTER INDEX IF EXISTS {STAGING_TABLE}_pkey RENAME TO {TABLE_NAME}_pkey;")
+        for stmt in index_statements:
+            name = index_name(stmt)
+            cur.execute(f"ALTER INDEX {name}_staging RENAME TO {name};")
+
+        # 5. The summary view went with the old table (CASCADE): recreate it
+        for stmt in schema_statements('summary'):
+            cur.execute(stmt)
+
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        print(f"Successfully loaded {total_rows} rows in {elapsed:.1f}s ({total_rows / max(elapsed, 1e-9):,.0f} rows/sec).")
+        # Right after the commit: the new data is live, caches must not keep serving the old one
+        print(f"Dataset version bumped to {bump_dataset_version()}")
+
+        # Index-only scans need the visibility map of the new table (VACUUM can't run in a transaction).
+        # Best effort: the data is already committed and served either way.
+        try:
+            conn.autocommit = True
+            cur.execute(f"VACUUM ANALYZE {TABLE_NAME};")
+        except Exception as e:
+            print(f"Warning: VACUUM ANALYZE failed ({e}), run it manually for index-only scans")
+
+        cur.close()
+        conn.close()
+
+    except Exception as e:
+        print(f"Database error: {e}")
+
+def incremental_import_data(csv_path=CSV_FILE_PATH, batch_size=1000):
+    """
+    Incremental mode: diffs the CSV against what is already loaded (natural key
+    + row content hash) and only applies the changes, in one transaction:
+      - new keys           -> batched INSERT ... ON CONFLICT DO UPDATE
+      - changed row hashes -> same upsert statement
+      - keys gone from CSV -> batched DELETE
+    The table is never truncated, so the dashboard keeps serving data.
+    Duplicate pairs are numbered over the whole file: the diff doesn't depend
+    on the row order (see duplicate_seq()).
+    """
+    if not os.path.exists(csv_path):
+        print(f"Error: File not found at {csv_path}")
+        return
+
+    print("Reading source file...")
+    df = pd.concat([add_row_keys(prepare_chunk(chunk)) for chunk in read_chunks(csv_path)], ignore_index=True)
+    df['key_seq'] = duplicate_seq(df)
+
+    print("Connecting to database...")
+    try:
+        conn = get_connection()
+        cur = conn.cursor()
+
+        # 1. Current state: natural key + content hash only
+        cur.execute(f"SELECT {', '.join(KEY_COLUMNS)}, row_hash FROM {TABLE_NAME};")
+        existing = pd.DataFrame(cur.fetchall(), columns=KEY_COLUMNS + ['row_hash'])
+        existing['key_seq'] = existing['key_seq'].astype('int16')
+
+        # 2. Diff
+        diff = df[KEY_COLUMNS + ['row_hash']].merge(
+            existing, on=KEY_COLUMNS, how='outer', suffixes=('', '_db'), indicator=True
+        )
+        is_insert = diff['_merge'] == 'left_only'
+        is_update = (diff['_merge'] == 'both') & (diff['row_hash'] != diff['row_hash_db'])
+        is_delete = diff['_merge'] == 'right_only'
+
+        changed_keys = diff.loc[is_insert | is_update, KEY_COLUMNS]
+        upserts = df.merge(changed_keys, on=KEY_COLUMNS)[LOAD_COLUMNS]
+        upserts = upserts.astype(object).where(upserts.notna(), None)
+        deletes = diff.loc[is_delete, KEY_COLUMNS].astype(object)
+
+        # 3. Apply
+        if len(upserts):
+            updates = ', '.join(f"{col} = EXCLUDED.{col}" for col in LOAD_COLUMNS if col not in KEY_COLUMNS)
+            execute_values(
+                cur,
+                f"""
+                    INSERT INTO {TABLE_NAME} ({', '.join(LOAD_COLUMNS)}) VALUES %s
+                    ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}
+                """,
+                list(upserts.itertuples(index=False, name=None)),
+                page_size=batch_size
+            )
+
+        if len(deletes):
+            execute_values(
+                cur,
+                f"""
+                    DELETE FROM {TABLE_NAME} AS t
+                    USING (VALUES %s) AS d ({', '.join(KEY_COLUMNS)})
+                    WHERE {' AND '.join(f"t.{col} = d.{col}" for col in KEY_COLUMNS)}
+                """,
+                list(deletes.itertuples(index=False, name=None)),
+                page_size=batch_size
+            )
+
+        n_insert, n_update, n_delete = int(is_insert.sum()), int(is_update.sum()), int(is_delete.sum())
+        n_unchanged = len(df) - n_insert - n_update
+
+        if n_insert or n_update or n_delete:
+            refresh_dashboard_summary(cur)
+            conn.commit()
+            print(f"Dataset version bumped to {bump_dataset_version()}")
+        else:
+            conn.rollback()
+
+        print("Incremental import summary:")
+        print(f"  inserted : {n_insert}")
+        print(f"  updated  : {n_update}")
+        print(f"  deleted  : {n_delete}")
+        print(f"  unchanged: {n_unchanged}")
 
         cur.close()
         conn.close()
@@ -94,4 +387,20 @@ def import_data():
         print(f"Database error: {e}")
 
 if __name__ == "__main__":
-    import_data()
+    parser = argparse.ArgumentParser(description="Load data/dataset.csv into olympic_stats.")
+    parser.add_argument(
+        "--mode", choices=["rows", "bulk", "incremental"], default="rows",
+        help="rows: one INSERT per row (default); bulk: chunked COPY into a staging table swapped in atomically; "
+             "incremental: only apply inserted / updated / deleted rows"
+    )
+    parser.add_argument("--csv", default=CSV_FILE_PATH, help="CSV file, or its Parquet conversion (directory or .parquet), to load (bulk / incremental modes)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per COPY chunk (bulk mode)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per upsert / delete batch (incremental mode)")
+    args = parser.parse_args()
+
+    if args.mode == "bulk":
+        bulk_import_data(args.csv, args.chunk_size)
+    elif args.mode == "incremental":
+        incremental_import_data(args.csv, args.batch_size)
+    else:
+        import_data()
@@ -2,6 +2,10 @@
 
 IF "%1"=="install" GOTO install
 IF "%1"=="run" GOTO run
+IF "%1"=="test" GOTO test
+IF "%1"=="parquet" GOTO parquet
+IF "%1"=="export" GOTO export
+IF "%1"=="startup-check" GOTO startup_check
 IF "%1"=="clean" GOTO clean
 GOTO :EOF
 
@@ -15,6 +19,26 @@ GOTO :EOF
 	python manage.py runserver
 	GOTO :EOF
 
+:test
+	echo Running the test suite...
+	python manage.py test
+	GOTO :EOF
+
+:parquet
+	echo Converting data/dataset.csv to Parquet...
+	python -m core.parquet_dataset
+	GOTO :EOF
+
+:export
+	echo Exporting the static site...
+	python manage.py export_static
+	GOTO :EOF
+
+:startup_check
+	echo Checking the startup time budget...
+	python benchmarks/bench_startup.py
+	GOTO :EOF
+
 :clean
 	echo Cleaning up...
 	rd /s /q __pycache__